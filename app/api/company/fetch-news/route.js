@@ -2,6 +2,26 @@
 import { NextResponse } from 'next/server';
 import { requireCompanyAuth } from '@/middleware/companyAuth';
 
+const JOB_POLL_INTERVAL_MS = 2000;
+// Stop polling a still running job before the dashboard's own 3 minute timeout
+const JOB_POLL_TIMEOUT_MS = Number(process.env.FETCH_NEWS_POLL_TIMEOUT_MS || 170000);
+
+// The backend answers 202 with a job once an analysis outlives its wait; poll the job until it finishes
+async function waitForJob(backendUrl, job, startedAt) {
+  while (job.status !== 'succeeded' && job.status !== 'failed') {
+    if (Date.now() - startedAt > JOB_POLL_TIMEOUT_MS) {
+      return job;
+    }
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+    const response = await fetch(`${backendUrl}/api/company/jobs/${job.job_id}`);
+    if (!response.ok) {
+      throw new Error(`Job ${job.job_id} lookup failed with status ${response.status}`);
+    }
+    job = await response.json();
+  }
+  return job;
+}
+
 export async function POST(request) {
   try {
     const authResult = await requireCompanyAuth(request);
@@ -16,6 +36,7 @@ export async function POST(request) {
     // Call Python backend to trigger news analysis
     try {
       const backendUrl = process.env.BACKEND_URL || 'http://localhost:8002';
+      const startedAt = Date.now();
       const response = await fetch(`${backendUrl}/api/company/fetch-news`, {
         method: 'POST',
         headers: {
@@ -26,6 +47,37 @@ export async function POST(request) {
         })
       });
 
+      if (response.status === 202) {
+        const job = await waitForJob(backendUrl, await response.json(), startedAt);
+
+        if (job.status === 'failed') {
+          return NextResponse.json({
+            success: false,
+            error: job.error || 'News analysis failed',
+          }, { status: 500 });
+        }
+
+        if (job.status !== 'succeeded') {
+          // Still running: tell the client the analysis continues in the background
+          return NextResponse.json({
+            success: false,
+            pending: true,
+            message: 'News analysis is still running',
+            job: job
+          }, { status: 202 });
+        }
+
+        return NextResponse.json({
+          success: true,
+          message: 'News analysis completed successfully',
+          company: {
+            id: company._id,
+            name: company.name
+          },
+          result: job.result
+        });
+      }
+
       if (response.ok) {
         const result = await response.json();
 
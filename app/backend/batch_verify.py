@@ -0,0 +1,75 @@
+import os
+import re
+import json
+from typing import Dict, Any, List, Optional
+from schemas import StructuredParser, BATCH_VERIFICATION_SCHEMA
+
+# Claims packed into one grounded verification call (1 disables batching)
+VERIFY_BATCH_SIZE = int(os.getenv("VERIFY_BATCH_SIZE", "10"))
+
+_CLAIM_INDEX_FIELD = re.compile(r'"index"\s*:\s*(\d+)')
+
+
+def batch_prompt(claims: List[str], context: str = "") -> str:
+    numbered = "\n".join(f'{i + 1}. "{claim}"' for i, claim in enumerate(claims))
+    # Search grounding cannot be combined with response_schema, so the schema goes in the prompt
+    return (
+        f"Fact-check each numbered claim below using Google Search. {context}\n\n"
+        f"{numbered}\n\n"
+        "Respond with ONLY a JSON array (no markdown) containing one object per claim that matches this JSON schema:\n"
+        f"{json.dumps(BATCH_VERIFICATION_SCHEMA)}\n"
+        "Use UNCERTAIN with a low confidence when the evidence is thin."
+    )
+
+
+def batch_sources(response, text: str, count: int) -> List[List[Dict[str, str]]]:
+    """Grounding sources per claim, attributed through the grounding supports' text offsets"""
+    sources: List[List[Dict[str, str]]] = [[] for _ in range(count)]
+    candidate = response.candidates[0] if getattr(response, "candidates", None) else None
+    metadata = getattr(candidate, "grounding_metadata", None)
+    if metadata is None:
+        return sources
+
+    chunks = metadata.grounding_chunks or []
+    # Offsets in the response text where each claim's object starts
+    starts = [(m.start(), int(m.group(1)) - 1) for m in _CLAIM_INDEX_FIELD.finditer(text or "")]
+
+    for support in metadata.grounding_supports or []:
+        offset = getattr(support.segment, "start_index", None) or 0
+        owner = None
+        for start, index in starts:
+            if start > offset:
+                break
+            owner = index
+        if owner is None or not 0 <= owner < count:
+            continue
+        for chunk_index in support.grounding_chunk_indices or []:
+            web = chunks[chunk_index].web if chunk_index < len(chunks) else None
+            if web and all(s["uri"] != web.uri for s in sources[owner]):
+                sources[owner].append({"title": web.title, "uri": web.uri})
+    return sources
+
+
+async def verify_claims(parser: StructuredParser, claims: List[str], context: str = "",
+                        timeout: Optional[float] = None) -> List[Optional[Dict[str, Any]]]:
+    """Verify several claims in one grounded call; unresolved claims come back as None"""
+    response = await parser.gemini.generate_content(
+        model="gemini-2.5-flash",
+        contents=batch_prompt(claims, context),
+        config={
+            "tools": [{"google_search": {}}],
+            "temperature": 0.1
+        },
+        timeout=timeout
+    )
+    text = response.text or ""
+    results = await parser.batch(text, len(claims))
+    verdicts = []
+    for result, sources in zip(results, batch_sources(response, text, len(claims))):
+        verdicts.append({**result.model_dump(), "sources": sources[:5]} if result is not None else None)
+    return verdicts
+
+
+def chunked(items: List[Any], size: int) -> List[List[Any]]:
+    size = max(1, size)
+    return [items[i:i + size] for i in range(0, len(items), size)]
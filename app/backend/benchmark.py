@@ -0,0 +1,732 @@
+#!/usr/bin/env python3
+"""
+Load benchmarks for the backend services against a stubbed Gemini model.
+
+Usage:
+    python benchmark.py concurrency [--requests 50] [--latency 0.5]
+    python benchmark.py analysis [--latency 0.5]
+    python benchmark.py claim-index [--claims 1000000]
+    python benchmark.py claim-threshold
+    python benchmark.py company-ids [--docs 100000] [--mongodb-uri mongodb://localhost:27017]
+    python benchmark.py batch-verify [--latency 0.5] [--unresolved 0.1]
+    python benchmark.py parsing [--items 300]
+    python benchmark.py live-relay [--sessions 20] [--audio-seconds 30]
+    python benchmark.py live-buffering [--realtime-seconds 5]
+    python benchmark.py live-pool [--sessions 20] [--rtt 0.05]
+    python benchmark.py live-sessions [--sessions 20] [--capacity 8] [--realtime-seconds 5]
+
+The company service benchmarks need `mongomock` in place of a real MongoDB;
+company-ids uses a local mongod when --mongodb-uri is given.
+"""
+import os
+import sys
+import time
+import asyncio
+import re
+import json
+import argparse
+import contextlib
+from types import SimpleNamespace
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-key")
+os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+
+STUB_TEXT = "\n".join(
+    [f"NEWS: Benchmark headline {i} | SOURCE: Wire {i} | DATE: 2025-01-0{i} | SENTIMENT: neutral" for i in range(1, 7)]
+    + [json.dumps({"verdict": "REAL", "confidence": 0.9, "bias": "low", "impact": "medium",
+                   "explanation": "Stubbed response."})]
+)
+
+
+class StubModels:
+    """Stands in for `client.aio.models` with a fixed per-call latency.
+
+    Batch verification prompts get a JSON verdict per numbered claim, leaving the
+    `unresolved` share of each batch unanswered; everything else gets `text`.
+    """
+
+    def __init__(self, latency: float, text: str, blocking: bool = False, unresolved: float = 0.0):
+        self.latency = latency
+        self.text = text
+        self.blocking = blocking
+        self.unresolved = unresolved
+        self.calls = 0
+
+    async def generate_content(self, model, contents, config=None):
+        self.calls += 1
+        claims = [int(n) for n in re.findall(r'^(\d+)\. "', str(contents), re.MULTILINE)]
+        # Longer answers take longer: each extra batched claim adds a tenth of the base latency
+        latency = self.latency * (1 + 0.1 * max(0, len(claims) - 1))
+        if self.blocking:
+            # Mimics the old synchronous `ai.models.generate_content` call
+            time.sleep(latency)
+        else:
+            await asyncio.sleep(latency)
+        text = self.respond(claims)
+        # Roughly what the API would bill: ~4 characters per token each way
+        usage = SimpleNamespace(total_token_count=(len(str(contents)) + len(text)) // 4)
+        return SimpleNamespace(text=text, candidates=[SimpleNamespace(grounding_metadata=None)], usage_metadata=usage)
+
+    def respond(self, claims: list) -> str:
+        if not claims:
+            return self.text
+        answered = claims[int(len(claims) * self.unresolved):]
+        return json.dumps([
+            {"index": n, "verdict": "REAL", "confidence": 0.9, "bias": "low", "impact": "medium",
+             "explanation": "Stubbed batch verdict."}
+            for n in answered
+        ])
+
+
+def stub_client(latency: float, text: str, blocking: bool = False, unresolved: float = 0.0):
+    return SimpleNamespace(aio=SimpleNamespace(models=StubModels(latency, text, blocking, unresolved)))
+
+
+async def fire_requests(app, path: str, payloads: list) -> float:
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(client.post(path, json=p) for p in payloads))
+        elapsed = time.perf_counter() - start
+
+    failed = sum(1 for r in responses if r.status_code != 200)
+    if failed:
+        print(f"⚠️  {failed} requests failed")
+    return elapsed
+
+
+def load_company_service():
+    """Import company.py against an in-memory mongomock database"""
+    import pymongo
+    import mongomock
+
+    pymongo.MongoClient = mongomock.MongoClient
+    import company
+    return company
+
+
+def bench_concurrency(args):
+    """Concurrent /api/check-agent requests, blocking vs async model calls"""
+    import main
+
+    text = json.dumps({"verdict": "FAKE", "confidence": 0.9, "explanation": "Stubbed response."})
+    serial_time = args.requests * args.latency
+
+    print(f"🧪 {args.requests} concurrent /api/check-agent requests, {args.latency}s stubbed model latency")
+    print(f"   Sum of call latencies: {serial_time:.2f}s")
+
+    for label, blocking in [("blocking", True), ("async", False)]:
+        main.gemini.client = stub_client(args.latency, text, blocking=blocking)
+        # Distinct claims per run so the second run is not served from the verdict cache
+        payloads = [{"query": f"{label} benchmark claim {i}"} for i in range(args.requests)]
+        elapsed = asyncio.run(fire_requests(main.app, "/api/check-agent", payloads))
+        print(f"   {label:>8}: {elapsed:.2f}s wall ({serial_time / elapsed:.1f}x overlap)")
+
+
+def bench_analysis(args):
+    """End-to-end analyze_company wall time against a stubbed model"""
+    company = load_company_service()
+    company_id = str(company.companies_collection.insert_one({"name": "Benchmark Corp"}).inserted_id)
+    company.gemini.client = stub_client(args.latency, STUB_TEXT)
+    models = company.gemini.client.aio.models
+
+    start = time.perf_counter()
+    result = asyncio.run(company.analyze_company(company_id))
+    elapsed = time.perf_counter() - start
+
+    serial_time = models.calls * args.latency
+    print(f"🧪 analyze_company: {len(result['verified_news'])} items, {models.calls} model calls, {args.latency}s latency")
+    print(f"   Sum of call latencies: {serial_time:.2f}s")
+    print(f"   Wall time: {elapsed:.2f}s (verify concurrency {company.VERIFY_CONCURRENCY})")
+
+
+def bench_claim_index(args):
+    """Lookup latency and labelled-pair accuracy of the near-duplicate claim index at `--claims` stored claims"""
+    import random
+    import resource
+    from claim_index import ClaimIndex
+    from claim_pairs import LABELLED_CLAIM_PAIRS
+
+    rng = random.Random(7)
+    vocabulary = [f"word{i}" for i in range(20000)]
+    index = ClaimIndex(max_entries=args.claims + len(LABELLED_CLAIM_PAIRS) + 1)
+
+    start = time.perf_counter()
+    for i in range(args.claims):
+        index.add(" ".join(rng.sample(vocabulary, rng.randint(5, 10))), {"verdict": "FAKE", "filler": True})
+    build_time = time.perf_counter() - start
+
+    queries = [" ".join(rng.sample(vocabulary, rng.randint(5, 10))) for _ in range(1000)]
+    start = time.perf_counter()
+    for query in queries:
+        index.lookup(query)
+    lookup_ms = (time.perf_counter() - start) / len(queries) * 1000
+
+    # The labelled pairs among a full index: a different claim must never reuse its pair's
+    # verdict, and no labelled claim may match one of the filler claims
+    correct = wrong = missed = 0
+    for claim, other, same in LABELLED_CLAIM_PAIRS:
+        index.add(claim, {"verdict": "REAL"})
+        match = index.lookup(other)
+        if match is not None and (match[1].get("filler") or (not same and match[0] == claim)):
+            wrong += 1
+        elif same and match is None:
+            missed += 1
+        else:
+            correct += 1
+
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"🧪 Claim index with {len(index)} claims (built in {build_time:.1f}s, peak RSS {rss_mb:.0f} MB)")
+    print(f"   Lookup: {lookup_ms:.3f} ms average over {len(queries)} queries, threshold {index.threshold}")
+    print(f"   Labelled pairs: {correct} correct, {wrong} wrong verdicts reused, {missed} duplicates re-checked")
+
+
+def bench_claim_threshold(args):
+    """Precision/recall of verdict reuse on the labelled claim pairs across thresholds"""
+    from claim_index import ClaimIndex, calibrate_threshold
+    from claim_pairs import LABELLED_CLAIM_PAIRS
+
+    index = ClaimIndex()
+    scored = [(index.similarity(a, b), same) for a, b, same in LABELLED_CLAIM_PAIRS]
+    positives = sum(1 for _, same in scored if same)
+    print(f"🧪 {len(scored)} labelled pairs ({positives} duplicates, {len(scored) - positives} different claims)")
+    for threshold in (0.5, 0.6, 0.65, 0.7, 0.75, 0.8, 0.85, 0.9):
+        tp = sum(1 for similarity, same in scored if same and similarity >= threshold)
+        fp = sum(1 for similarity, same in scored if not same and similarity >= threshold)
+        print(f"   {threshold:.2f}: {tp}/{positives} duplicates reused, {fp} different claims matched")
+    best = calibrate_threshold(LABELLED_CLAIM_PAIRS, index)
+    print(f"   Calibrated: {best['threshold']} (precision {best['precision']}, recall {best['recall']}, "
+          f"F0.5 {best['f_score']}); current CLAIM_INDEX_THRESHOLD {index.threshold}")
+
+
+def bench_company_ids(args):
+    """Latest-record lookups before/after the company-id migration on `--docs` tracking docs"""
+    import random
+    from datetime import datetime, timedelta
+    from bson import ObjectId
+    from repository import ensure_indexes, tracking_filter
+    from migrate import migrate_company_ids
+
+    if args.mongodb_uri:
+        from pymongo import MongoClient
+        db = MongoClient(args.mongodb_uri)['benchmark_company_ids']
+    else:
+        import mongomock
+        db = mongomock.MongoClient()['benchmark_company_ids']
+    tracking = db['news_tracking']
+    tracking.drop()
+    ensure_indexes(db)
+
+    # Half the companies were written with ObjectId ids, the rest with strings
+    company_ids = [ObjectId() for _ in range(1000)]
+    now = datetime.utcnow()
+    rng = random.Random(3)
+    tracking.insert_many([
+        {
+            "company_id": company_id if i % 2 else str(company_id),
+            "timestamp": now - timedelta(minutes=rng.randint(0, 100000)),
+            "statistics": {"total_news": 30}
+        }
+        for i in range(args.docs)
+        for company_id in [company_ids[i % len(company_ids)]]
+    ])
+    lookups = [str(rng.choice(company_ids)) for _ in range(args.requests)]
+
+    def legacy_lookup(company_id):
+        # The old data.fetch_news_tracking: ObjectId first, then a second query by string
+        record = tracking.find_one({"company_id": ObjectId(company_id)}, sort=[("timestamp", -1)])
+        if record is None:
+            record = tracking.find_one({"company_id": company_id}, sort=[("timestamp", -1)])
+        return record
+
+    def canonical_lookup(company_id):
+        return tracking.find_one(tracking_filter(company_id), sort=[("timestamp", -1)])
+
+    def timed(lookup):
+        start = time.perf_counter()
+        for company_id in lookups:
+            lookup(company_id)
+        return (time.perf_counter() - start) / len(lookups) * 1000
+
+    print(f"🧪 {args.docs} tracking docs, {len(lookups)} latest-record lookups ({'mongod' if args.mongodb_uri else 'mongomock'})")
+    print(f"   Before migration (dual-type queries): {timed(legacy_lookup):.2f} ms/lookup")
+    migrate_company_ids(db)
+    print(f"   After migration (canonical string):   {timed(canonical_lookup):.2f} ms/lookup")
+    tracking.drop()
+
+
+def bench_batch_verify(args):
+    """Verification of one analysis' 30 headlines: per-item calls vs batched calls"""
+    import batch_verify
+    company = load_company_service()
+    company_name = "Benchmark Corp"
+    news_items = [
+        {"id": i + 1, "title": f"{company_name} headline {i} about topic{i} quarter{i}", "source": f"Wire {i % 7}"}
+        for i in range(30)
+    ]
+
+    async def verify_all():
+        verified = 0
+        async for _ in company.iter_verified_news(news_items, company_name):
+            verified += 1
+        return verified
+
+    print(f"🧪 Verifying {len(news_items)} headlines, {args.latency}s stubbed latency, "
+          f"{args.unresolved:.0%} of each batch left unresolved")
+    for label, batch_size in [("per-item", 1), (f"batch x{batch_verify.VERIFY_BATCH_SIZE}", batch_verify.VERIFY_BATCH_SIZE)]:
+        company.VERIFY_BATCH_SIZE = batch_size
+        company.claim_index._reset()
+        company.gemini.client = stub_client(args.latency, STUB_TEXT, unresolved=args.unresolved)
+        calls, tokens = company.gemini.total_calls, company.gemini.total_tokens
+
+        start = time.perf_counter()
+        verified = asyncio.run(verify_all())
+        elapsed = time.perf_counter() - start
+
+        print(f"   {label:>10}: {company.gemini.total_calls - calls:3d} calls, "
+              f"{company.gemini.total_tokens - tokens:6d} tokens, {elapsed:.2f}s wall ({verified} verified)")
+
+
+# Shapes of real discovery replies: a NEWS line per headline, grounding titles from news sites
+RECORDED_NEWS_LINE = "NEWS: {company} {topic} as analysts weigh Q{quarter} outlook | SOURCE: {outlet} | DATE: 2025-03-{day:02d} | SENTIMENT: {sentiment}"
+RECORDED_SOURCE_TITLE = "{outlet} - {topic} update: what {company} investors should know ({n})"
+RECORDED_TOPICS = ["shares slide", "unveils new chip", "expands cloud deal", "faces antitrust probe",
+                   "beats revenue estimates", "cuts 5% of workforce", "opens Berlin plant", "settles patent suit"]
+RECORDED_OUTLETS = ["Reuters", "Bloomberg", "CNBC", "Financial Times", "The Verge", "TechCrunch"]
+
+
+def recorded_discovery(items: int):
+    """A discovery reply with `items` NEWS lines and as many grounding source titles"""
+    import random
+    rng = random.Random(11)
+    companies = [f"Company{i}" for i in range(max(1, items // 10))]
+    lines, titles = [], []
+    for n in range(items):
+        fields = {"company": rng.choice(companies), "topic": rng.choice(RECORDED_TOPICS),
+                  "outlet": rng.choice(RECORDED_OUTLETS), "quarter": rng.randint(1, 4),
+                  "day": rng.randint(1, 28), "sentiment": rng.choice(["positive", "negative", "neutral"]), "n": n}
+        lines.append(RECORDED_NEWS_LINE.format(**fields))
+        titles.append(RECORDED_SOURCE_TITLE.format(**{**fields, "company": rng.choice(companies)}))
+    return "Here are the latest headlines:\n" + "\n".join(lines), titles
+
+
+def bench_parsing(args):
+    """Discovery reply parsing and headline-to-source matching as item counts grow"""
+    from parsing import parse_news_lines, SourceIndex
+
+    def legacy_match(headlines, sources):
+        # The old find_company_news scan: every headline against every source title
+        matched = 0
+        for headline in headlines:
+            headline_words = headline.lower().split()[:4]
+            for src in sources:
+                if any(word in src['title'].lower() for word in headline_words):
+                    matched += 1
+                    break
+        return matched
+
+    def indexed_match(headlines, sources):
+        index = SourceIndex()
+        for src in sources:
+            index.add(src)
+        return sum(1 for headline in headlines if index.match(headline) is not None)
+
+    def timed(fn, repeat):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            result = fn()
+        return (time.perf_counter() - start) / repeat * 1000, result
+
+    print("🧪 Parsing recorded discovery replies (ms per reply)")
+    for items in sorted({30, args.items, args.items * 10}):
+        text, titles = recorded_discovery(items)
+        sources = [{"title": title, "uri": f"https://example.com/{n}"} for n, title in enumerate(titles)]
+        repeat = max(1, 3000 // items)
+        parse_ms, parsed = timed(lambda: parse_news_lines(text), repeat)
+        headlines = [headline for headline, _, _, _ in parsed]
+        legacy_ms, legacy_matched = timed(lambda: legacy_match(headlines, sources), max(1, repeat // 10))
+        indexed_ms, indexed_matched = timed(lambda: indexed_match(headlines, sources), repeat)
+        # Headlines with no source in common: the linear scan visits every title for each one
+        unmatched = [f"Unlisted{n} startup{n} news{n} item{n}" for n in range(items)]
+        legacy_miss_ms, _ = timed(lambda: legacy_match(unmatched, sources), 1)
+        indexed_miss_ms, _ = timed(lambda: indexed_match(unmatched, sources), repeat)
+        print(f"   {items:5d} items: parse {parse_ms:7.3f}")
+        print(f"      matching headlines:   linear scan {legacy_ms:9.3f} ({legacy_matched} matched)"
+              f" | inverted index {indexed_ms:7.3f} ({indexed_matched} matched)")
+        print(f"      unmatched headlines:  linear scan {legacy_miss_ms:9.3f}"
+              f" | inverted index {indexed_miss_ms:7.3f}")
+
+
+# Browser client sends 100 ms of 16 kHz PCM16 per frame; Gemini answers in 40 ms chunks of 24 kHz PCM16
+CLIENT_FRAME_BYTES = 16000 * 2 // 10
+UPSTREAM_CHUNK_BYTES = 24000 * 2 * 40 // 1000
+
+
+class FakeClientSocket:
+    """In-memory stand-in for the browser side of /ws/live-session"""
+
+    def __init__(self, frames: list, interval: float = 0.0):
+        self.frames = iter(frames)
+        self.interval = interval
+        self.sent = 0
+        self.done = asyncio.Event()
+
+    async def receive(self):
+        await asyncio.sleep(self.interval)
+        frame = next(self.frames, None)
+        if frame is None:
+            self.done.set()
+            return {"type": "websocket.disconnect", "code": 1000}
+        return frame
+
+    async def receive_json(self):
+        from fastapi import WebSocketDisconnect
+        message = await self.receive()
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message["code"])
+        return json.loads(message["text"])
+
+    async def send_text(self, data: str):
+        self.sent += 1
+
+    async def send_bytes(self, data: bytes):
+        self.sent += 1
+
+    async def send_json(self, data):
+        # Starlette serializes before sending
+        await self.send_text(json.dumps(data, separators=(",", ":"), ensure_ascii=False))
+
+
+class FakeUpstream:
+    """In-memory stand-in for the Gemini Live connection; stays open until the client hangs up"""
+
+    def __init__(self, messages: list, client_done: asyncio.Event, gaps: list = None):
+        self.messages = messages
+        self.client_done = client_done
+        self.gaps = gaps or [0.0] * len(messages)
+        self.sent = 0
+
+    async def send(self, message):
+        self.sent += 1
+
+    async def __aiter__(self):
+        for message, gap in zip(self.messages, self.gaps):
+            await asyncio.sleep(gap)
+            yield message
+        await self.client_done.wait()
+
+
+async def legacy_relay(websocket, upstream):
+    """The audio path of the old websocket_live_session: dict round-trips in both directions"""
+    from fastapi import WebSocketDisconnect
+
+    async def forward():
+        try:
+            while True:
+                data = await websocket.receive_json()
+                if data.get("type") == "audio":
+                    await upstream.send(json.dumps({"realtimeInput": {"mediaChunks": [
+                        {"data": data["audio"], "mimeType": "audio/pcm;rate=16000"}]}}))
+        except WebSocketDisconnect:
+            return
+
+    async def process():
+        async for message in upstream:
+            response = json.loads(message)
+            server_content = response.get("serverContent", {})
+            if server_content.get("inputTranscription"):
+                await websocket.send_json({"type": "transcript", "role": "user",
+                                           "text": server_content["inputTranscription"]["text"]})
+            for part in server_content.get("modelTurn", {}).get("parts", []):
+                if part.get("inlineData", {}).get("mimeType", "").startswith("audio/pcm"):
+                    await websocket.send_json({"type": "audio", "audio": part["inlineData"]["data"]})
+
+    await asyncio.gather(forward(), process())
+
+
+def recorded_live_traffic(audio_seconds: float):
+    """Client frames (JSON and binary) and pretty-printed Gemini messages for one session"""
+    import base64
+    pcm_in = os.urandom(CLIENT_FRAME_BYTES)
+    pcm_out = os.urandom(UPSTREAM_CHUNK_BYTES)
+    json_frames = [{"type": "websocket.receive", "text": json.dumps({"type": "audio", "audio": base64.b64encode(pcm_in).decode()})}
+                   ] * int(audio_seconds * 10)
+    binary_frames = [{"type": "websocket.receive", "bytes": pcm_in}] * int(audio_seconds * 10)
+
+    audio_message = json.dumps({"serverContent": {"modelTurn": {"parts": [
+        {"inlineData": {"mimeType": "audio/pcm;rate=24000", "data": base64.b64encode(pcm_out).decode()}}]}}},
+        indent=2).encode()
+    transcript_message = json.dumps({"serverContent": {"inputTranscription": {"text": "is this claim true"}}},
+                                    indent=2).encode()
+    # One transcript update per second of audio
+    upstream = []
+    for n in range(int(audio_seconds * 25)):
+        upstream.append(audio_message)
+        if n % 25 == 0:
+            upstream.append(transcript_message)
+    return json_frames, binary_frames, upstream
+
+
+def bench_live_relay(args):
+    """CPU cost of relaying live voice audio: legacy dict round-trips vs template relay vs binary frames"""
+    from live_session import LiveSession
+
+    async def no_check(query):
+        return {"verdict": "UNCERTAIN", "explanation": "", "sources": []}
+
+    json_frames, binary_frames, upstream = recorded_live_traffic(args.audio_seconds)
+
+    async def run_sessions(mode):
+        sessions = []
+        for _ in range(args.sessions):
+            client = FakeClientSocket(binary_frames if mode == "binary" else json_frames)
+            gemini_ws = FakeUpstream(upstream, client.done)
+            if mode == "legacy":
+                sessions.append(legacy_relay(client, gemini_ws))
+            else:
+                sessions.append(LiveSession(client, gemini_ws, no_check, binary=mode == "binary").run())
+        await asyncio.gather(*sessions)
+
+    audio = args.sessions * args.audio_seconds
+    print(f"🧪 Relaying {args.sessions} sessions x {args.audio_seconds:g}s of audio each way "
+          f"({len(json_frames)} client frames, {len(upstream)} Gemini messages per session)")
+    for mode in ["legacy", "template", "binary"]:
+        # Session logging would dominate the measurement
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            start = time.process_time()
+            asyncio.run(run_sessions(mode))
+            cpu = time.process_time() - start
+        # A session needs one second of audio relayed per second, so this is how many one core sustains
+        print(f"   {mode:>8}: {cpu:6.2f}s CPU, {cpu / audio * 1000:6.3f} ms CPU per audio second, "
+              f"~{audio / cpu:6.0f} sessions per core")
+
+
+def bench_live_buffering(args):
+    """Message counts and relay latency of live voice audio in real time, across coalescing windows"""
+    import base64
+    import random
+    from live_session import LiveSession
+
+    # A client streaming 20 ms binary frames, and Gemini delivering 40 ms chunks with bursty gaps
+    frame_ms, chunk_ms = 20, 40
+    frames = [{"type": "websocket.receive", "bytes": os.urandom(16000 * 2 * frame_ms // 1000)}] * int(args.realtime_seconds * 1000 / frame_ms)
+    chunk = json.dumps({"serverContent": {"modelTurn": {"parts": [{"inlineData": {
+        "mimeType": "audio/pcm;rate=24000",
+        "data": base64.b64encode(os.urandom(24000 * 2 * chunk_ms // 1000)).decode()}}]}}}).encode()
+    rng = random.Random(7)
+    chunks = int(args.realtime_seconds * 1000 / chunk_ms)
+    gaps = [rng.expovariate(1000 / chunk_ms) for _ in range(chunks)]
+
+    async def no_check(query):
+        return {"verdict": "UNCERTAIN", "explanation": "", "sources": []}
+
+    async def session(window_ms, buffer_ms):
+        client = FakeClientSocket(frames, interval=frame_ms / 1000)
+        live = LiveSession(client, FakeUpstream([chunk] * chunks, client.done, gaps), no_check, binary=True,
+                           upstream_window_ms=window_ms, downstream_buffer_ms=buffer_ms)
+        await live.run()
+        return live.stats()
+
+    configs = [(0, 0), (20, 40), (40, 60), (100, 100)]
+
+    async def run_all():
+        return await asyncio.gather(*(session(*config) for config in configs))
+
+    print(f"🧪 {args.realtime_seconds:g}s live session per config: {frame_ms} ms client frames up, "
+          f"{chunk_ms} ms Gemini chunks down with bursty arrival")
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        results = asyncio.run(run_all())
+    for (window_ms, buffer_ms), stats in zip(configs, results):
+        up, down = stats["upstream"], stats["downstream"]
+        print(f"   up {window_ms:3d} ms / down {buffer_ms:3d} ms: "
+              f"up {up['messages_per_second']:5.1f} msg/s (p50 {up['latency']['p50_ms']}, p95 {up['latency']['p95_ms']} ms) | "
+              f"down {down['messages_per_second']:5.1f} msg/s (p50 {down['latency']['p50_ms']}, p95 {down['latency']['p95_ms']} ms)")
+
+
+# Stand-in Gemini Live server: server-side setup time before setupComplete
+STANDIN_SETUP_SECONDS = 0.2
+
+
+async def standin_live_server(rtt: float):
+    """Local WebSocket server speaking enough of BidiGenerateContent for session start timing"""
+    import base64
+    import websockets
+
+    audio_reply = json.dumps({"serverContent": {"modelTurn": {"parts": [{"inlineData": {
+        "mimeType": "audio/pcm;rate=24000", "data": base64.b64encode(bytes(1920)).decode()}}]}}})
+
+    async def delayed_handshake(connection, request):
+        # TCP, TLS and the HTTP upgrade each cost a round trip to the real endpoint
+        await asyncio.sleep(3 * rtt)
+
+    async def handler(ws):
+        async for message in ws:
+            data = json.loads(message)
+            if "setup" in data:
+                await asyncio.sleep(rtt + STANDIN_SETUP_SECONDS)
+                await ws.send(json.dumps({"setupComplete": {}}))
+            elif "realtimeInput" in data:
+                await asyncio.sleep(rtt)
+                await ws.send(audio_reply)
+
+    return await websockets.serve(handler, "127.0.0.1", 0, process_request=delayed_handshake)
+
+
+def bench_live_pool(args):
+    """Time to first agent audio for new voice sessions: connect on demand vs a warm pool"""
+    from live_pool import LivePool
+    from live_session import realtime_input_message, upstream_audio_chunks
+
+    async def first_audio(pool) -> float:
+        start = time.perf_counter()
+        async with pool.connection() as ws:
+            await ws.send(realtime_input_message(["AAAA"]))
+            async for message in ws:
+                if upstream_audio_chunks(message):
+                    return time.perf_counter() - start
+
+    async def run(size):
+        server = await standin_live_server(args.rtt)
+        port = server.sockets[0].getsockname()[1]
+        pool = LivePool(f"ws://127.0.0.1:{port}", {"setup": {"model": "standin"}}, size=size)
+        pool.start()
+        # Sessions arrive one at a time, spaced so the pool has time to refill
+        gap = 6 * args.rtt + STANDIN_SETUP_SECONDS
+        await asyncio.sleep(gap)
+        timings = []
+        for _ in range(args.sessions):
+            timings.append(await first_audio(pool))
+            await asyncio.sleep(gap)
+        stats = pool.stats()
+        await pool.stop()
+        server.close()
+        await server.wait_closed()
+        return sorted(timings), stats
+
+    print(f"🧪 {args.sessions} voice sessions against a local stand-in Live server "
+          f"({args.rtt * 1000:.0f} ms RTT, {STANDIN_SETUP_SECONDS * 1000:.0f} ms setup)")
+    for label, size in [("on demand", 0), ("warm pool", 2)]:
+        timings, stats = asyncio.run(run(size))
+        p50, p95 = timings[len(timings) // 2], timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        print(f"   {label:>9}: time to first audio p50 {p50 * 1000:6.1f} ms, p95 {p95 * 1000:6.1f} ms "
+              f"({stats['hits']} pool hits, {stats['misses']} misses)")
+
+
+class EchoUpstream:
+    """Fake Gemini Live connection answering every realtimeInput with a chunk of agent audio"""
+
+    def __init__(self, reply: str):
+        self.reply = reply
+        self.queue = asyncio.Queue()
+
+    async def send(self, message):
+        if message.startswith('{"realtimeInput"'):
+            self.queue.put_nowait(self.reply)
+
+    async def __aiter__(self):
+        while True:
+            yield await self.queue.get()
+
+
+class SilentClientSocket(FakeClientSocket):
+    """Client that stops sending audio after its frames but never hangs up"""
+
+    async def receive(self):
+        frame = next(self.frames, None)
+        if frame is None:
+            await asyncio.Event().wait()
+        await asyncio.sleep(self.interval)
+        return frame
+
+
+def bench_live_sessions(args):
+    """Load test of voice session admission, queueing and idle shedding against a fake upstream"""
+    import base64
+    import session_manager
+    from live_session import LiveSession
+    from session_manager import SessionManager, SessionCapacityError
+
+    frame_ms = 20
+    frames = [{"type": "websocket.receive", "bytes": bytes(16000 * 2 * frame_ms // 1000)}] * int(args.realtime_seconds * 1000 / frame_ms)
+    reply = json.dumps({"serverContent": {"modelTurn": {"parts": [{"inlineData": {
+        "mimeType": "audio/pcm;rate=24000", "data": base64.b64encode(bytes(24000 * 2 * frame_ms // 1000)).decode()}}]}}})
+    session_manager.LIVE_SESSION_SWEEP_SECONDS = 0.25
+
+    async def no_check(query):
+        return {"verdict": "UNCERTAIN", "explanation": "", "sources": []}
+
+    async def client_session(manager, n, client):
+        try:
+            async with manager.slot(client, f"client-{n}") as managed:
+                live = LiveSession(client, EchoUpstream(reply), no_check, binary=True)
+                managed.attach(live)
+                await live.run()
+                return "shed" if live.closed_reason else "served"
+        except SessionCapacityError:
+            return "rejected"
+
+    async def run():
+        manager = SessionManager(max_sessions=args.capacity, queue_size=args.capacity // 2,
+                                 queue_timeout=args.realtime_seconds * 1.5, client_timeout=1.0)
+        manager.start()
+        clients = [FakeClientSocket(frames, interval=frame_ms / 1000) for _ in range(args.sessions)]
+        # One client goes quiet after a second without hanging up
+        clients[0] = SilentClientSocket(frames[:int(1000 / frame_ms)], interval=frame_ms / 1000)
+        sessions = asyncio.gather(*(client_session(manager, n, client) for n, client in enumerate(clients)))
+        await asyncio.sleep(args.realtime_seconds / 2)
+        midway = manager.stats()
+        outcomes = await sessions
+        await manager.stop()
+        return outcomes, midway, manager.stats()
+
+    print(f"🧪 {args.sessions} voice sessions arriving at once, cap {args.capacity} per worker, "
+          f"queue {args.capacity // 2}, {args.realtime_seconds:g}s of audio each")
+    start_cpu, start = time.process_time(), time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        outcomes, midway, final = asyncio.run(run())
+    wall, cpu = time.perf_counter() - start, time.process_time() - start_cpu
+
+    per_session = [s["upstream_messages_per_second"] for s in midway["sessions"] if "upstream_messages_per_second" in s]
+    print(f"   midway: {midway['active']} active, {midway['queued_now']} queued, "
+          f"{sum(per_session):.0f} upstream msg/s across sessions")
+    print(f"   outcome: {outcomes.count('served')} served ({final['queued']} after queueing), "
+          f"{outcomes.count('rejected')} rejected, {outcomes.count('shed')} shed as idle")
+    print(f"   queue wait p50 {final['queue_wait']['p50_ms']} ms, p95 {final['queue_wait']['p95_ms']} ms; "
+          f"{wall:.1f}s wall, {cpu:.2f}s CPU")
+
+
+BENCHMARKS = {
+    "concurrency": bench_concurrency,
+    "analysis": bench_analysis,
+    "claim-index": bench_claim_index,
+    "claim-threshold": bench_claim_threshold,
+    "company-ids": bench_company_ids,
+    "batch-verify": bench_batch_verify,
+    "parsing": bench_parsing,
+    "live-relay": bench_live_relay,
+    "live-buffering": bench_live_buffering,
+    "live-pool": bench_live_pool,
+    "live-sessions": bench_live_sessions,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--claims", type=int, default=1000000)
+    parser.add_argument("--docs", type=int, default=100000)
+    parser.add_argument("--mongodb-uri", default=None)
+    parser.add_argument("--unresolved", type=float, default=0.1)
+    parser.add_argument("--items", type=int, default=300)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--audio-seconds", type=float, default=30)
+    parser.add_argument("--realtime-seconds", type=float, default=5)
+    parser.add_argument("--rtt", type=float, default=0.05)
+    parser.add_argument("--capacity", type=int, default=8)
+    args = parser.parse_args()
+
+    sys.exit(BENCHMARKS[args.benchmark](args))
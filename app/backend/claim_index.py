@@ -0,0 +1,272 @@
+import os
+import re
+import time
+import zlib
+import random
+from array import array
+from typing import Dict, List, Any, Optional, Tuple
+
+from verdict_cache import normalize_claim
+
+# Minimum estimated Jaccard similarity for reusing a prior verdict, calibrated on
+# claim_pairs.LABELLED_CLAIM_PAIRS (python benchmark.py claim-threshold)
+CLAIM_INDEX_THRESHOLD = float(os.getenv("CLAIM_INDEX_THRESHOLD", "0.87"))
+CLAIM_INDEX_MAX_AGE_SECONDS = int(os.getenv("CLAIM_INDEX_MAX_AGE_SECONDS", "86400"))
+CLAIM_INDEX_MAX_ENTRIES = int(os.getenv("CLAIM_INDEX_MAX_ENTRIES", "1000000"))
+
+# 16 bands of 4 rows: pairs above ~0.5 Jaccard almost always share a bucket
+NUM_PERMUTATIONS = 64
+ROWS_PER_BAND = 4
+NUM_BANDS = NUM_PERMUTATIONS // ROWS_PER_BAND
+
+_PRIME = 4294967311  # smallest prime above 2**32
+_MASK = 0xFFFFFFFF
+_rng = random.Random(1298)  # fixed seed so signatures are stable across restarts
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERMUTATIONS)]
+
+STOPWORDS = frozenset("""
+a an the is are was were be been being am do does did done to of in on at by for from with about as into
+and or but if then than that this these those it its it's he she they them his her their we you i
+has have had will would shall should can could may might must
+what which who whom whose when where why how any all some there here just
+yesterday today tonight tomorrow now recently currently breaking reportedly actually really true
+""".split())
+_SUFFIXES = ("ing", "ed", "es", "s")
+
+# Words that flip a claim's truth; they all become the token "not"
+NEGATIONS = frozenset("""
+not no never nobody nothing none neither nor without cannot false fake hoax untrue
+deny denies denied denying debunk debunks debunked
+""".split())
+
+# Words that set which way a claim goes, mapped to one token per direction so
+# synonyms match ("rises" ~ "jumps") and opposites never do ("rises" vs "falls")
+DIRECTIONS = {}
+for _direction, _words in {
+    "up": """up rise rises rose risen rising gain gains gained gaining increase increases increased
+             jump jumps jumped surge surges surged soar soars soared climb climbs climbed rally rallies
+             rallied higher raise raises raised hike hikes hiked boost boosts boosted grow grows grew grown growth win wins won beat beats""",
+    "down": """down fall falls fell fallen falling drop drops dropped dropping decline declines declined
+               decrease decreases decreased plunge plunges plunged slump slumps slumped sink sinks sank
+               tumble tumbles tumbled crash crashes crashed lower lowers lowered shrink shrinks shrank lose loses lost
+               loss losses miss misses missed""",
+    "dead": "dead die dies died dying death killed",
+    "alive": "alive survive survives survived surviving living",
+}.items():
+    for _word in _words.split():
+        DIRECTIONS[_word] = _direction
+
+
+def _words(text: str) -> List[str]:
+    # "didn't" must keep its negation once punctuation is stripped
+    return normalize_claim(re.sub(r"n['’]t\b", " not", text or "")).split()
+
+
+def claim_polarity(text: str) -> Tuple[bool, Tuple[str, ...]]:
+    """Whether a claim is negated (odd number of negations) and which directions it asserts"""
+    words = _words(text)
+    negated = sum(1 for word in words if word in NEGATIONS) % 2 == 1
+    return negated, tuple(sorted({DIRECTIONS[word] for word in words if word in DIRECTIONS}))
+
+
+def claim_tokens(text: str) -> List[str]:
+    """Content words of a claim with stopwords dropped and common suffixes stripped"""
+    tokens = []
+    for word in _words(text):
+        if word in STOPWORDS:
+            continue
+        if word in NEGATIONS:
+            tokens.append("not")
+            continue
+        if word in DIRECTIONS:
+            tokens.append(DIRECTIONS[word])
+            continue
+        for suffix in _SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= 2:
+                word = word[:-len(suffix)]
+                # "banned" -> "bann" -> "ban"
+                if suffix in ("ing", "ed") and len(word) >= 3 and word[-1] == word[-2]:
+                    word = word[:-1]
+                break
+        # "price", "prices" and "priced" all reduce to "pric"
+        if word.endswith("e") and len(word) >= 3:
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+def minhash_signature(tokens: List[str]) -> List[int]:
+    hashes = {zlib.crc32(token.encode()) for token in tokens} or {0}
+    return [min((a * h + b) % _PRIME for h in hashes) & _MASK for a, b in _PERMUTATIONS]
+
+
+class ClaimIndex:
+    """MinHash/LSH index of previously checked claims for reusing near-duplicate verdicts.
+
+    Signatures live in one flat uint32 array and each LSH band is a dict from
+    band hash to claim ids, so a lookup touches only the handful of claims that
+    share a band with the query regardless of how many are stored. Two claims only
+    match when they agree on negation and direction, however similar their words:
+    "X did not die" never reuses the verdict for "X died". An optional `scope`
+    (e.g. a company) partitions the index the same way.
+    """
+
+    def __init__(self, threshold: float = CLAIM_INDEX_THRESHOLD,
+                 max_age_seconds: int = CLAIM_INDEX_MAX_AGE_SECONDS,
+                 max_entries: int = CLAIM_INDEX_MAX_ENTRIES):
+        self.threshold = threshold
+        self.max_age_seconds = max_age_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._reset()
+
+    def _reset(self):
+        self._signatures = array("I")
+        self._added_at = array("d")
+        # (scope, polarity) of each claim as a small code into _groups; only equal codes can match
+        self._group_codes = array("I")
+        self._groups: Dict[Tuple[str, Tuple[bool, Tuple[str, ...]]], int] = {}
+        self._group_keys: List[Tuple[str, Tuple[bool, Tuple[str, ...]]]] = []
+        self._claims: List[str] = []
+        self._payloads: List[Any] = []
+        self._ids_by_key: Dict[Tuple[str, str], int] = {}
+        self._bands: List[Dict[int, Any]] = [{} for _ in range(NUM_BANDS)]
+
+    def __len__(self) -> int:
+        return len(self._claims)
+
+    def _band_keys(self, signature: List[int]) -> List[int]:
+        return [hash(tuple(signature[b * ROWS_PER_BAND:(b + 1) * ROWS_PER_BAND])) for b in range(NUM_BANDS)]
+
+    def _group_code(self, claim: str, scope: str) -> int:
+        group = (scope, claim_polarity(claim))
+        code = self._groups.get(group)
+        if code is None:
+            code = self._groups[group] = len(self._group_keys)
+            self._group_keys.append(group)
+        return code
+
+    def add(self, claim: str, payload: Any, added_at: float = None, scope: str = ""):
+        """Store a checked claim and the payload to reuse for its near-duplicates within `scope`"""
+        key = (scope, normalize_claim(claim))
+        added_at = added_at or time.time()
+
+        existing = self._ids_by_key.get(key)
+        if existing is not None:
+            self._payloads[existing] = payload
+            self._added_at[existing] = added_at
+            return
+
+        if len(self._claims) >= self.max_entries:
+            self._compact()
+
+        claim_id = len(self._claims)
+        signature = minhash_signature(claim_tokens(claim))
+        self._signatures.extend(signature)
+        self._added_at.append(added_at)
+        self._group_codes.append(self._group_code(claim, scope))
+        self._claims.append(claim)
+        self._payloads.append(payload)
+        self._ids_by_key[key] = claim_id
+
+        for band, band_key in zip(self._bands, self._band_keys(signature)):
+            # Single ids are stored bare to keep million-entry bands small
+            bucket = band.get(band_key)
+            if bucket is None:
+                band[band_key] = claim_id
+            elif isinstance(bucket, list):
+                bucket.append(claim_id)
+            else:
+                band[band_key] = [bucket, claim_id]
+
+    def search(self, claim: str, k: int = 5, scope: str = "") -> List[Tuple[float, str, Any]]:
+        """Top-k stored claims of the same scope and polarity by estimated Jaccard similarity, skipping expired entries"""
+        group = self._groups.get((scope, claim_polarity(claim)))
+        if group is None:
+            return []
+        signature = minhash_signature(claim_tokens(claim))
+
+        candidates = set()
+        for band, band_key in zip(self._bands, self._band_keys(signature)):
+            bucket = band.get(band_key)
+            if bucket is None:
+                continue
+            if isinstance(bucket, list):
+                candidates.update(bucket)
+            else:
+                candidates.add(bucket)
+
+        oldest = time.time() - self.max_age_seconds
+        scored = []
+        for claim_id in candidates:
+            if self._added_at[claim_id] < oldest or self._group_codes[claim_id] != group:
+                continue
+            start = claim_id * NUM_PERMUTATIONS
+            stored = self._signatures[start:start + NUM_PERMUTATIONS]
+            matches = sum(1 for x, y in zip(signature, stored) if x == y)
+            scored.append((matches / NUM_PERMUTATIONS, claim_id))
+
+        scored.sort(reverse=True)
+        return [(similarity, self._claims[i], self._payloads[i]) for similarity, i in scored[:k]]
+
+    def lookup(self, claim: str, scope: str = "") -> Optional[Tuple[str, Any]]:
+        """Best stored (claim, payload) in `scope` whose similarity passes the threshold"""
+        results = self.search(claim, k=1, scope=scope)
+        if results and results[0][0] >= self.threshold:
+            self.hits += 1
+            return results[0][1], results[0][2]
+        self.misses += 1
+        return None
+
+    def _compact(self):
+        """Rebuild from the newest half of the unexpired entries"""
+        oldest = time.time() - self.max_age_seconds
+        keep = [i for i in range(len(self._claims)) if self._added_at[i] >= oldest]
+        keep = keep[len(keep) - self.max_entries // 2:] if len(keep) > self.max_entries // 2 else keep
+        entries = [(self._claims[i], self._payloads[i], self._added_at[i], self._group_keys[self._group_codes[i]][0])
+                   for i in keep]
+
+        self._reset()
+        for claim, payload, added_at, scope in entries:
+            self.add(claim, payload, added_at, scope)
+
+    def similarity(self, claim: str, other: str) -> float:
+        """Similarity `lookup` would see between two claims; 0.0 when their polarity differs"""
+        if claim_polarity(claim) != claim_polarity(other):
+            return 0.0
+        signature, stored = minhash_signature(claim_tokens(claim)), minhash_signature(claim_tokens(other))
+        return sum(1 for x, y in zip(signature, stored) if x == y) / NUM_PERMUTATIONS
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._claims),
+            "threshold": self.threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+
+def calibrate_threshold(pairs: List[Tuple[str, str, bool]], index: ClaimIndex = None) -> Dict[str, Any]:
+    """Threshold with the best F0.5 on labelled (claim, claim, same_claim) pairs.
+
+    F0.5 weighs precision over recall: reusing a verdict for a different claim
+    is worse than re-checking a duplicate. Ties go to the stricter threshold.
+    """
+    index = index or ClaimIndex()
+    scored = [(index.similarity(a, b), same) for a, b, same in pairs]
+    positives = sum(1 for _, same in scored if same)
+    best = None
+    for step in range(100, 0, -1):
+        threshold = step / 100
+        tp = sum(1 for similarity, same in scored if same and similarity >= threshold)
+        fp = sum(1 for similarity, same in scored if not same and similarity >= threshold)
+        precision = tp / (tp + fp) if tp + fp else 1.0
+        recall = tp / positives if positives else 1.0
+        f_score = 1.25 * precision * recall / (0.25 * precision + recall) if precision + recall else 0.0
+        if best is None or f_score > best["f_score"]:
+            best = {"threshold": threshold, "precision": round(precision, 3), "recall": round(recall, 3),
+                    "f_score": round(f_score, 3), "false_matches": fp, "pairs": len(pairs)}
+    return best
@@ -0,0 +1,99 @@
+# Labelled claim pairs for calibrating CLAIM_INDEX_THRESHOLD: (claim, claim, same_claim).
+# "Same" means one verdict answers both; negations, reversed directions, other
+# people or companies and other figures are different claims however close the wording.
+LABELLED_CLAIM_PAIRS = [
+    # Rewordings of one claim
+    ("Sachin Tendulkar died yesterday", "Sachin Tendulkar dies yesterday", True),
+    ("Sachin Tendulkar died yesterday", "Sachin Tendulkar is dead", True),
+    ("Sachin Tendulkar died", "Sachin Tendulkar dead", True),
+    ("Apple stock falls 5%", "Apple stock fell 5%", True),
+    ("Apple stock falls 5%", "Apple stock drops 5%", True),
+    ("Apple stock rises 5% today", "Apple stock jumps 5% today", True),
+    ("Tesla recalls 2 million cars over autopilot", "Tesla recalls 2 million cars over Autopilot flaws", True),
+    ("The moon landing was faked", "Moon landing was faked", True),
+    ("NASA confirms water on Mars", "NASA has confirmed water on Mars", True),
+    ("WHO declares mpox a global health emergency", "The WHO declares mpox a global health emergency", True),
+    ("Drinking bleach cures COVID-19", "Drinking bleach cures COVID 19", True),
+    ("5G towers spread coronavirus", "5G towers are spreading the coronavirus", True),
+    ("Microsoft acquires Activision Blizzard for $69 billion", "Microsoft acquired Activision Blizzard for $69 billion", True),
+    ("Amazon lays off 18000 employees", "Amazon layoffs hit 18000 employees", True),
+    ("Vaccines cause autism in children", "Vaccines cause autism in kids", True),
+    ("Twitter bans Donald Trump permanently", "Twitter permanently bans Donald Trump", True),
+    ("Eiffel Tower to be demolished in 2025", "The Eiffel Tower will be demolished in 2025", True),
+    ("Bitcoin price surges past $100000", "Bitcoin price soars past $100000", True),
+    ("Google fined 4 billion euros by EU", "Google fined 4 billion euros by the EU", True),
+    ("Infosys shares gain 3% after results", "Infosys shares rise 3% after results", True),
+    ("Reliance Jio cuts tariffs by 20%", "Reliance Jio cuts its tariffs by 20%", True),
+    ("India bans TikTok", "India has banned TikTok", True),
+    ("Earth is flat", "The Earth is flat", True),
+    ("Elon Musk buys Twitter for $44 billion", "Elon Musk bought Twitter for $44 billion", True),
+    ("Government announces free electricity for farmers", "The government announced free electricity for farmers", True),
+    ("Ukraine president Zelensky killed in Kyiv", "Ukraine president Zelensky died in Kyiv", True),
+    ("RBI raises repo rate by 25 basis points", "RBI increases repo rate by 25 basis points", True),
+    ("Boeing 737 MAX grounded worldwide", "Boeing 737 MAX grounded worldwide again", True),
+    ("Queen Elizabeth died at Balmoral", "Queen Elizabeth has died at Balmoral", True),
+    ("Netflix subscribers fell by 200000", "Netflix subscribers dropped by 200000", True),
+
+    # Questions and short forms of a claim, as users ask them
+    ("Did Sachin Tendulkar die yesterday?", "Sachin Tendulkar dead", True),
+    ("Sachin Tendulkar died yesterday", "Sachin Tendulkar dead", True),
+    ("Is Sachin Tendulkar dead?", "Sachin Tendulkar died today", True),
+    ("Did Apple stock fall 5% today?", "Apple stock falls 5%", True),
+    ("Is the Earth flat?", "Earth flat", True),
+    ("Did India ban TikTok?", "India bans TikTok", True),
+    ("Is it true that 5G spreads coronavirus?", "5G spreads coronavirus", True),
+    ("Was the moon landing faked?", "Moon landing faked", True),
+    ("Did Elon Musk buy Twitter?", "Elon Musk buys Twitter", True),
+    ("Has NASA confirmed water on Mars?", "NASA confirms water on Mars", True),
+    ("Did Queen Elizabeth die?", "Queen Elizabeth dead", True),
+    ("Bitcoin crashed just now", "Bitcoin crashes", True),
+    ("Did Sachin Tendulkar die yesterday?", "Virat Kohli dead", False),
+    ("Is Sachin Tendulkar dead?", "Is Sachin Tendulkar alive?", False),
+    ("Did Apple stock fall 5% today?", "Apple stock rises 5%", False),
+    ("Did India ban TikTok?", "India did not ban TikTok", False),
+    ("Is the Earth flat?", "Is the Earth round?", False),
+    ("Did Elon Musk buy Twitter?", "Elon Musk buys Tesla", False),
+    ("Did Queen Elizabeth die?", "Prince Charles dead", False),
+
+    # Negations
+    ("Sachin Tendulkar did not die yesterday", "Sachin Tendulkar died yesterday", False),
+    ("Sachin Tendulkar didn't die", "Sachin Tendulkar died", False),
+    ("Sachin Tendulkar is alive", "Sachin Tendulkar is dead", False),
+    ("NASA confirms water on Mars", "NASA denies water on Mars", False),
+    ("Vaccines cause autism", "Vaccines do not cause autism", False),
+    ("The moon landing was faked", "The moon landing was not faked", False),
+    ("India bans TikTok", "India does not ban TikTok", False),
+    ("Earth is flat", "Earth is not flat", False),
+    ("5G towers spread coronavirus", "5G towers never spread coronavirus", False),
+    ("Apple will release a new iPhone in September", "Apple will not release a new iPhone in September", False),
+    ("Tesla recalls 2 million cars", "Tesla denied it recalls 2 million cars", False),
+    ("The government announced free electricity for farmers", "No free electricity for farmers, government says", False),
+
+    # Reversed directions
+    ("Apple stock falls 5%", "Apple stock rises 5%", False),
+    ("Bitcoin price surges past $100000", "Bitcoin price crashes past $100000", False),
+    ("Infosys shares gain 3% after results", "Infosys shares lose 3% after results", False),
+    ("Netflix subscribers fell by 200000", "Netflix subscribers grew by 200000", False),
+    ("RBI raises repo rate by 25 basis points", "RBI lowers repo rate by 25 basis points", False),
+    ("Inflation increased to 7% in June", "Inflation decreased to 7% in June", False),
+    ("India wins the World Cup final", "India loses the World Cup final", False),
+    ("Gold prices climb to record high", "Gold prices tumble from record high", False),
+
+    # Other people, companies or figures
+    ("Sachin Tendulkar died yesterday", "Virat Kohli died yesterday", False),
+    ("Apple stock falls 5%", "Google stock falls 5%", False),
+    ("Apple stock falls 5%", "Apple stock falls 50%", False),
+    ("Tesla recalls 2 million cars over autopilot", "Ford recalls 2 million cars over autopilot", False),
+    ("Microsoft acquires Activision Blizzard for $69 billion", "Microsoft acquires Nuance for $19 billion", False),
+    ("Google fined 4 billion euros by EU", "Meta fined 1 billion euros by EU", False),
+    ("India bans TikTok", "India bans PUBG", False),
+    ("Elon Musk buys Twitter for $44 billion", "Elon Musk sells Tesla shares worth $44 billion", False),
+    ("Queen Elizabeth died at Balmoral", "Prince Philip died at Windsor", False),
+    ("RBI raises repo rate by 25 basis points", "RBI raises repo rate by 50 basis points", False),
+    ("Amazon lays off 18000 employees", "Amazon lays off 10000 employees", False),
+    ("Boeing 737 MAX grounded worldwide", "Airbus A320 grounded worldwide", False),
+    ("WHO declares mpox a global health emergency", "WHO declares covid a global health emergency", False),
+    ("Twitter bans Donald Trump permanently", "Facebook bans Donald Trump permanently", False),
+    ("Reliance Jio cuts tariffs by 20%", "Airtel cuts tariffs by 20%", False),
+    ("Drinking bleach cures COVID-19", "Drinking hot water cures COVID-19", False),
+]
@@ -1,14 +1,30 @@
 import os
 import json
+import asyncio
+import hashlib
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse, JSONResponse
 from pydantic import BaseModel
 from google import genai
-from pymongo import MongoClient
 from bson import ObjectId
 from dotenv import load_dotenv
+from gemini_client import GeminiClient
+from claim_index import ClaimIndex
+from parsing import parse_web_presence, parse_news_lines, grounding_web_chunks, SourceIndex
+from batch_verify import verify_claims, chunked, VERIFY_BATCH_SIZE
+from schemas import StructuredParser, VERIFICATION_SCHEMA
+from verdict_cache import normalize_claim
+from stats_store import record_analysis, tracking_timeline, trend_data
+from jobs import JobQueue, job_status, FINISHED
+from sse import sse_event
+from scheduler import MonitorScheduler, MONITOR_ENABLED
+from repository import (
+    get_database, ensure_indexes, canonical_company_id, company_object_id, tracking_filter,
+    save_analysis_run, load_run_news, stats_history
+)
 
 # Load environment variables
 load_dotenv()
@@ -22,12 +38,17 @@ if not MONGODB_URI:
 
 # Initialize Google GenAI
 ai = genai.Client(api_key=API_KEY)
+gemini = GeminiClient(ai)
+structured = StructuredParser(gemini)
+claim_index = ClaimIndex()
 
 # Initialize MongoDB
-mongo_client = MongoClient(MONGODB_URI)
-db = mongo_client['test']
+db = get_database(MONGODB_URI)
 companies_collection = db['companies']
 news_tracking_collection = db['news_tracking']
+company_stats_collection = db['company_stats']
+news_items_collection = db['news_items']
+analysis_jobs_collection = db['analysis_jobs']
 
 print(f"Connected to MongoDB")
 print(f"Database: {db.name}")
@@ -43,8 +64,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def create_indexes():
+    ensure_indexes(db)
+
 SEARCH_TOOLS = [{"google_search": {}}]
 
+# Discovery stage: deadline for each concurrent website/news search
+DISCOVERY_TIMEOUT_SECONDS = float(os.getenv("DISCOVERY_TIMEOUT_SECONDS", "30"))
+
+# Verification stage: parallel grounded-search calls and per-item deadline
+VERIFY_CONCURRENCY = int(os.getenv("VERIFY_CONCURRENCY", "10"))
+VERIFY_TIMEOUT_SECONDS = float(os.getenv("VERIFY_TIMEOUT_SECONDS", "45"))
+
+# Incremental analysis: how long a verdict stays valid and how many recent runs to reuse from
+VERDICT_FRESHNESS_HOURS = float(os.getenv("VERDICT_FRESHNESS_HOURS", "24"))
+INCREMENTAL_LOOKBACK_RUNS = int(os.getenv("INCREMENTAL_LOOKBACK_RUNS", "5"))
+
+# How long /api/company/fetch-news holds the request open before answering 202 with the job to poll;
+# kept under the dashboard's 3 minute timeout so the Next proxy gets to poll the job
+FETCH_NEWS_WAIT_SECONDS = float(os.getenv("FETCH_NEWS_WAIT_SECONDS", "120"))
+
 # ==================== ENHANCED AGENTS (30 NEWS ITEMS + DETAILED UI) ====================
 
 async def find_company_websites(company_name: str) -> Dict[str, Any]:
@@ -52,51 +92,28 @@ async def find_company_websites(company_name: str) -> Dict[str, Any]:
     try:
         print(f"Agent 1: Finding comprehensive web presence for '{company_name}'...")
 
-        response = ai.models.generate_content(
+        response = await gemini.generate_content(
             model="gemini-2.5-flash",
             contents=f"Find the official website, social media accounts, and investor relations page for company: {company_name}. Format: WEBSITE: [url] | SOCIAL: [twitter,linkedin,facebook] | INVESTOR: [url]",
             config={
                 "tools": SEARCH_TOOLS,
                 "temperature": 0.1
-            }
+            },
+            timeout=DISCOVERY_TIMEOUT_SECONDS
         )
 
-        text = response.text or ""
-
         # Parse all web properties
-        import re
-        website_match = re.search(r'WEBSITE:\s*([^\s\n|]+)', text)
-        social_match = re.search(r'SOCIAL:\s*([^|]+)', text)
-        investor_match = re.search(r'INVESTOR:\s*([^\s\n|]+)', text)
-
-        official_website = website_match.group(1).strip() if website_match else ""
-
-        social_media = []
-        if social_match:
-            social_text = social_match.group(1)
-            urls = re.findall(r'https?://[^\s,\]]+', social_text)
-            social_media = urls[:5]
-
-        investor_relations = investor_match.group(1).strip() if investor_match else ""
+        presence = parse_web_presence(response.text or "")
 
         # Get sources from grounding
-        sources = []
-        if response.candidates and len(response.candidates) > 0:
-            if response.candidates[0].grounding_metadata:
-                grounding_chunks = response.candidates[0].grounding_metadata.grounding_chunks or []
-                for chunk in grounding_chunks:
-                    if chunk.web:
-                        sources.append({
-                            "title": chunk.web.title,
-                            "uri": chunk.web.uri,
-                            "snippet": getattr(chunk.web, 'snippet', '')[:150]
-                        })
-
-        print(f"Agent 1: Found website: {official_website}, {len(social_media)} social accounts")
+        sources = [
+            {"title": web.title, "uri": web.uri, "snippet": getattr(web, 'snippet', '')[:150]}
+            for web in grounding_web_chunks(response)
+        ]
+
+        print(f"Agent 1: Found website: {presence['official_website']}, {len(presence['social_media'])} social accounts")
         return {
-            "official_website": official_website,
-            "social_media": social_media,
-            "investor_relations": investor_relations,
+            **presence,
             "sources": sources[:5],
             "timestamp": datetime.utcnow().isoformat()
         }
@@ -110,339 +127,686 @@ async def find_company_websites(company_name: str) -> Dict[str, Any]:
             "timestamp": datetime.utcnow().isoformat()
         }
 
-async def find_company_news(company_name: str) -> List[Dict[str, Any]]:
-    """Enhanced news finder - gets 30 news items with detailed sources"""
-    try:
-        print(f"Agent 2: Finding 30 news items for '{company_name}'...")
+NEWS_TARGET = 30
+NEWS_CATEGORIES = ["Breaking News", "Financial", "Product/Innovation", "Partnerships", "Legal/Regulatory"]
 
-        # Make multiple targeted searches to get diverse news
-        all_news_items = []
+async def iter_company_news(company_name: str):
+    """Run the category news searches concurrently, yielding each search's parsed headlines as it lands"""
+    print(f"Agent 2: Finding {NEWS_TARGET} news items for '{company_name}'...")
 
-        search_queries = [
-            f"Find 12 most recent news headlines about {company_name} from last 7 days. Format: NEWS: [headline] | SOURCE: [source] | DATE: [date] | SENTIMENT: [positive/negative/neutral]",
-            f"Find 10 financial news about {company_name} earnings, revenue, stock, investments. Format: NEWS: [headline] | SOURCE: [source] | DATE: [date] | SENTIMENT: [positive/negative/neutral]",
-            f"Find 8 product launches and innovation news about {company_name}. Format: NEWS: [headline] | SOURCE: [source] | DATE: [date] | SENTIMENT: [positive/negative/neutral]",
-            f"Find 6 partnership and business deals news about {company_name}. Format: NEWS: [headline] | SOURCE: [source] | DATE: [date] | SENTIMENT: [positive/negative/neutral]",
-            f"Find 4 regulatory and legal news about {company_name}. Format: NEWS: [headline] | SOURCE: [source] | DATE: [date] | SENTIMENT: [positive/negative/neutral]"
-        ]
+    # Make multiple targeted searches to get diverse news
+    search_queries = [
+        f"Find 12 most recent news headlines about {company_name} from last 7 days. Format: NEWS: [headline] | SOURCE: [source] | DATE: [date] | SENTIMENT: [positive/negative/neutral]",
+        f"Find 10 financial news about {company_name} earnings, revenue, stock, investments. Format: NEWS: [headline] | SOURCE: [source] | DATE: [date] | SENTIMENT: [positive/negative/neutral]",
+        f"Find 8 product launches and innovation news about {company_name}. Format: NEWS: [headline] | SOURCE: [source] | DATE: [date] | SENTIMENT: [positive/negative/neutral]",
+        f"Find 6 partnership and business deals news about {company_name}. Format: NEWS: [headline] | SOURCE: [source] | DATE: [date] | SENTIMENT: [positive/negative/neutral]",
+        f"Find 4 regulatory and legal news about {company_name}. Format: NEWS: [headline] | SOURCE: [source] | DATE: [date] | SENTIMENT: [positive/negative/neutral]"
+    ]
 
-        categories = ["Breaking News", "Financial", "Product/Innovation", "Partnerships", "Legal/Regulatory"]
-        all_sources = []
+    categories = NEWS_CATEGORIES
+    all_sources = SourceIndex()
+    found = 0
 
-        for i, query in enumerate(search_queries):
+    async def run_search(i: int, query: str):
+        try:
+            return i, await gemini.generate_content(
+                model="gemini-2.5-flash",
+                contents=query,
+                config={
+                    "tools": SEARCH_TOOLS,
+                    "temperature": 0.2
+                },
+                timeout=DISCOVERY_TIMEOUT_SECONDS
+            )
+        except Exception as search_error:
+            return i, search_error
+
+    # Fan out all category searches and merge each one as soon as it lands
+    searches = [asyncio.create_task(run_search(i, query)) for i, query in enumerate(search_queries)]
+
+    try:
+        for next_done in asyncio.as_completed(searches):
+            i, response = await next_done
+            batch = []
             try:
-                response = ai.models.generate_content(
-                    model="gemini-2.5-flash",
-                    contents=query,
-                    config={
-                        "tools": SEARCH_TOOLS,
-                        "temperature": 0.2
-                    }
-                )
+                if isinstance(response, Exception):
+                    raise response
 
                 # Collect grounding sources
-                if response.candidates and len(response.candidates) > 0:
-                    if response.candidates[0].grounding_metadata:
-                        grounding_chunks = response.candidates[0].grounding_metadata.grounding_chunks or []
-                        for chunk in grounding_chunks:
-                            if chunk.web:
-                                all_sources.append({
-                                    "title": chunk.web.title,
-                                    "uri": chunk.web.uri,
-                                    "snippet": getattr(chunk.web, 'snippet', '')[:200],
-                                    "category": categories[i]
-                                })
-
-                text = response.text or ""
-
-                # Parse with enhanced regex
-                import re
-                news_matches = re.findall(r'NEWS:\s*([^|]+)\s*\|\s*SOURCE:\s*([^|]+)\s*\|\s*DATE:\s*([^|]+)\s*\|\s*SENTIMENT:\s*([^\n]+)', text, re.IGNORECASE)
-
-                for headline, source, date, sentiment in news_matches:
+                for web in grounding_web_chunks(response):
+                    all_sources.add({
+                        "title": web.title,
+                        "uri": web.uri,
+                        "snippet": getattr(web, 'snippet', '')[:200],
+                        "category": categories[i]
+                    })
+
+                for headline, source, date, sentiment in parse_news_lines(response.text or ""):
                     # Try to match with grounding sources
-                    matched_source = None
-                    headline_words = headline.lower().split()[:4]
+                    matched_source = all_sources.match(headline)
 
-                    for src in all_sources:
-                        if any(word in src['title'].lower() for word in headline_words):
-                            matched_source = src
-                            break
-
-                    news_item = {
-                        "id": len(all_news_items) + 1,
-                        "title": headline.strip(),
+                    found += 1
+                    batch.append({
+                        "id": found,
+                        "title": headline,
                         "summary": f"{categories[i]} about {company_name}",
-                        "source": source.strip(),
+                        "source": source,
                         "source_url": matched_source['uri'] if matched_source else "",
-                        "date": date.strip(),
+                        "date": date,
                         "category": categories[i],
-                        "sentiment": sentiment.strip().lower(),
+                        "sentiment": sentiment.lower(),
                         "snippet": matched_source['snippet'] if matched_source else "",
                         "grounding_source": matched_source,
                         "relevance_score": 0.9 - (i * 0.1),  # Higher score for more recent/relevant categories
                         "timestamp": datetime.utcnow().isoformat()
-                    }
-                    all_news_items.append(news_item)
+                    })
 
             except Exception as search_error:
                 print(f"Search {i+1} error: {search_error}")
-                continue
 
-        # Fill remaining slots if needed
-        while len(all_news_items) < 30:
-            category_idx = len(all_news_items) % len(categories)
-            all_news_items.append({
-                "id": len(all_news_items) + 1,
-                "title": f"Additional {company_name} news item #{len(all_news_items) + 1}",
-                "summary": f"{categories[category_idx]} news about {company_name}",
-                "source": "Web Search",
-                "source_url": "",
-                "date": "Recent",
-                "category": categories[category_idx],
-                "sentiment": "neutral",
-                "snippet": "",
-                "grounding_source": None,
-                "relevance_score": 0.5,
-                "timestamp": datetime.utcnow().isoformat()
-            })
-
-        # Sort by relevance and return exactly 30
-        final_news = sorted(all_news_items, key=lambda x: x['relevance_score'], reverse=True)[:30]
-
-        print(f"Agent 2: Successfully found {len(final_news)} news items with {len(all_sources)} verified sources")
-        return final_news
+            yield categories[i], batch
+    finally:
+        for search in searches:
+            search.cancel()
+
+    print(f"Agent 2: Found {found} news items with {len(all_sources)} verified sources")
+
+def select_company_news(all_news_items: List[Dict[str, Any]], company_name: str) -> List[Dict[str, Any]]:
+    """Pad discovered headlines up to NEWS_TARGET and keep the most relevant ones"""
+    all_news_items = list(all_news_items)
+    categories = NEWS_CATEGORIES
+
+    # Fill remaining slots if needed
+    while len(all_news_items) < NEWS_TARGET:
+        category_idx = len(all_news_items) % len(categories)
+        all_news_items.append({
+            "id": len(all_news_items) + 1,
+            "title": f"Additional {company_name} news item #{len(all_news_items) + 1}",
+            "summary": f"{categories[category_idx]} news about {company_name}",
+            "source": "Web Search",
+            "source_url": "",
+            "date": "Recent",
+            "category": categories[category_idx],
+            "sentiment": "neutral",
+            "snippet": "",
+            "grounding_source": None,
+            "relevance_score": 0.5,
+            "timestamp": datetime.utcnow().isoformat()
+        })
+
+    # Sort by relevance and return exactly NEWS_TARGET
+    return sorted(all_news_items, key=lambda x: x['relevance_score'], reverse=True)[:NEWS_TARGET]
+
+def placeholder_company_news(company_name: str) -> List[Dict[str, Any]]:
+    """Placeholder items returned when discovery fails outright"""
+    return [{
+        "id": i + 1,
+        "title": f"News item #{i+1}: {company_name} market update",
+        "summary": f"Market news about {company_name}",
+        "source": "Market Data",
+        "source_url": "",
+        "date": (datetime.now() - timedelta(days=i)).strftime("%Y-%m-%d"),
+        "category": ["Financial", "Product", "Business", "Market", "Tech"][i % 5],
+        "sentiment": ["positive", "neutral", "negative"][i % 3],
+        "snippet": f"Latest developments regarding {company_name}",
+        "grounding_source": None,
+        "relevance_score": 0.7 - (i * 0.01),
+        "timestamp": datetime.utcnow().isoformat()
+    } for i in range(NEWS_TARGET)]
+
+async def find_company_news(company_name: str) -> List[Dict[str, Any]]:
+    """Enhanced news finder - gets 30 news items with detailed sources"""
+    try:
+        all_news_items = []
+        async for _, batch in iter_company_news(company_name):
+            all_news_items.extend(batch)
+        return select_company_news(all_news_items, company_name)
 
     except Exception as e:
         print(f"Agent 2 Error: {e}")
         # Return 30 placeholder items on error
-        return [{
-            "id": i + 1,
-            "title": f"News item #{i+1}: {company_name} market update",
-            "summary": f"Market news about {company_name}",
-            "source": "Market Data",
-            "source_url": "",
-            "date": (datetime.now() - timedelta(days=i)).strftime("%Y-%m-%d"),
-            "category": ["Financial", "Product", "Business", "Market", "Tech"][i % 5],
-            "sentiment": ["positive", "neutral", "negative"][i % 3],
-            "snippet": f"Latest developments regarding {company_name}",
-            "grounding_source": None,
-            "relevance_score": 0.7 - (i * 0.01),
-            "timestamp": datetime.utcnow().isoformat()
-        } for i in range(30)]
+        return placeholder_company_news(company_name)
+
+def unverified_news_item(news_item: Dict[str, Any], reason: str) -> Dict[str, Any]:
+    """News item carrying an UNCERTAIN verification for when the verifier could not run"""
+    return {
+        **news_item,
+        "verification": {
+            "verdict": "UNCERTAIN",
+            "confidence": 0.0,
+            "bias_level": "unknown",
+            "impact_level": "unknown",
+            "reasoning": reason,
+            "verified_at": datetime.utcnow().isoformat()
+        }
+    }
 
-async def verify_news_item(news_item: Dict[str, Any], company_name: str) -> Dict[str, Any]:
+async def verify_news_item(news_item: Dict[str, Any], company_name: str, timeout: float = None) -> Dict[str, Any]:
     """Enhanced news verifier with detailed analysis"""
     try:
         headline = news_item.get('title', '')
         source = news_item.get('source', '')
 
-        response = ai.models.generate_content(
+        # Reuse the verification of a near-identical headline checked earlier for the same company
+        similar = claim_index.lookup(headline, scope=normalize_claim(company_name))
+        if similar is not None:
+            return {**news_item, "verification": similar[1]}
+
+        response = await gemini.generate_content(
             model="gemini-2.5-flash",
-            contents=f'Verify this news about {company_name}: "{headline}" from source "{source}". Check factual accuracy and provide: VERDICT: [REAL/FAKE/UNCERTAIN], CONFIDENCE: [0.0-1.0], BIAS: [low/medium/high], IMPACT: [low/medium/high]',
+            contents=f'Verify this news about {company_name}: "{headline}" from source "{source}". Check factual accuracy, bias and business impact. Respond with ONLY a JSON object (no markdown) matching this JSON schema: {json.dumps(VERIFICATION_SCHEMA)}',
             config={
                 "tools": SEARCH_TOOLS,
                 "temperature": 0.1
-            }
+            },
+            timeout=timeout
         )
 
-        text = response.text or ""
+        result = await structured.verification(response.text or "")
+        if result is None:
+            return unverified_news_item(news_item, "Verification response could not be parsed")
+
+        verification = {
+            "verdict": result.verdict,
+            "confidence": result.confidence,
+            "bias_level": result.bias,
+            "impact_level": result.impact,
+            "reasoning": result.explanation[:300],
+            "verified_at": datetime.utcnow().isoformat()
+        }
+        claim_index.add(headline, verification, scope=normalize_claim(company_name))
 
-        # Enhanced parsing
-        import re
-        verdict = 'UNCERTAIN'
-        confidence = 0.5
-        bias = 'medium'
-        impact = 'medium'
+        return {**news_item, "verification": verification}
+    except Exception as e:
+        print(f"Agent 3 Error: {e}")
+        return unverified_news_item(news_item, f"Verification failed: {str(e) or type(e).__name__}")
+
+async def verify_news_batch(news_items: List[Dict[str, Any]], company_name: str,
+                            timeout: float = None) -> List[Optional[Dict[str, Any]]]:
+    """Verify several news items in one grounded call; items the batch could not resolve come back as None"""
+    verified: List[Optional[Dict[str, Any]]] = [None] * len(news_items)
+    pending = []
+    scope = normalize_claim(company_name)
+    for index, news in enumerate(news_items):
+        similar = claim_index.lookup(news.get('title', ''), scope=scope)
+        if similar is not None:
+            verified[index] = {**news, "verification": similar[1]}
+        else:
+            pending.append(index)
+    if not pending:
+        return verified
+
+    claims = [f'"{news_items[i].get("title", "")}" (source: {news_items[i].get("source", "")})' for i in pending]
+    try:
+        verdicts = await verify_claims(
+            structured, claims,
+            context=f"Each claim is a news headline about {company_name}; judge whether the reported news is accurate.",
+            timeout=timeout
+        )
+    except Exception as e:
+        print(f"Agent 3 batch error: {e}")
+        return verified
+
+    for index, verdict in zip(pending, verdicts):
+        if verdict is None:
+            continue
+        verification = {
+            "verdict": verdict["verdict"],
+            "confidence": verdict["confidence"],
+            "bias_level": verdict["bias"],
+            "impact_level": verdict["impact"],
+            "reasoning": verdict["explanation"][:300],
+            "verified_at": datetime.utcnow().isoformat()
+        }
+        claim_index.add(news_items[index].get('title', ''), verification, scope=scope)
+        verified[index] = {**news_items[index], "verification": verification}
+    return verified
 
-        verdict_match = re.search(r'VERDICT:\s*(REAL|FAKE|UNCERTAIN)', text, re.IGNORECASE)
-        if verdict_match:
-            verdict = verdict_match.group(1).upper()
+async def iter_verified_news(news_items: List[Dict[str, Any]], company_name: str):
+    """Verify news items concurrently, yielding (index, verified_item) as each one completes.
 
-        confidence_match = re.search(r'CONFIDENCE:\s*([0-9]*\.?[0-9]+)', text, re.IGNORECASE)
-        if confidence_match:
-            confidence = float(confidence_match.group(1))
+    Items are verified VERIFY_BATCH_SIZE at a time in one grounded call each; only the
+    items a batch leaves unresolved fall back to their own verify_news_item call.
+    """
+    semaphore = asyncio.Semaphore(VERIFY_CONCURRENCY)
 
-        bias_match = re.search(r'BIAS:\s*(low|medium|high)', text, re.IGNORECASE)
-        if bias_match:
-            bias = bias_match.group(1).lower()
+    async def verify(index: int):
+        async with semaphore:
+            try:
+                return [(index, await verify_news_item(news_items[index], company_name, timeout=VERIFY_TIMEOUT_SECONDS))]
+            except Exception as e:
+                return [(index, unverified_news_item(news_items[index], f"Verification failed: {str(e) or type(e).__name__}"))]
 
-        impact_match = re.search(r'IMPACT:\s*(low|medium|high)', text, re.IGNORECASE)
-        if impact_match:
-            impact = impact_match.group(1).lower()
+    async def verify_batch(indices: List[int]):
+        async with semaphore:
+            try:
+                verified = await verify_news_batch([news_items[i] for i in indices], company_name, timeout=VERIFY_TIMEOUT_SECONDS)
+            except Exception as e:
+                # Every item of a failed batch falls back to its own verify_news_item call
+                print(f"Agent 3 batch error: {e}")
+                verified = [None] * len(indices)
+        return list(zip(indices, verified))
+
+    indices = list(range(len(news_items)))
+    if VERIFY_BATCH_SIZE > 1 and len(indices) > 1:
+        tasks = {asyncio.create_task(verify_batch(chunk)) for chunk in chunked(indices, VERIFY_BATCH_SIZE)}
+    else:
+        tasks = {asyncio.create_task(verify(i)) for i in indices}
 
-        return {
-            **news_item,
-            "verification": {
-                "verdict": verdict,
-                "confidence": confidence,
-                "bias_level": bias,
-                "impact_level": impact,
-                "reasoning": text.strip()[:300],
-                "verified_at": datetime.utcnow().isoformat()
-            }
-        }
-    except Exception as e:
-        print(f"Agent 3 Error: {e}")
-        return {
-            **news_item,
-            "verification": {
-                "verdict": "UNCERTAIN",
-                "confidence": 0.0,
-                "bias_level": "unknown",
-                "impact_level": "unknown",
-                "reasoning": f"Verification failed: {str(e)}",
-                "verified_at": datetime.utcnow().isoformat()
-            }
-        }
+    try:
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                for index, verified in task.result():
+                    if verified is None:
+                        tasks.add(asyncio.create_task(verify(index)))
+                    else:
+                        yield index, verified
+    finally:
+        for task in tasks:
+            task.cancel()
+
+# ==================== INCREMENTAL ANALYSIS ====================
+
+def news_fingerprint(news_item: Dict[str, Any]) -> str:
+    """Stable identity of a discovered headline+source across analysis runs"""
+    key = f"{normalize_claim(news_item.get('title', ''))}|{normalize_claim(news_item.get('source', ''))}"
+    return hashlib.sha1(key.encode()).hexdigest()
+
+def load_recent_runs(company_id: str) -> List[Dict[str, Any]]:
+    """Recent tracking documents still inside the freshness window, newest first"""
+    since = datetime.utcnow() - timedelta(hours=VERDICT_FRESHNESS_HOURS)
+    return list(
+        news_tracking_collection
+        .find(
+            {**tracking_filter(company_id), "timestamp": {"$gte": since}},
+            {"timestamp": 1, "websites": 1, "verified_news.title": 1, "verified_news.source": 1,
+             "verified_news.fingerprint": 1, "verified_news.verification": 1}
+        )
+        .sort("timestamp", -1)
+        .limit(INCREMENTAL_LOOKBACK_RUNS)
+    )
+
+def fresh_verifications(recent_runs: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Fingerprint -> newest verification that succeeded and is still within the freshness window"""
+    since = (datetime.utcnow() - timedelta(hours=VERDICT_FRESHNESS_HOURS)).isoformat()
+    # Runs in the split layout keep their items in news_items; fetch them in one query
+    split_run_ids = [run['_id'] for run in recent_runs if run.get('verified_news') is None]
+    items_by_run = {}
+    if split_run_ids:
+        for item in news_items_collection.find(
+            {"run_id": {"$in": split_run_ids}},
+            {"run_id": 1, "title": 1, "source": 1, "fingerprint": 1, "verification": 1}
+        ):
+            items_by_run.setdefault(item['run_id'], []).append(item)
+
+    fresh = {}
+    for run in recent_runs:
+        for item in run.get('verified_news') or items_by_run.get(run['_id'], []):
+            verification = item.get('verification') or {}
+            # Failed or timed-out checks are retried rather than carried forward
+            if verification.get('bias_level', 'unknown') == 'unknown':
+                continue
+            if verification.get('verified_at', '') < since:
+                continue
+            fresh.setdefault(item.get('fingerprint') or news_fingerprint(item), verification)
+    return fresh
 
 # ==================== ENHANCED ORCHESTRATOR WITH DETAILED DATA ====================
-async def analyze_company(company_id: str) -> Dict[str, Any]:
-    """Enhanced orchestrator with detailed analytics and graph data"""
+def load_company(company_id: str):
+    """Canonical id and company document, or the HTTP error the routes should return"""
     try:
-        print(f"Starting comprehensive analysis for company ID: {company_id}")
+        company_id = canonical_company_id(company_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid company ID")
+
+    company = companies_collection.find_one({"_id": company_object_id(company_id)})
+    if not company:
+        raise HTTPException(status_code=404, detail="Company not found")
+    return company_id, company
+
+def verdict_counts(verified_news: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Running verdict tally over the items verified so far"""
+    verdicts = [n.get('verification', {}).get('verdict') for n in verified_news if n]
+    confidences = [n.get('verification', {}).get('confidence', 0) for n in verified_news if n]
+    return {
+        "verified": len(verdicts),
+        "real_count": verdicts.count('REAL'),
+        "fake_count": verdicts.count('FAKE'),
+        "uncertain_count": verdicts.count('UNCERTAIN'),
+        "avg_confidence": round(sum(confidences) / len(confidences), 3) if confidences else 0
+    }
 
-        # Get company from database
-        try:
-            obj_id = ObjectId(company_id)
-        except Exception:
-            raise HTTPException(status_code=400, detail="Invalid company ID")
+def build_tracking_document(company_id: str, company_name: str, websites_data: Dict[str, Any],
+                            verified_news: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Run summary with statistics, timeline and graph data for a finished analysis"""
+    # Calculate comprehensive statistics
+    total_news = len(verified_news)
+    real_count = sum(1 for n in verified_news if n.get('verification', {}).get('verdict') == 'REAL')
+    fake_count = sum(1 for n in verified_news if n.get('verification', {}).get('verdict') == 'FAKE')
+    uncertain_count = sum(1 for n in verified_news if n.get('verification', {}).get('verdict') == 'UNCERTAIN')
+
+    avg_confidence = sum(n.get('verification', {}).get('confidence', 0) for n in verified_news) / total_news if total_news > 0 else 0
+
+    # Category breakdown
+    category_stats = {}
+    sentiment_stats = {"positive": 0, "negative": 0, "neutral": 0}
+    source_stats = {}
+
+    for news in verified_news:
+        # Categories
+        category = news.get('category', 'Unknown')
+        category_stats[category] = category_stats.get(category, 0) + 1
+
+        # Sentiments
+        sentiment = news.get('sentiment', 'neutral')
+        if sentiment in sentiment_stats:
+            sentiment_stats[sentiment] += 1
+
+        # Sources
+        source = news.get('source', 'Unknown')
+        source_stats[source] = source_stats.get(source, 0) + 1
+
+    # Generate timeline data for graphs
+    timeline_data = []
+    for i in range(7):  # Last 7 days
+        date = (datetime.now() - timedelta(days=i)).strftime("%Y-%m-%d")
+        day_news = [n for n in verified_news if n.get('date', '').startswith(date[:7])]  # Rough date matching
+        timeline_data.append({
+            "date": date,
+            "total": len(day_news),
+            "real": len([n for n in day_news if n.get('verification', {}).get('verdict') == 'REAL']),
+            "fake": len([n for n in day_news if n.get('verification', {}).get('verdict') == 'FAKE']),
+            "uncertain": len([n for n in day_news if n.get('verification', {}).get('verdict') == 'UNCERTAIN'])
+        })
 
-        company = companies_collection.find_one({"_id": obj_id})
-        if not company:
-            raise HTTPException(status_code=404, detail="Company not found")
+    return {
+        "company_id": company_id,
+        "company_name": company_name,
+        "timestamp": datetime.utcnow(),
+        "websites": websites_data,
+        "statistics": {
+            "total_news": total_news,
+            "real_count": real_count,
+            "fake_count": fake_count,
+            "uncertain_count": uncertain_count,
+            "avg_confidence": round(avg_confidence, 3),
+            "category_breakdown": category_stats,
+            "sentiment_breakdown": sentiment_stats,
+            "source_breakdown": dict(list(source_stats.items())[:10]),  # Top 10 sources
+            "reliability_score": round((real_count / total_news) * avg_confidence * 100, 1) if total_news > 0 else 0
+        },
+        "timeline_data": timeline_data,
+        "graph_data": {
+            "verdict_distribution": [
+                {"name": "Real", "value": real_count, "color": "#10B981"},
+                {"name": "Fake", "value": fake_count, "color": "#EF4444"},
+                {"name": "Uncertain", "value": uncertain_count, "color": "#F59E0B"}
+            ],
+            "category_distribution": [{"name": k, "value": v} for k, v in category_stats.items()],
+            "sentiment_distribution": [
+                {"name": "Positive", "value": sentiment_stats["positive"], "color": "#10B981"},
+                {"name": "Negative", "value": sentiment_stats["negative"], "color": "#EF4444"},
+                {"name": "Neutral", "value": sentiment_stats["neutral"], "color": "#6B7280"}
+            ]
+        }
+    }
 
-        company_name = company.get('name', '')
-        print(f"Analyzing company: {company_name}")
+async def analysis_events(company_id: str, company: Dict[str, Any], incremental: bool = True):
+    """Run a company analysis, yielding progress events as discovery and verification advance.
 
-        # Step 1: Find comprehensive web presence
-        websites_data = await find_company_websites(company_name)
+    Events: `started`, one `headlines` per finished news search, `discovered` with the final
+    item list, one `verification` per verified item (with running counts) and a closing
+    `complete` carrying the same body `analyze_company` returns.
+    """
+    company_name = company.get('name', '')
+    print(f"Analyzing company: {company_name}")
+    yield {"event": "started", "company_id": company_id, "company_name": company_name, "incremental": incremental}
 
-        # Step 2: Find 30 news items with detailed sources
-        news_items = await find_company_news(company_name)
+    # Incremental mode reuses the web presence and verdicts of recent runs
+    recent_runs = load_recent_runs(company_id) if incremental else []
+    previous_websites = recent_runs[0].get('websites') if recent_runs else None
 
-        if len(news_items) == 0:
-            return {
-                "success": False,
-                "message": "No news found for this company",
-                "stats": {}
-            }
+    # Steps 1 & 2: Find web presence and 30 news items in one concurrent discovery fan-out
+    if previous_websites and previous_websites.get('official_website'):
+        websites_task = None
+        websites_data = previous_websites
+    else:
+        websites_task = asyncio.create_task(find_company_websites(company_name))
 
-        # Step 3: Verify each news item (process in batches for efficiency)
-        verified_news = []
-        batch_size = 10
-
-        for i in range(0, len(news_items), batch_size):
-            batch = news_items[i:i+batch_size]
-            print(f"Verifying news batch {i//batch_size + 1}/{(len(news_items)//batch_size) + 1}")
-
-            for news in batch:
-                verification = await verify_news_item(news, company_name)
-                verified_news.append(verification)
-
-        # Calculate comprehensive statistics
-        total_news = len(verified_news)
-        real_count = sum(1 for n in verified_news if n.get('verification', {}).get('verdict') == 'REAL')
-        fake_count = sum(1 for n in verified_news if n.get('verification', {}).get('verdict') == 'FAKE')
-        uncertain_count = sum(1 for n in verified_news if n.get('verification', {}).get('verdict') == 'UNCERTAIN')
-
-        avg_confidence = sum(n.get('verification', {}).get('confidence', 0) for n in verified_news) / total_news if total_news > 0 else 0
-
-        # Category breakdown
-        category_stats = {}
-        sentiment_stats = {"positive": 0, "negative": 0, "neutral": 0}
-        source_stats = {}
-
-        for news in verified_news:
-            # Categories
-            category = news.get('category', 'Unknown')
-            category_stats[category] = category_stats.get(category, 0) + 1
-
-            # Sentiments
-            sentiment = news.get('sentiment', 'neutral')
-            if sentiment in sentiment_stats:
-                sentiment_stats[sentiment] += 1
-
-            # Sources
-            source = news.get('source', 'Unknown')
-            source_stats[source] = source_stats.get(source, 0) + 1
-
-        # Generate timeline data for graphs
-        timeline_data = []
-        for i in range(7):  # Last 7 days
-            date = (datetime.now() - timedelta(days=i)).strftime("%Y-%m-%d")
-            day_news = [n for n in verified_news if n.get('date', '').startswith(date[:7])]  # Rough date matching
-            timeline_data.append({
-                "date": date,
-                "total": len(day_news),
-                "real": len([n for n in day_news if n.get('verification', {}).get('verdict') == 'REAL']),
-                "fake": len([n for n in day_news if n.get('verification', {}).get('verdict') == 'FAKE']),
-                "uncertain": len([n for n in day_news if n.get('verification', {}).get('verdict') == 'UNCERTAIN'])
-            })
-
-        # Store comprehensive results
-        tracking_document = {
-            "company_id": company_id,
-            "company_name": company_name,
-            "timestamp": datetime.utcnow(),
-            "websites": websites_data,
-            "verified_news": verified_news,
-            "statistics": {
-                "total_news": total_news,
-                "real_count": real_count,
-                "fake_count": fake_count,
-                "uncertain_count": uncertain_count,
-                "avg_confidence": round(avg_confidence, 3),
-                "category_breakdown": category_stats,
-                "sentiment_breakdown": sentiment_stats,
-                "source_breakdown": dict(list(source_stats.items())[:10]),  # Top 10 sources
-                "reliability_score": round((real_count / total_news) * avg_confidence * 100, 1) if total_news > 0 else 0
-            },
-            "timeline_data": timeline_data,
-            "graph_data": {
-                "verdict_distribution": [
-                    {"name": "Real", "value": real_count, "color": "#10B981"},
-                    {"name": "Fake", "value": fake_count, "color": "#EF4444"},
-                    {"name": "Uncertain", "value": uncertain_count, "color": "#F59E0B"}
-                ],
-                "category_distribution": [{"name": k, "value": v} for k, v in category_stats.items()],
-                "sentiment_distribution": [
-                    {"name": "Positive", "value": sentiment_stats["positive"], "color": "#10B981"},
-                    {"name": "Negative", "value": sentiment_stats["negative"], "color": "#EF4444"},
-                    {"name": "Neutral", "value": sentiment_stats["neutral"], "color": "#6B7280"}
-                ]
-            }
+    try:
+        discovered = []
+        try:
+            async for category, batch in iter_company_news(company_name):
+                discovered.extend(batch)
+                yield {"event": "headlines", "category": category, "news": batch, "found": len(discovered)}
+            news_items = select_company_news(discovered, company_name)
+        except Exception as e:
+            print(f"Agent 2 Error: {e}")
+            news_items = placeholder_company_news(company_name)
+
+        if websites_task is not None:
+            websites_data = await websites_task
+    finally:
+        if websites_task is not None:
+            websites_task.cancel()
+
+    if len(news_items) == 0:
+        yield {
+            "event": "complete",
+            "success": False,
+            "message": "No news found for this company",
+            "stats": {}
         }
+        return
+
+    # Step 3: Carry forward fresh verdicts, then verify the new or changed items concurrently
+    fresh = fresh_verifications(recent_runs)
+    verified_news = [None] * len(news_items)
+    pending = []
+
+    for index, news in enumerate(news_items):
+        news['fingerprint'] = news_fingerprint(news)
+        if news['fingerprint'] in fresh:
+            verified_news[index] = {**news, "verification": fresh[news['fingerprint']]}
+        else:
+            pending.append(index)
+
+    reused_count = len(news_items) - len(pending)
+    print(f"Reusing {reused_count} fresh verdicts, verifying {len(pending)} news items (concurrency {VERIFY_CONCURRENCY})")
+
+    yield {
+        "event": "discovered",
+        "websites": websites_data,
+        "news": news_items,
+        "reused_verifications": reused_count,
+        "pending_verifications": len(pending)
+    }
 
-        news_tracking_collection.insert_one(tracking_document)
+    for index, news in enumerate(verified_news):
+        if news is not None:
+            yield {"event": "verification", "index": index, "news": news, "reused": True,
+                   "progress": verdict_counts(verified_news[:index + 1])}
+
+    async for position, verification in iter_verified_news([news_items[i] for i in pending], company_name):
+        verified_news[pending[position]] = verification
+        yield {"event": "verification", "index": pending[position], "news": verification, "reused": False,
+               "progress": verdict_counts(verified_news)}
+
+    tracking_document = build_tracking_document(company_id, company_name, websites_data, verified_news)
+
+    run_id = save_analysis_run(db, tracking_document, verified_news)
+    record_analysis(
+        company_stats_collection, company_id, run_id,
+        tracking_document['timestamp'], verified_news, tracking_document['statistics'],
+        history=lambda: stats_history(db, company_id), load_news=lambda run: load_run_news(db, run)
+    )
+
+    statistics = tracking_document['statistics']
+    print(f"Analysis complete! Real: {statistics['real_count']}, Fake: {statistics['fake_count']}, Uncertain: {statistics['uncertain_count']}")
+    print(f"Reliability Score: {statistics['reliability_score']}%")
+
+    yield {
+        "event": "complete",
+        "success": True,
+        "message": "Comprehensive analysis completed successfully",
+        "tracking_id": str(run_id),
+        "stats": statistics,
+        "verified_news": verified_news,
+        "websites": websites_data,
+        "timeline_data": tracking_document['timeline_data'],
+        "graph_data": tracking_document['graph_data'],
+        "incremental": {
+            "reused_verifications": reused_count,
+            "new_verifications": len(pending)
+        }
+    }
 
-        print(f"Analysis complete! Real: {real_count}, Fake: {fake_count}, Uncertain: {uncertain_count}")
-        print(f"Reliability Score: {tracking_document['statistics']['reliability_score']}%")
+async def analyze_company(company_id: str, incremental: bool = True) -> Dict[str, Any]:
+    """Enhanced orchestrator with detailed analytics and graph data"""
+    try:
+        print(f"Starting comprehensive analysis for company ID: {company_id}")
 
-        return {
-            "success": True,
-            "message": "Comprehensive analysis completed successfully",
-            "stats": tracking_document['statistics'],
-            "verified_news": verified_news,
-            "websites": websites_data,
-            "timeline_data": timeline_data,
-            "graph_data": tracking_document['graph_data']
-        }
+        # Get company from database
+        company_id, company = load_company(company_id)
+
+        result = {}
+        async for event in analysis_events(company_id, company, incremental):
+            result = event
+        return {k: v for k, v in result.items() if k != "event"}
 
     except Exception as e:
         print(f"Analysis Error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# ==================== BACKGROUND JOBS ====================
+
+async def run_analysis_job(job: Dict[str, Any], report) -> Dict[str, Any]:
+    """Job handler: run the analysis, reporting progress, and keep a compact result on the job.
+
+    Progress and result carry `gemini_calls`, the model calls the run has made so far,
+    which the monitoring scheduler charges against its budget.
+    """
+    company_id, company = load_company(job['company_id'])
+    result, total = {}, 0
+    with gemini.track() as usage:
+        try:
+            async for event in analysis_events(company_id, company, job['params'].get('incremental', True)):
+                if event['event'] == 'started':
+                    report({"stage": "discovering", "gemini_calls": usage.calls})
+                elif event['event'] == 'discovered':
+                    total = len(event['news'])
+                    report({"stage": "verifying", "verified": 0, "total": total, "gemini_calls": usage.calls})
+                elif event['event'] == 'verification':
+                    report({"stage": "verifying", **event['progress'], "total": total, "gemini_calls": usage.calls})
+                result = event
+        except Exception:
+            report({"stage": "failed", "gemini_calls": usage.calls})
+            raise
+    result = {k: result.get(k) for k in ("success", "message", "tracking_id", "stats", "incremental") if k in result}
+    return {**result, "gemini_calls": usage.calls}
+
+job_queue = JobQueue(analysis_jobs_collection, run_analysis_job)
+monitor = MonitorScheduler(db, job_queue)
+
+@app.on_event("startup")
+async def start_job_workers():
+    job_queue.start()
+    if MONITOR_ENABLED:
+        monitor.start()
+
+@app.on_event("shutdown")
+async def stop_job_workers():
+    await monitor.stop()
+    await job_queue.stop()
+
+def analysis_response(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Full fetch-news body for a finished job, rebuilt from its stored run"""
+    if not result.get('tracking_id'):
+        return result
+    run = news_tracking_collection.find_one({"_id": ObjectId(result['tracking_id'])})
+    return {
+        **result,
+        "verified_news": load_run_news(db, run),
+        "websites": run.get('websites', {}),
+        "timeline_data": run.get('timeline_data', []),
+        "graph_data": run.get('graph_data', {})
+    }
+
 # ==================== ENHANCED API ROUTES ====================
 
 class FetchNewsRequest(BaseModel):
     companyId: str
+    incremental: bool = True
 
 @app.post("/api/company/fetch-news")
 async def fetch_news_endpoint(request: FetchNewsRequest):
     """Enhanced endpoint that returns comprehensive analysis with 30 news items"""
-    result = await analyze_company(request.companyId)
-    return result
+    # Runs through the job queue so repeated clicks share one analysis per company
+    company_id, _ = load_company(request.companyId)
+    submitted = job_queue.submit(company_id, {"incremental": request.incremental})
+    job = await job_queue.wait(submitted['_id'], timeout=FETCH_NEWS_WAIT_SECONDS)
+    if job is None or job['status'] not in FINISHED:
+        # Still running: hand back the job for the client to poll at /api/company/jobs/{job_id}
+        return JSONResponse(status_code=202, content=job_status(job or submitted))
+    if job['status'] == 'failed':
+        raise HTTPException(status_code=500, detail=job.get('error'))
+    return analysis_response(job['result'])
+
+@app.post("/api/company/jobs", status_code=202)
+async def submit_analysis_job(request: FetchNewsRequest):
+    """Queue a background analysis; returns the company's running job if one is already active"""
+    company_id, _ = load_company(request.companyId)
+    return job_status(job_queue.submit(company_id, {"incremental": request.incremental}))
+
+@app.get("/api/company/jobs/stats")
+async def analysis_job_stats():
+    return job_queue.stats()
+
+@app.get("/api/company/verification/stats")
+async def verification_stats():
+    """Verdict reuse, structured-output parse outcomes and Gemini call counters"""
+    return {
+        "claim_index": claim_index.stats(),
+        "structured_output": structured.stats(),
+        "gemini": gemini.stats()
+    }
+
+@app.get("/api/company/monitor/stats")
+async def monitor_stats():
+    """Scheduled monitoring: companies scheduled, runs dispatched and remaining call budget"""
+    return monitor.stats()
+
+@app.get("/api/company/jobs/{job_id}")
+async def get_analysis_job(job_id: str):
+    """Status, progress and (once finished) result summary of an analysis job"""
+    job = job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_status(job)
+
+async def analysis_stream(company_id: str, company: Dict[str, Any], incremental: bool):
+    try:
+        async for event in analysis_events(company_id, company, incremental):
+            yield sse_event(event)
+    except Exception as e:
+        print(f"Analysis Error: {e}")
+        yield sse_event({"event": "error", "detail": str(e)})
+
+@app.get("/api/company/fetch-news/stream/{company_id}")
+async def fetch_news_stream(company_id: str, incremental: bool = True):
+    """Streaming variant of fetch-news: headlines, each verification and running stats as Server-Sent Events"""
+    company_id, company = load_company(company_id)
+    return StreamingResponse(
+        analysis_stream(company_id, company, incremental),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/api/company/fetch-news/stream")
+async def fetch_news_stream_post(request: FetchNewsRequest):
+    """POST form of the streaming endpoint, taking the same body as fetch-news"""
+    return await fetch_news_stream(request.companyId, request.incremental)
 
 @app.get("/api/company/dashboard/{company_id}")
 async def get_dashboard_data(company_id: str):
@@ -450,18 +814,18 @@ async def get_dashboard_data(company_id: str):
     try:
         # Get company
         try:
-            obj_id = ObjectId(company_id)
-        except Exception:
+            company_id = canonical_company_id(company_id)
+        except ValueError:
             raise HTTPException(status_code=400, detail="Invalid company ID")
 
-        company = companies_collection.find_one({"_id": obj_id})
+        company = companies_collection.find_one({"_id": company_object_id(company_id)})
         if not company:
             raise HTTPException(status_code=404, detail="Company not found")
 
-        # Get tracking history
+        # Get tracking history (only the statistics are needed for the timeline)
         tracking_history = list(
             news_tracking_collection
-            .find({"company_id": company_id})
+            .find(tracking_filter(company_id), {"timestamp": 1, "statistics": 1})
             .sort("timestamp", -1)
             .limit(30)  # Get more history for trends
         )
@@ -473,27 +837,11 @@ async def get_dashboard_data(company_id: str):
                 "message": "No data yet. Click 'Fetch Latest News' to start tracking."
             }
 
-        latest = tracking_history[0]
+        latest = news_tracking_collection.find_one({"_id": tracking_history[0]['_id']})
+        latest_news = load_run_news(db, latest)
 
         # Build comprehensive timeline from multiple fetches
-        timeline = []
-        for entry in tracking_history:
-            timeline.append({
-                "timestamp": entry['timestamp'].isoformat(),
-                "date": entry['timestamp'].strftime("%Y-%m-%d"),
-                "total_news": entry['statistics']['total_news'],
-                "real": entry['statistics']['real_count'],
-                "fake": entry['statistics']['fake_count'],
-                "uncertain": entry['statistics']['uncertain_count'],
-                "reliability_score": entry['statistics'].get('reliability_score', 0)
-            })
-
-        # Calculate trends
-        trend_data = {
-            "reliability_trend": "improving" if len(timeline) > 1 and timeline[0]['reliability_score'] > timeline[1]['reliability_score'] else "stable",
-            "news_volume_trend": "increasing" if len(timeline) > 1 and timeline[0]['total_news'] > timeline[1]['total_news'] else "stable",
-            "fake_news_trend": "decreasing" if len(timeline) > 1 and timeline[0]['fake'] < timeline[1]['fake'] else "stable"
-        }
+        timeline = tracking_timeline(tracking_history)
 
         return {
             "company_name": company.get('name', ''),
@@ -501,13 +849,13 @@ async def get_dashboard_data(company_id: str):
             "has_data": True,
             "latest_fetch": latest['timestamp'].isoformat(),
             "statistics": latest['statistics'],
-            "verified_news": latest.get('verified_news', [])[:20],  # Show top 20 in summary
-            "all_verified_news": latest.get('verified_news', []),  # All news for detailed view
+            "verified_news": latest_news[:20],  # Show top 20 in summary
+            "all_verified_news": latest_news,  # All news for detailed view
             "websites": latest.get('websites', {}),
             "timeline": timeline,
             "timeline_data": latest.get('timeline_data', []),
             "graph_data": latest.get('graph_data', {}),
-            "trend_data": trend_data,
+            "trend_data": trend_data(timeline),
             "total_fetches": len(tracking_history),
             "data_freshness": (datetime.utcnow() - latest['timestamp']).total_seconds() / 3600,  # Hours since last fetch
             "summary": {
@@ -523,42 +871,65 @@ async def get_dashboard_data(company_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/company/list")
-async def list_companies():
-    """Enhanced companies list with analytics summary"""
+async def list_companies(limit: int = 20, cursor: Optional[str] = None, include_ids: bool = False):
+    """Enhanced companies list with analytics summary, paged by company id.
+
+    `include_ids=true` adds the full `collections` list and `companies_with_data` ids,
+    which scan the whole history; the default response only uses estimated counts.
+    """
     try:
-        companies_list = list(companies_collection.find({}, {"_id": 1, "name": 1, "email": 1}).limit(20))
+        cursor_id = company_object_id(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    try:
+        limit = max(1, min(limit, 100))
+        match = {"_id": {"$gt": cursor_id}} if cursor_id else {}
+
+        # One round-trip: page of companies joined to their pre-aggregated stats rollup
+        companies_list = list(companies_collection.aggregate([
+            {"$match": match},
+            {"$sort": {"_id": 1}},
+            {"$limit": limit + 1},
+            {"$project": {"_id": 1, "name": 1, "email": 1, "company_id": {"$toString": "$_id"}}},
+            {"$lookup": {
+                "from": "company_stats",
+                "localField": "company_id",
+                "foreignField": "_id",
+                "as": "stats"
+            }},
+            {"$project": {"_id": 0, "company_id": 1, "name": 1, "email": 1, "latest": {"$arrayElemAt": ["$stats.latest", 0]}}}
+        ]))
+
+        has_more = len(companies_list) > limit
+        companies_list = companies_list[:limit]
 
         for company in companies_list:
-            if isinstance(company.get('_id'), ObjectId):
-                company['_id'] = str(company['_id'])
-
-                # Add latest analytics if available
-                latest_tracking = news_tracking_collection.find_one(
-                    {"company_id": company['_id']},
-                    sort=[("timestamp", -1)]
-                )
-
-                if latest_tracking:
-                    company['latest_analysis'] = {
-                        "date": latest_tracking['timestamp'].isoformat(),
-                        "reliability_score": latest_tracking['statistics'].get('reliability_score', 0),
-                        "total_news": latest_tracking['statistics']['total_news']
-                    }
-                else:
-                    company['latest_analysis'] = None
-
-        return {
-            "total_companies": companies_collection.count_documents({}),
+            company['_id'] = company.pop('company_id')
+            latest = company.pop('latest', None)
+            company['latest_analysis'] = {
+                "date": latest['timestamp'].isoformat(),
+                "reliability_score": latest.get('reliability_score', 0),
+                "total_news": latest.get('total_news', 0)
+            } if latest else None
+
+        response = {
+            "total_companies": companies_collection.estimated_document_count(),
             "companies": companies_list,
-            "collections": db.list_collection_names(),
+            "next_cursor": companies_list[-1]['_id'] if has_more else None,
+            "has_more": has_more,
             "analytics_summary": {
-                "companies_with_data": news_tracking_collection.distinct("company_id"),
-                "total_news_tracked": news_tracking_collection.count_documents({}),
+                # Every analyzed company has a stats rollup
+                "companies_with_data_count": company_stats_collection.estimated_document_count(),
+                "total_news_tracked": news_tracking_collection.estimated_document_count(),
                 "last_update": datetime.utcnow().isoformat()
             }
         }
+        if include_ids:
+            response["collections"] = db.list_collection_names()
+            response["analytics_summary"]["companies_with_data"] = news_tracking_collection.distinct("company_id")
+        return response
     except Exception as e:
-        return {"error": str(e), "collections": db.list_collection_names()}
+        return {"error": str(e)}
 
 @app.get("/")
 async def root():
@@ -0,0 +1,188 @@
+import os
+import asyncio
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Callable, Awaitable, AsyncIterator, Tuple
+from claim_index import ClaimIndex
+from verdict_cache import normalize_claim
+
+CRISIS_MONITOR_TOPICS = os.getenv("CRISIS_MONITOR_TOPICS", "")  # comma-separated topics watched from startup
+CRISIS_MONITOR_INTERVAL_SECONDS = float(os.getenv("CRISIS_MONITOR_INTERVAL_SECONDS", "300"))
+CRISIS_MONITOR_MIN_INTERVAL_SECONDS = float(os.getenv("CRISIS_MONITOR_MIN_INTERVAL_SECONDS", "60"))
+CRISIS_MONITOR_MAX_TOPICS = int(os.getenv("CRISIS_MONITOR_MAX_TOPICS", "50"))
+# A claim seen this long ago counts as new again if it resurfaces
+CRISIS_MONITOR_SEEN_SECONDS = int(os.getenv("CRISIS_MONITOR_SEEN_SECONDS", str(7 * 86400)))
+CRISIS_MONITOR_QUEUE_SIZE = 100
+
+
+class WatchedTopic:
+    """A topic on the watchlist and the fingerprints of every claim already reported for it"""
+
+    def __init__(self, topic: str, interval_seconds: float, max_claims: int):
+        self.topic = topic
+        self.interval_seconds = interval_seconds
+        self.max_claims = max_claims
+        # MinHash fingerprints, so reworded copies of a known claim are not re-checked;
+        # a negated or reversed claim has a different polarity and still counts as new
+        self.seen = ClaimIndex(max_age_seconds=CRISIS_MONITOR_SEEN_SECONDS, max_entries=10000)
+        self.next_scan_at = 0.0
+        self.last_scan_at: Optional[str] = None
+        self.scans = 0
+        self.claims_discovered = 0
+        self.claims_checked = 0
+        self.scanning = False
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "topic": self.topic,
+            "interval_seconds": self.interval_seconds,
+            "max_claims": self.max_claims,
+            "last_scan_at": self.last_scan_at,
+            "scans": self.scans,
+            "claims_discovered": self.claims_discovered,
+            "claims_checked": self.claims_checked,
+            "known_claims": len(self.seen)
+        }
+
+
+class CrisisMonitor:
+    """Re-scans watched topics on an interval and pushes alerts for newly emerging claims.
+
+    A rescan costs one discovery call; only claims that do not match a fingerprint
+    already seen for the topic are fact-checked and broadcast to subscribers.
+    """
+
+    def __init__(self, discover: Callable[[str, int], Awaitable[List[str]]],
+                 check: Callable[[str, List[str]], AsyncIterator[Tuple[int, Dict[str, Any]]]]):
+        self.discover = discover
+        self.check = check
+        self.topics: Dict[str, WatchedTopic] = {}
+        self._subscribers: Dict[asyncio.Queue, Optional[set]] = {}
+        self._task = None
+        self._wakeup = asyncio.Event()
+        self._scans = set()
+
+    # ==================== WATCHLIST ====================
+
+    def watch(self, topic: str, interval_seconds: float = CRISIS_MONITOR_INTERVAL_SECONDS,
+              max_claims: int = 3) -> Dict[str, Any]:
+        key = normalize_claim(topic)
+        if not key:
+            raise ValueError("Topic must not be empty")
+        interval_seconds = max(CRISIS_MONITOR_MIN_INTERVAL_SECONDS, interval_seconds)
+
+        watched = self.topics.get(key)
+        if watched is None:
+            if len(self.topics) >= CRISIS_MONITOR_MAX_TOPICS:
+                raise ValueError(f"Watchlist is full ({CRISIS_MONITOR_MAX_TOPICS} topics)")
+            watched = self.topics[key] = WatchedTopic(topic.strip(), interval_seconds, max_claims)
+            self._wakeup.set()
+        else:
+            watched.interval_seconds = interval_seconds
+            watched.max_claims = max_claims
+        return watched.info()
+
+    def unwatch(self, topic: str) -> bool:
+        return self.topics.pop(normalize_claim(topic), None) is not None
+
+    # ==================== SUBSCRIBERS ====================
+
+    def subscribe(self, topics: Optional[List[str]] = None) -> asyncio.Queue:
+        """Queue receiving alert events, for the given topics or for every watched topic"""
+        queue = asyncio.Queue(maxsize=CRISIS_MONITOR_QUEUE_SIZE)
+        self._subscribers[queue] = {normalize_claim(t) for t in topics} if topics else None
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.pop(queue, None)
+
+    def publish(self, key: str, event: Dict[str, Any]):
+        for queue, topics in list(self._subscribers.items()):
+            if topics is not None and key not in topics:
+                continue
+            if queue.full():
+                # A slow subscriber loses its oldest alert rather than stalling the monitor
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    # ==================== SCANNING ====================
+
+    async def scan(self, key: str, watched: WatchedTopic) -> int:
+        """Discover the topic's current claims and check only the new ones; returns how many were new"""
+        try:
+            claims = await self.discover(watched.topic, watched.max_claims)
+        except Exception as e:
+            print(f"Crisis monitor scan error for '{watched.topic}': {e}")
+            return 0
+
+        watched.scans += 1
+        watched.last_scan_at = datetime.utcnow().isoformat()
+        watched.claims_discovered += len(claims)
+
+        # A claim only becomes seen once its check succeeds, so one whose check fails or
+        # is cut short is picked up again by the next scan
+        new_claims = []
+        this_scan = ClaimIndex(max_entries=len(claims) + 1)
+        for claim in claims:
+            if watched.seen.lookup(claim) is None and this_scan.lookup(claim) is None:
+                this_scan.add(claim, None)
+                new_claims.append(claim)
+
+        if new_claims:
+            print(f"🚨 {len(new_claims)} new claims about '{watched.topic}'")
+
+        try:
+            async for index, alert in self.check(watched.topic, new_claims):
+                alert["timestamp"] = datetime.utcnow().isoformat()
+                watched.seen.add(new_claims[index], alert["id"])
+                watched.claims_checked += 1
+                self.publish(key, {"type": "crisis_alert", "topic": watched.topic, "alert": alert})
+        except Exception as e:
+            print(f"Crisis monitor check error: {e}")
+        return len(new_claims)
+
+    async def _scan(self, key: str, watched: WatchedTopic):
+        watched.scanning = True
+        try:
+            await self.scan(key, watched)
+        finally:
+            watched.scanning = False
+
+    def start(self):
+        for topic in CRISIS_MONITOR_TOPICS.split(","):
+            if topic.strip():
+                self.watch(topic)
+        self._task = asyncio.create_task(self.run())
+        print(f"👀 Crisis monitor started ({len(self.topics)} watched topics)")
+
+    async def stop(self):
+        tasks = [t for t in [self._task, *self._scans] if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            for key, watched in list(self.topics.items()):
+                if watched.scanning or watched.next_scan_at > now:
+                    continue
+                watched.next_scan_at = now + watched.interval_seconds
+                task = asyncio.create_task(self._scan(key, watched))
+                self._scans.add(task)
+                task.add_done_callback(self._scans.discard)
+
+            next_due = min((w.next_scan_at for w in self.topics.values()), default=now + CRISIS_MONITOR_INTERVAL_SECONDS)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), max(1.0, next_due - loop.time()))
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "subscribers": len(self._subscribers),
+            "topics": [watched.info() for watched in self.topics.values()]
+        }
@@ -6,9 +6,14 @@ from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from google import genai
-from pymongo import MongoClient
 from bson import ObjectId
 from dotenv import load_dotenv
+from gemini_client import GeminiClient
+from stats_store import get_company_stats, rebuild_company_stats, sources_breakdown_dict
+from repository import (
+    get_database, ensure_indexes, canonical_company_id, company_object_id, tracking_filter, load_run_news,
+    stats_history
+)
 
 # Load environment variables
 load_dotenv()
@@ -22,12 +27,13 @@ if not MONGODB_URI:
 
 # Initialize Google GenAI
 ai = genai.Client(api_key=API_KEY)
+gemini = GeminiClient(ai)
 
 # Initialize MongoDB
-mongo_client = MongoClient(MONGODB_URI)
-db = mongo_client['test']
+db = get_database(MONGODB_URI)
 companies_collection = db['companies']
 news_tracking_collection = db['news_tracking']
+company_stats_collection = db['company_stats']
 
 print(f"✅ Connected to MongoDB")
 print(f"📊 Database: {db.name}")
@@ -43,6 +49,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def create_indexes():
+    ensure_indexes(db)
+
 # ==================== DATA QUERY AGENT ====================
 
 class QueryRequest(BaseModel):
@@ -87,7 +97,7 @@ async def transcribe_audio(base64_audio: str, mime_type: str = "audio/webm") ->
         if not clean_mime:
             clean_mime = 'audio/webm'
         
-        response = ai.models.generate_content(
+        response = await gemini.generate_content(
             model="gemini-2.5-flash",
             contents={
                 "parts": [
@@ -106,7 +116,7 @@ async def transcribe_audio(base64_audio: str, mime_type: str = "audio/webm") ->
 async def query_routing_agent(user_query: str, company_name: str) -> Dict[str, Any]:
     """AI agent to understand and route data queries"""
     try:
-        response = ai.models.generate_content(
+        response = await gemini.generate_content(
             model="gemini-2.5-flash",
             contents=f"User asks about {company_name}: '{user_query}'. Determine what data they want to query.",
             config={
@@ -125,7 +135,7 @@ async def query_routing_agent(user_query: str, company_name: str) -> Dict[str, A
 async def fetch_company_data(company_id: str) -> Dict[str, Any]:
     """Fetch company information from database"""
     try:
-        company = companies_collection.find_one({"_id": ObjectId(company_id)})
+        company = companies_collection.find_one({"_id": company_object_id(company_id)})
         if not company:
             return None
         
@@ -136,42 +146,76 @@ async def fetch_company_data(company_id: str) -> Dict[str, Any]:
         print(f"Error fetching company: {e}")
         return None
 
-async def fetch_news_tracking(company_id: str, filters: Dict = None) -> List[Dict[str, Any]]:
-    """Fetch news tracking data with filters"""
+def require_company(company_id: str) -> str:
+    """Canonical id of an existing company, or the HTTP error the routes should return"""
     try:
-        # First try to find by company_id as ObjectId
-        query = {"company_id": ObjectId(company_id)}
-        tracking_records = list(news_tracking_collection.find(query).sort('timestamp', -1))
-        
-        # If no results, try finding by company_id as string
-        if not tracking_records:
-            query = {"company_id": company_id}
-            tracking_records = list(news_tracking_collection.find(query).sort('timestamp', -1))
+        company_id = canonical_company_id(company_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid company ID")
+
+    if not companies_collection.find_one({"_id": company_object_id(company_id)}, {"_id": 1}):
+        raise HTTPException(status_code=404, detail="Company not found")
+    return company_id
+
+# Tracking record fields returned to callers; verified_news is added only when requested
+TRACKING_SUMMARY_FIELDS = {"company_id": 1, "company_name": 1, "timestamp": 1, "statistics": 1}
+TRACKING_MAX_PAGE_SIZE = 100
+
+
+def tracking_page_size(limit: int) -> int:
+    return max(1, min(limit, TRACKING_MAX_PAGE_SIZE))
+
+def tracking_match(company_id: str, filters: Dict = None) -> Dict[str, Any]:
+    """MongoDB match stage for a company's tracking records with verdict/date filters"""
+    match = tracking_filter(company_id)
+
+    filters = filters or {}
+    if filters.get('days_back'):
+        match["timestamp"] = {"$gte": datetime.utcnow() - timedelta(days=filters['days_back'])}
+    if filters.get('verdict'):
+        # Split-layout runs are matched through their per-verdict counts
+        count_field = {"REAL": "real_count", "FAKE": "fake_count", "UNCERTAIN": "uncertain_count"}.get(filters['verdict'])
+        match["$or"] = [{"verified_news": {"$elemMatch": {"verification.verdict": filters['verdict']}}}]
+        if count_field:
+            match["$or"].append({f"statistics.{count_field}": {"$gt": 0}})
+    return match
+
+async def fetch_news_tracking(company_id: str, filters: Dict = None, limit: int = 1, page: int = 0,
+                              include_news: bool = True, lookahead: int = 0) -> List[Dict[str, Any]]:
+    """Fetch one page of news tracking records (newest first) with filtering done in MongoDB.
+
+    `lookahead` extra records past the page are returned as summaries, to tell whether another page exists.
+    """
+    try:
+        filters = filters or {}
+        limit = tracking_page_size(filters.get('limit') or limit)
+
+        projection = dict(TRACKING_SUMMARY_FIELDS)
+        if include_news:
+            if filters.get('verdict'):
+                projection["verified_news"] = {"$filter": {
+                    "input": "$verified_news",
+                    "as": "news",
+                    "cond": {"$eq": ["$$news.verification.verdict", filters['verdict']]}
+                }}
+            else:
+                projection["verified_news"] = 1
+
+        tracking_records = list(news_tracking_collection.aggregate([
+            {"$match": tracking_match(company_id, filters)},
+            {"$sort": {"timestamp": -1}},
+            {"$skip": page * limit},
+            {"$limit": limit + lookahead},
+            {"$project": projection}
+        ]))
         
         print(f"🔍 Found {len(tracking_records)} tracking records for company {company_id}")
         
-        # Apply filters if provided
-        if filters and tracking_records:
-            if 'verdict' in filters:
-                filtered_records = []
-                for record in tracking_records:
-                    filtered_news = [n for n in record.get('verified_news', []) 
-                                   if n.get('verification', {}).get('verdict') == filters['verdict']]
-                    if filtered_news:
-                        record['verified_news'] = filtered_news
-                        filtered_records.append(record)
-                tracking_records = filtered_records
-            
-            if 'days_back' in filters:
-                from_date = datetime.utcnow() - timedelta(days=filters['days_back'])
-                tracking_records = [r for r in tracking_records 
-                                  if r.get('timestamp', datetime.min) >= from_date]
-        
-        # Convert ObjectIds to strings
-        for record in tracking_records:
+        # Load items of split-layout runs, then convert ObjectIds to strings
+        for position, record in enumerate(tracking_records):
+            if include_news and position < limit:
+                record['verified_news'] = load_run_news(db, record, filters.get('verdict'))
             record['_id'] = str(record['_id'])
-            if isinstance(record.get('company_id'), ObjectId):
-                record['company_id'] = str(record['company_id'])
         
         return tracking_records
     except Exception as e:
@@ -180,6 +224,35 @@ async def fetch_news_tracking(company_id: str, filters: Dict = None) -> List[Dic
         traceback.print_exc()
         return []
 
+async def fetch_company_stats(company_id: str) -> Dict[str, Any]:
+    """Pre-aggregated statistics for a company, backfilled from its history on first use"""
+    try:
+        company_id = canonical_company_id(company_id)
+        stats = get_company_stats(company_stats_collection, company_id)
+        if stats is None:
+            print(f"📊 No rollup for company {company_id}, rebuilding from history")
+            # Insert-only, so a rollup the company service created meanwhile is kept
+            stats = rebuild_company_stats(
+                company_stats_collection, company_id, stats_history(db, company_id),
+                load_news=lambda run: load_run_news(db, run), replace=False
+            )
+        return stats
+    except Exception as e:
+        print(f"Error fetching company stats: {e}")
+        return None
+
+async def fetch_news_sample(tracking_id, limit: int = 10) -> List[Dict[str, Any]]:
+    """First `limit` verified news items of one tracking record"""
+    try:
+        record = news_tracking_collection.find_one(
+            {"_id": ObjectId(tracking_id)},
+            {"verified_news": {"$slice": limit}}
+        )
+        return load_run_news(db, record, limit=limit) if record else []
+    except Exception as e:
+        print(f"Error fetching news sample: {e}")
+        return []
+
 async def analyze_data_with_ai(user_query: str, data: Dict[str, Any], company_name: str) -> str:
     """Use AI to analyze and respond to user queries about data"""
     try:
@@ -205,7 +278,7 @@ async def analyze_data_with_ai(user_query: str, data: Dict[str, Any], company_na
         
         data_context = json.dumps(data_summary, indent=2, default=str)[:4000]
         
-        response = ai.models.generate_content(
+        response = await gemini.generate_content(
             model="gemini-2.5-flash",
             contents=f"""You are a data analyst assistant for {company_name}. 
 
@@ -266,46 +339,27 @@ async def process_data_query(company_id: str, user_query: str) -> Dict[str, Any]
             }
         }
         
-        # Always try to fetch news tracking data - don't apply filters initially
-        tracking_records = await fetch_news_tracking(company_id, None)
-        
-        # After fetching, apply any specific filters based on routing
-        if tracking_records and len(tracking_records) > 0:
-            print(f"📊 Found {len(tracking_records)} tracking records")
-            latest_tracking = tracking_records[0]
-            verified_news = latest_tracking.get('verified_news', [])
-            print(f"📰 Total verified news items: {len(verified_news)}")
-            
-            # Calculate statistics
-            real_count = sum(1 for n in verified_news if n.get('verification', {}).get('verdict') == 'REAL')
-            fake_count = sum(1 for n in verified_news if n.get('verification', {}).get('verdict') == 'FAKE')
-            uncertain_count = sum(1 for n in verified_news if n.get('verification', {}).get('verdict') == 'UNCERTAIN')
-            
-            print(f"✅ Real: {real_count}, ❌ Fake: {fake_count}, ⚠️ Uncertain: {uncertain_count}")
-            
-            # Extract sources from all news items
-            sources_list = {}
-            for news in verified_news:
-                source = news.get('source') or news.get('news_source', 'Unknown')
-                verdict = news.get('verification', {}).get('verdict', 'UNCERTAIN')
-                if source not in sources_list:
-                    sources_list[source] = {'real': 0, 'fake': 0, 'uncertain': 0, 'total': 0}
-                sources_list[source][verdict.lower()] = sources_list[source].get(verdict.lower(), 0) + 1
-                sources_list[source]['total'] += 1
-            
+        # Read the pre-aggregated statistics instead of recounting the history
+        stats = await fetch_company_stats(company_id)
+
+        if stats:
+            latest = stats['latest']
+            print(f"📊 Found {stats['total_analyses']} tracking records")
+            print(f"✅ Real: {latest['real_count']}, ❌ Fake: {latest['fake_count']}, ⚠️ Uncertain: {latest['uncertain_count']}")
+
             data_to_analyze['news_data'] = {
-                "total_news": len(verified_news),
-                "verified_news_sample": verified_news[:10],  # Show only 10 sample items to AI
-                "timestamp": latest_tracking.get('timestamp'),
+                "total_news": latest['total_news'],
+                "verified_news_sample": await fetch_news_sample(latest['tracking_id'], 10),  # Show only 10 sample items to AI
+                "timestamp": latest.get('timestamp'),
                 "statistics": {
-                    "real_count": real_count,
-                    "fake_count": fake_count,
-                    "uncertain_count": uncertain_count,
-                    "total_verified": len(verified_news)
+                    "real_count": latest['real_count'],
+                    "fake_count": latest['fake_count'],
+                    "uncertain_count": latest['uncertain_count'],
+                    "total_verified": latest['total_news']
                 },
-                "sources_breakdown": sources_list,
-                "all_fetches_count": len(tracking_records),
-                "note": f"Showing 10 sample news items out of {len(verified_news)} total items"
+                "sources_breakdown": sources_breakdown_dict(latest),
+                "all_fetches_count": stats['total_analyses'],
+                "note": f"Showing 10 sample news items out of {latest['total_news']} total items"
             }
         else:
             print("⚠️ No news tracking data found")
@@ -372,26 +426,23 @@ async def api_company_summary(company_id: str):
         if not company:
             raise HTTPException(status_code=404, detail="Company not found")
         
-        tracking_records = await fetch_news_tracking(company_id)
+        stats = await fetch_company_stats(company_id)
         
         summary = {
             "company_name": company.get('name'),
-            "total_analyses": len(tracking_records),
+            "total_analyses": stats['total_analyses'] if stats else 0,
             "latest_analysis": None
         }
         
-        if tracking_records:
-            latest = tracking_records[0]
+        if stats:
+            latest = stats['latest']
             summary['latest_analysis'] = {
                 "timestamp": latest.get('timestamp'),
-                "total_news": len(latest.get('verified_news', [])),
+                "total_news": latest['total_news'],
                 "statistics": {
-                    "real": sum(1 for n in latest.get('verified_news', []) 
-                               if n.get('verification', {}).get('verdict') == 'REAL'),
-                    "fake": sum(1 for n in latest.get('verified_news', []) 
-                               if n.get('verification', {}).get('verdict') == 'FAKE'),
-                    "uncertain": sum(1 for n in latest.get('verified_news', []) 
-                                    if n.get('verification', {}).get('verdict') == 'UNCERTAIN')
+                    "real": latest['real_count'],
+                    "fake": latest['fake_count'],
+                    "uncertain": latest['uncertain_count']
                 }
             }
         
@@ -401,13 +452,29 @@ async def api_company_summary(company_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/company/{company_id}/tracking")
+async def api_company_tracking(company_id: str, page: int = 0, limit: int = 10, verdict: Optional[str] = None,
+                               days_back: Optional[int] = None, include_news: bool = False):
+    """Paginated tracking history, optionally filtered by verdict and age"""
+    company_id = require_company(company_id)
+    filters = {"verdict": verdict.upper() if verdict else None, "days_back": days_back}
+    limit = tracking_page_size(limit)
+    records = await fetch_news_tracking(company_id, filters, limit=limit, page=max(page, 0),
+                                        include_news=include_news, lookahead=1)
+    return {
+        "page": page,
+        "limit": limit,
+        "records": records[:limit],
+        "has_more": len(records) > limit
+    }
+
 @app.get("/")
 async def root():
     return {
         "status": "online",
         "service": "Company Data Query API",
         "version": "1.0",
-        "endpoints": ["/api/data-query", "/api/transcribe", "/api/company/{id}/summary"]
+        "endpoints": ["/api/data-query", "/api/transcribe", "/api/company/{id}/summary", "/api/company/{id}/tracking"]
     }
 
 if __name__ == "__main__":
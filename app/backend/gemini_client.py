@@ -0,0 +1,155 @@
+import os
+import time
+import asyncio
+import contextlib
+import contextvars
+from typing import Dict, Any, Optional
+
+# Upper bound on Gemini requests in flight per worker
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "32"))
+# Per-minute quotas for the project key (0 disables the limit)
+GEMINI_RPM = int(os.getenv("GEMINI_RPM", "0"))
+GEMINI_TPM = int(os.getenv("GEMINI_TPM", "0"))
+# Output tokens assumed for a call until the real usage is known
+DEFAULT_OUTPUT_TOKENS = 512
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `per_minute` tokens per minute, holding at most `capacity`"""
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.capacity = float(capacity if capacity is not None else per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """Wait until `amount` tokens are available and take them. Returns seconds waited."""
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        # The lock keeps waiters FIFO so large requests are not starved
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def adjust(self, amount: float):
+        """Debit (or refund, if negative) tokens once the real cost is known"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class CallUsage:
+    """Calls and tokens spent inside one `GeminiClient.track()` block, including tasks it starts"""
+
+    def __init__(self):
+        self.calls = 0
+        self.tokens = 0
+
+
+_usage: contextvars.ContextVar = contextvars.ContextVar("gemini_usage", default=None)
+
+
+def estimate_tokens(contents: Any, config: Optional[Dict[str, Any]] = None) -> int:
+    """Rough prompt + output token estimate (~4 characters per token)"""
+    max_output = (config or {}).get("max_output_tokens") or DEFAULT_OUTPUT_TOKENS
+    return len(str(contents)) // 4 + max_output
+
+
+class GeminiClient:
+    """Non-blocking access to Gemini shared by main.py, data.py and company.py.
+
+    Every call goes through the SDK's async surface (`client.aio`), so a slow
+    model call suspends only the coroutine that made it instead of the whole
+    uvicorn event loop. Calls are throttled to the configured RPM/TPM quotas.
+    """
+
+    def __init__(self, client, max_concurrency: int = GEMINI_MAX_CONCURRENCY,
+                 rpm: int = GEMINI_RPM, tpm: int = GEMINI_TPM):
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.request_bucket = TokenBucket(rpm) if rpm > 0 else None
+        self.token_bucket = TokenBucket(tpm) if tpm > 0 else None
+        self.in_flight = 0
+        self.total_calls = 0
+        self.failed_calls = 0
+        self.timed_out_calls = 0
+        self.throttled_seconds = 0.0
+        self.total_tokens = 0
+
+    async def generate_content(self, model: str, contents: Any, config: Optional[Dict[str, Any]] = None,
+                               timeout: Optional[float] = None):
+        """Call the model. `timeout` bounds the request itself, not the wait for quota."""
+        estimated_tokens = estimate_tokens(contents, config)
+        usage = _usage.get()
+
+        if self.request_bucket:
+            self.throttled_seconds += await self.request_bucket.acquire()
+        if self.token_bucket:
+            self.throttled_seconds += await self.token_bucket.acquire(estimated_tokens)
+
+        async with self._semaphore:
+            self.in_flight += 1
+            self.total_calls += 1
+            if usage is not None:
+                usage.calls += 1
+            try:
+                response = await asyncio.wait_for(
+                    self.client.aio.models.generate_content(
+                        model=model,
+                        contents=contents,
+                        config=config
+                    ),
+                    timeout
+                )
+            except asyncio.TimeoutError:
+                self.timed_out_calls += 1
+                raise TimeoutError(f"Gemini call timed out after {timeout}s")
+            except Exception:
+                self.failed_calls += 1
+                raise
+            finally:
+                self.in_flight -= 1
+
+        metadata = getattr(response, "usage_metadata", None)
+        actual_tokens = getattr(metadata, "total_token_count", None) if metadata else None
+        self.total_tokens += actual_tokens or estimated_tokens
+        if usage is not None:
+            usage.tokens += actual_tokens or estimated_tokens
+        if self.token_bucket and actual_tokens:
+            self.token_bucket.adjust(actual_tokens - estimated_tokens)
+
+        return response
+
+    @contextlib.contextmanager
+    def track(self):
+        """Count the calls made by this task, and the tasks it creates, until the block exits"""
+        usage = CallUsage()
+        token = _usage.set(usage)
+        try:
+            yield usage
+        finally:
+            _usage.reset(token)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "total_calls": self.total_calls,
+            "failed_calls": self.failed_calls,
+            "timed_out_calls": self.timed_out_calls,
+            "total_tokens": self.total_tokens,
+            "throttled_seconds": round(self.throttled_seconds, 3)
+        }
@@ -0,0 +1,210 @@
+import os
+import asyncio
+import socket
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, Callable, Awaitable
+from bson import ObjectId
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "2"))
+# A running job whose worker has not reported progress for this long is handed to another worker
+JOB_STALE_SECONDS = float(os.getenv("JOB_STALE_SECONDS", "600"))
+
+# Job documents in the `analysis_jobs` collection:
+# {
+#     "_id": <ObjectId>, "company_id": <str>, "params": {...},
+#     "status": "queued" | "running" | "succeeded" | "failed",
+#     "active": True,                 # present only while queued or running
+#     "progress": {...}, "result": {...}, "error": <str>,
+#     "created_at", "started_at", "heartbeat_at", "finished_at": <datetime>, "worker": <str>
+# }
+# The unique partial index on company_id over active jobs is what deduplicates submissions:
+# a company can have at most one queued-or-running analysis at a time.
+
+FINISHED = ("succeeded", "failed")
+
+
+class JobQueue:
+    """MongoDB-backed analysis queue with an in-process worker pool"""
+
+    def __init__(self, collection, handler: Callable[[Dict[str, Any], Callable], Awaitable[Dict[str, Any]]],
+                 workers: int = JOB_WORKERS):
+        self.collection = collection
+        self.handler = handler
+        self.workers = workers
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks = []
+        self._wakeup = asyncio.Event()
+        # One event per job awaited in this process, shared by all of its waiters
+        self._finished: Dict[str, asyncio.Event] = {}
+        self._waiters: Dict[str, int] = {}
+        self._requeued_at = float("-inf")
+
+    def ensure_indexes(self):
+        self.collection.create_index(
+            [("company_id", ASCENDING)],
+            name="active_company",
+            unique=True,
+            partialFilterExpression={"active": True}
+        )
+        self.collection.create_index([("status", ASCENDING), ("created_at", ASCENDING)], name="status_created_at")
+
+    # ==================== SUBMISSION ====================
+
+    def submit(self, company_id: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Queue an analysis; returns the company's already active job instead when there is one"""
+        job = {
+            "company_id": company_id,
+            "params": params or {},
+            "status": "queued",
+            "active": True,
+            "progress": {},
+            "created_at": datetime.utcnow()
+        }
+        try:
+            job["_id"] = self.collection.insert_one(job).inserted_id
+        except DuplicateKeyError:
+            existing = self.collection.find_one({"company_id": company_id, "active": True})
+            if existing is not None:
+                return {**existing, "deduplicated": True}
+            # The active job finished between the insert and the lookup; queue a fresh one
+            return self.submit(company_id, params)
+
+        self._wakeup.set()
+        return {**job, "deduplicated": False}
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        if not ObjectId.is_valid(job_id):
+            return None
+        return self.collection.find_one({"_id": ObjectId(job_id)})
+
+    async def wait(self, job_id, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Wait until a job finishes (on this or any other worker) and return its document.
+
+        Returns the still unfinished job once `timeout` passes, and None if the job does not exist.
+        """
+        job_id = str(job_id)
+        finished = self._finished.setdefault(job_id, asyncio.Event())
+        self._waiters[job_id] = self._waiters.get(job_id, 0) + 1
+        deadline = None if timeout is None else asyncio.get_running_loop().time() + timeout
+        try:
+            while True:
+                job = self.get(job_id)
+                if job is None or job["status"] in FINISHED:
+                    return job
+                wait_for = JOB_POLL_SECONDS
+                if deadline is not None:
+                    remaining = deadline - asyncio.get_running_loop().time()
+                    if remaining <= 0:
+                        return job
+                    wait_for = min(wait_for, remaining)
+                try:
+                    await asyncio.wait_for(finished.wait(), wait_for)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            # The last waiter out removes the event
+            self._waiters[job_id] -= 1
+            if not self._waiters[job_id]:
+                del self._waiters[job_id]
+                del self._finished[job_id]
+
+    # ==================== WORKERS ====================
+
+    def start(self):
+        self.ensure_indexes()
+        self._tasks = [asyncio.create_task(self._worker(n)) for n in range(self.workers)]
+        print(f"🧵 Started {self.workers} analysis workers")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def requeue_stale(self) -> int:
+        """Return running jobs abandoned by a crashed or restarted worker to the queue"""
+        stale_before = datetime.utcnow() - timedelta(seconds=JOB_STALE_SECONDS)
+        result = self.collection.update_many(
+            {"status": "running", "heartbeat_at": {"$lt": stale_before}},
+            {"$set": {"status": "queued"}, "$unset": {"worker": ""}}
+        )
+        if result.modified_count:
+            print(f"🔄 Requeued {result.modified_count} stale analysis jobs")
+        return result.modified_count
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """Atomically take the oldest queued job, first requeueing stale ones at most once per JOB_STALE_SECONDS"""
+        now = time.monotonic()
+        if now - self._requeued_at >= JOB_STALE_SECONDS:
+            self._requeued_at = now
+            self.requeue_stale()
+        now = datetime.utcnow()
+        return self.collection.find_one_and_update(
+            {"status": "queued"},
+            {"$set": {"status": "running", "started_at": now, "heartbeat_at": now, "worker": self.worker_id}},
+            sort=[("created_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def _worker(self, number: int):
+        while True:
+            job = self.claim()
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), JOB_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self.run(job)
+
+    async def run(self, job: Dict[str, Any]):
+        def report(progress: Dict[str, Any]):
+            self.collection.update_one(
+                {"_id": job["_id"], "status": "running"},
+                {"$set": {"progress": progress, "heartbeat_at": datetime.utcnow()}}
+            )
+
+        try:
+            result = await self.handler(job, report)
+            update = {"status": "succeeded", "result": result}
+        except asyncio.CancelledError:
+            # Shutting down: leave the job for requeue_stale on the next start
+            raise
+        except Exception as e:
+            print(f"Job {job['_id']} failed: {e}")
+            update = {"status": "failed", "error": str(getattr(e, 'detail', None) or e) or type(e).__name__}
+
+        self.collection.update_one(
+            {"_id": job["_id"]},
+            {"$set": {**update, "finished_at": datetime.utcnow()}, "$unset": {"active": ""}}
+        )
+        finished = self._finished.get(str(job["_id"]))
+        if finished is not None:
+            finished.set()
+
+    def stats(self) -> Dict[str, Any]:
+        counts = {status: 0 for status in ("queued", "running", "succeeded", "failed")}
+        for row in self.collection.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}]):
+            counts[row["_id"]] = row["count"]
+        return {"workers": self.workers, "worker_id": self.worker_id, **counts}
+
+
+def job_status(job: Dict[str, Any]) -> Dict[str, Any]:
+    """API view of a job document"""
+    return {
+        "job_id": str(job["_id"]),
+        "company_id": job["company_id"],
+        "status": job["status"],
+        "deduplicated": job.get("deduplicated", False),
+        "progress": job.get("progress", {}),
+        "result": job.get("result"),
+        "error": job.get("error"),
+        "created_at": job["created_at"].isoformat(),
+        "started_at": job["started_at"].isoformat() if job.get("started_at") else None,
+        "finished_at": job["finished_at"].isoformat() if job.get("finished_at") else None
+    }
@@ -0,0 +1,205 @@
+import os
+import json
+import asyncio
+import contextlib
+from collections import deque
+from typing import Dict, Any, Callable
+import websockets
+
+# Connected, set-up Gemini Live sessions kept ready per worker (0 connects on demand)
+LIVE_POOL_SIZE = int(os.getenv("LIVE_POOL_SIZE", "2"))
+# Warm connections older than this are replaced before Gemini's session lifetime runs out
+LIVE_POOL_MAX_AGE_SECONDS = float(os.getenv("LIVE_POOL_MAX_AGE_SECONDS", "300"))
+LIVE_POOL_HEALTH_SECONDS = float(os.getenv("LIVE_POOL_HEALTH_SECONDS", "30"))
+# Upstream Live connections one worker may hold open, warm plus in use
+LIVE_MAX_UPSTREAM_CONNECTIONS = int(os.getenv("LIVE_MAX_UPSTREAM_CONNECTIONS", "20"))
+LIVE_SETUP_TIMEOUT_SECONDS = float(os.getenv("LIVE_SETUP_TIMEOUT_SECONDS", "10"))
+LIVE_PING_TIMEOUT_SECONDS = 5.0
+
+
+class LivePoolFull(Exception):
+    """Every upstream connection this worker may open is already in use"""
+
+
+class WarmConnection:
+    def __init__(self, ws, opened_at: float):
+        self.ws = ws
+        self.opened_at = opened_at
+
+
+def is_open(ws) -> bool:
+    return ws.close_code is None
+
+
+class LivePool:
+    """Pre-connected Gemini Live sessions that have already completed their setup handshake.
+
+    A Live session carries one conversation, so connections are single-use: a voice
+    session takes a warm connection, closes it when done, and the pool opens a
+    replacement in the background. Warm connections are pinged periodically and
+    recycled once they reach `max_age`.
+    """
+
+    def __init__(self, url: str, setup_message: Dict[str, Any], size: int = LIVE_POOL_SIZE,
+                 max_age: float = LIVE_POOL_MAX_AGE_SECONDS, max_connections: int = LIVE_MAX_UPSTREAM_CONNECTIONS,
+                 connect: Callable = websockets.connect):
+        self.url = url
+        self.setup = json.dumps(setup_message)
+        self.size = size
+        self.max_age = max_age
+        self.max_connections = max_connections
+        self.connect = connect
+        self._idle: deque = deque()
+        self._opening = 0
+        self._in_use = 0
+        self._refills = set()
+        self._task = None
+        self.hits = 0
+        self.misses = 0
+        self.opened = 0
+        self.recycled = 0
+        self.failures = 0
+
+    @property
+    def open_connections(self) -> int:
+        return len(self._idle) + self._opening + self._in_use
+
+    # ==================== CONNECTIONS ====================
+
+    async def open(self):
+        """Connect and complete the setup handshake; the connection is ready for audio"""
+        self._opening += 1
+        try:
+            ws = await self.connect(self.url)
+            try:
+                await ws.send(self.setup)
+                while True:
+                    message = await asyncio.wait_for(ws.recv(), LIVE_SETUP_TIMEOUT_SECONDS)
+                    if "setupComplete" in json.loads(message):
+                        break
+            except BaseException:
+                await ws.close()
+                raise
+            self.opened += 1
+            return ws
+        except Exception:
+            self.failures += 1
+            raise
+        finally:
+            self._opening -= 1
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        while self._idle:
+            conn = self._idle.popleft()
+            if is_open(conn.ws) and loop.time() - conn.opened_at < self.max_age:
+                self.hits += 1
+                self._in_use += 1
+                self.refill()
+                return conn.ws
+            self.recycled += 1
+            self._close_later(conn.ws)
+
+        if self.open_connections >= self.max_connections:
+            raise LivePoolFull(f"Live connection limit reached ({self.max_connections} per worker)")
+        self.misses += 1
+        ws = await self.open()
+        self._in_use += 1
+        self.refill()
+        return ws
+
+    async def release(self, ws):
+        """Close a connection whose voice session has ended and top the pool back up"""
+        self._in_use -= 1
+        await ws.close()
+        self.refill()
+
+    @contextlib.asynccontextmanager
+    async def connection(self):
+        ws = await self.acquire()
+        try:
+            yield ws
+        finally:
+            await self.release(ws)
+
+    # ==================== WARM POOL ====================
+
+    def refill(self):
+        """Open connections in the background until `size` are warm or idle, within the worker cap"""
+        if self._task is None:
+            return
+        missing = min(self.size - len(self._idle) - self._opening, self.max_connections - self.open_connections)
+        for _ in range(max(0, missing)):
+            task = asyncio.create_task(self._warm_one())
+            self._refills.add(task)
+            task.add_done_callback(self._refills.discard)
+
+    async def _warm_one(self):
+        try:
+            ws = await self.open()
+        except Exception as e:
+            print(f"Live pool connect error: {e}")
+            return
+        self._idle.append(WarmConnection(ws, asyncio.get_running_loop().time()))
+
+    def _close_later(self, ws):
+        task = asyncio.create_task(ws.close())
+        self._refills.add(task)
+        task.add_done_callback(self._refills.discard)
+
+    async def check(self):
+        """Drop expired or unresponsive warm connections"""
+        loop = asyncio.get_running_loop()
+        for conn in list(self._idle):
+            healthy = is_open(conn.ws) and loop.time() - conn.opened_at < self.max_age
+            if healthy:
+                try:
+                    await asyncio.wait_for(await conn.ws.ping(), LIVE_PING_TIMEOUT_SECONDS)
+                except Exception:
+                    healthy = False
+            if not healthy and conn in self._idle:
+                self._idle.remove(conn)
+                self.recycled += 1
+                self._close_later(conn.ws)
+
+    def start(self):
+        if self.size <= 0:
+            return
+        self._task = asyncio.create_task(self.run())
+        print(f"🔥 Live pool started ({self.size} warm connections, max {self.max_connections} per worker)")
+
+    async def stop(self):
+        tasks = [t for t in [self._task, *self._refills] if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        while self._idle:
+            await self._idle.popleft().ws.close()
+
+    async def run(self):
+        while True:
+            self.refill()
+            # Failed connects back off until the next health check instead of retrying in a tight loop
+            await asyncio.sleep(min(LIVE_POOL_HEALTH_SECONDS, self.max_age / 2))
+            try:
+                await self.check()
+            except Exception as e:
+                print(f"Live pool health check error: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        acquired = self.hits + self.misses
+        return {
+            "enabled": self._task is not None,
+            "size": self.size,
+            "warm": len(self._idle),
+            "opening": self._opening,
+            "in_use": self._in_use,
+            "max_connections": self.max_connections,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / acquired, 3) if acquired else 0.0,
+            "opened": self.opened,
+            "recycled": self.recycled,
+            "failures": self.failures
+        }
@@ -0,0 +1,449 @@
+import os
+import re
+import json
+import base64
+import asyncio
+import bisect
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Union
+from fastapi import WebSocketDisconnect
+import websockets
+
+# Gemini Live takes 16 kHz PCM16 from the microphone and answers with 24 kHz PCM16
+UPSTREAM_AUDIO_MIME = "audio/pcm;rate=16000"
+CLIENT_BYTES_PER_MS = 32
+AGENT_BYTES_PER_MS = 48
+
+# Microphone audio is coalesced into one upstream message per window (0 sends every frame as it arrives)
+LIVE_UPSTREAM_WINDOW_MS = float(os.getenv("LIVE_UPSTREAM_WINDOW_MS", "40"))
+# Agent audio is held until this much is buffered, smoothing Gemini's bursty delivery (0 disables)
+LIVE_DOWNSTREAM_BUFFER_MS = float(os.getenv("LIVE_DOWNSTREAM_BUFFER_MS", "60"))
+
+# verify_fact calls: after this long the user is told the check is still running; at the deadline the model gets UNCERTAIN
+LIVE_TOOL_CHECKING_SECONDS = float(os.getenv("LIVE_TOOL_CHECKING_SECONDS", "1.5"))
+LIVE_TOOL_DEADLINE_SECONDS = float(os.getenv("LIVE_TOOL_DEADLINE_SECONDS", "10"))
+
+# Upper bounds of the relay latency histogram buckets
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 40, 80, 160, 320, 640)
+
+# Messages are built from templates around the base64 payload; base64 never needs JSON escaping
+_REALTIME_INPUT_PREFIX = '{"realtimeInput":{"mediaChunks":[{"data":"'
+_REALTIME_INPUT_SEPARATOR = f'","mimeType":"{UPSTREAM_AUDIO_MIME}"}},{{"data":"'
+_REALTIME_INPUT_SUFFIX = f'","mimeType":"{UPSTREAM_AUDIO_MIME}"}}]}}}}'
+_CLIENT_AUDIO_PREFIX = '{"type":"audio","audio":"'
+_CLIENT_AUDIO_SUFFIX = '"}'
+
+# Upstream messages carrying any of these need the full parse; anything else with PCM audio takes the fast path
+_ROUTED_KEYS = (b'Transcription"', b'"toolCall', b'"setupComplete"', b'"turnComplete"', b'"interrupted"')
+_AUDIO_MIME_MARKER = b'"audio/pcm'
+_INLINE_DATA_PATTERN = re.compile(rb'"data"\s*:\s*"([A-Za-z0-9+/=]*)"')
+
+
+def realtime_input_message(chunks: List[str]) -> str:
+    """realtimeInput message carrying base64 PCM chunks as media chunks, without building a dict"""
+    return _REALTIME_INPUT_PREFIX + _REALTIME_INPUT_SEPARATOR.join(chunks) + _REALTIME_INPUT_SUFFIX
+
+
+def client_audio_message(audio_b64: str) -> str:
+    """{"type": "audio"} message for JSON clients, without building a dict"""
+    return _CLIENT_AUDIO_PREFIX + audio_b64 + _CLIENT_AUDIO_SUFFIX
+
+
+def client_audio_payload(text: str) -> Optional[str]:
+    """Base64 audio of a JSON client frame, sliced out when it has the exact shape the web client sends"""
+    if text.startswith(_CLIENT_AUDIO_PREFIX) and text.endswith(_CLIENT_AUDIO_SUFFIX):
+        audio = text[len(_CLIENT_AUDIO_PREFIX):-len(_CLIENT_AUDIO_SUFFIX)]
+        if '"' not in audio and '\\' not in audio:
+            return audio
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+    return data.get("audio") if isinstance(data, dict) and data.get("type") == "audio" else None
+
+
+def join_base64(chunks: List[str]) -> str:
+    """One base64 string for consecutive chunks; only chunks with padding force a decode"""
+    if len(chunks) == 1:
+        return chunks[0]
+    if all(len(chunk) % 4 == 0 and not chunk.endswith("=") for chunk in chunks[:-1]):
+        return "".join(chunks)
+    return base64.b64encode(b"".join(base64.b64decode(chunk) for chunk in chunks)).decode("ascii")
+
+
+def upstream_audio_chunks(message: Union[str, bytes]) -> Optional[List[str]]:
+    """Base64 audio chunks of an audio-only Gemini message, or None when it needs the full parse"""
+    raw = message.encode() if isinstance(message, str) else message
+    if _AUDIO_MIME_MARKER not in raw or any(key in raw for key in _ROUTED_KEYS):
+        return None
+    chunks = [match.decode("ascii") for match in _INLINE_DATA_PATTERN.findall(raw)]
+    return chunks or None
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram in milliseconds"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float):
+        self.counts[bisect.bisect_left(self.buckets, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-th percentile, capped at the largest observation"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(float(bound), round(self.max_ms, 1))
+        return round(self.max_ms, 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"<={bound}" for bound in self.buckets] + [f">{self.buckets[-1]}"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else None,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": round(self.max_ms, 1),
+            "buckets": dict(zip(labels, self.counts))
+        }
+
+
+class FrameBuffer:
+    """Base64 audio chunks held until they add up to `window_ms` of audio or the oldest has waited that long.
+
+    Chunks are flushed in arrival order under a lock, whether a full window or the
+    timer triggered the flush; the time each chunk spent buffered and in flight is
+    recorded in `latency`.
+    """
+
+    def __init__(self, window_ms: float, bytes_per_ms: int, flush: Callable[[List[str]], Awaitable[None]]):
+        self.window_ms = window_ms
+        self.bytes_per_ms = bytes_per_ms
+        self.flush = flush
+        self.latency = LatencyHistogram()
+        self.flushes = 0
+        self._chunks: List[str] = []
+        self._arrivals: List[float] = []
+        self._buffered_ms = 0.0
+        self._filled = asyncio.Event()
+        self._lock = asyncio.Lock()
+
+    async def add(self, audio_b64: str):
+        loop = asyncio.get_running_loop()
+        self._chunks.append(audio_b64)
+        self._arrivals.append(loop.time())
+        self._buffered_ms += len(audio_b64) * 3 / 4 / self.bytes_per_ms
+        if self._buffered_ms >= self.window_ms:
+            await self.drain()
+        else:
+            self._filled.set()
+
+    async def drain(self):
+        async with self._lock:
+            chunks, arrivals = self._chunks, self._arrivals
+            if not chunks:
+                return
+            self._chunks, self._arrivals, self._buffered_ms = [], [], 0.0
+            self._filled.clear()
+            await self.flush(chunks)
+            self.flushes += 1
+            now = asyncio.get_running_loop().time()
+            for arrived in arrivals:
+                self.latency.observe((now - arrived) * 1000)
+
+    def clear(self):
+        """Drop buffered audio, e.g. when the user interrupts the agent"""
+        self._chunks, self._arrivals, self._buffered_ms = [], [], 0.0
+        self._filled.clear()
+
+    async def run(self):
+        """Flush partial windows once their oldest chunk has waited a full window"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._filled.wait()
+            if not self._arrivals:
+                self._filled.clear()
+                continue
+            wait = self._arrivals[0] + self.window_ms / 1000 - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            elif self._chunks:
+                await self.drain()
+
+
+class LiveSession:
+    """Relays one voice session between a browser WebSocket and a Gemini Live connection.
+
+    Audio is passed through as base64 text wherever possible: client frames become
+    realtimeInput messages by string templating, and audio-only Gemini messages are
+    forwarded without a JSON round-trip. Clients that opt into binary frames send and
+    receive raw PCM16 and pay for exactly one base64 conversion per direction.
+
+    Microphone frames are coalesced into one upstream message per window and agent
+    audio passes through a small jitter buffer, so both sockets carry fewer, larger
+    messages at a bounded added latency.
+
+    verify_fact calls run as background tasks, so audio and transcripts keep flowing
+    while the grounded search is in progress.
+    """
+
+    def __init__(self, websocket, upstream, check: Callable[[str], Awaitable[Dict[str, Any]]],
+                 binary: bool = False, upstream_window_ms: float = LIVE_UPSTREAM_WINDOW_MS,
+                 downstream_buffer_ms: float = LIVE_DOWNSTREAM_BUFFER_MS):
+        self.websocket = websocket
+        self.upstream = upstream
+        self.check = check
+        self.binary = binary
+        self.microphone = FrameBuffer(upstream_window_ms, CLIENT_BYTES_PER_MS, self.send_upstream_audio)
+        self.speaker = FrameBuffer(downstream_buffer_ms, AGENT_BYTES_PER_MS, self.send_audio)
+        self.client_frames = 0
+        self.agent_chunks = 0
+        self.fast_path = 0
+        self.parsed = 0
+        self.started_at = None
+        # Activity clocks the session manager uses to shed abandoned sessions
+        self.last_client_frame_at = None
+        self.last_turn_at = None
+        self.closed_reason: Optional[str] = None
+        self._closed = asyncio.Event()
+        self.tool_calls: Dict[str, asyncio.Task] = {}
+        self.tool_latency = LatencyHistogram()
+        self.slow_tool_calls = 0
+        self.tool_timeouts = 0
+
+    # ==================== CLIENT → GEMINI ====================
+
+    async def pump_client(self):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                message = await self.websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    print("Client WebSocket disconnected")
+                    return
+                if message.get("bytes") is not None:
+                    # Raw PCM16 at 16 kHz
+                    audio = base64.b64encode(message["bytes"]).decode("ascii")
+                else:
+                    audio = client_audio_payload(message.get("text") or "")
+                if audio:
+                    self.client_frames += 1
+                    self.last_client_frame_at = loop.time()
+                    await self.microphone.add(audio)
+        except WebSocketDisconnect:
+            print("Client WebSocket disconnected")
+        except Exception as e:
+            print(f"Audio forwarding error: {e}")
+
+    async def send_upstream_audio(self, chunks: List[str]):
+        await self.upstream.send(realtime_input_message(chunks))
+
+    # ==================== GEMINI → CLIENT ====================
+
+    async def pump_upstream(self):
+        try:
+            async for message in self.upstream:
+                try:
+                    chunks = upstream_audio_chunks(message)
+                    if chunks is not None:
+                        self.fast_path += 1
+                        self.last_turn_at = asyncio.get_running_loop().time()
+                        for audio in chunks:
+                            self.agent_chunks += 1
+                            await self.speaker.add(audio)
+                        continue
+                    self.parsed += 1
+                    await self.handle_message(json.loads(message))
+                except json.JSONDecodeError as e:
+                    print(f"JSON decode error: {e}")
+                except Exception as e:
+                    print(f"Response processing error: {e}")
+        except websockets.exceptions.ConnectionClosed:
+            print("Gemini WebSocket closed")
+        except Exception as e:
+            print(f"❌ Gemini response error: {e}")
+
+    async def send_audio(self, chunks: List[str]):
+        """Forward buffered 24 kHz PCM audio to the client as one message"""
+        if self.binary:
+            await self.websocket.send_bytes(b"".join(base64.b64decode(chunk) for chunk in chunks))
+        else:
+            await self.websocket.send_text(client_audio_message(join_base64(chunks)))
+
+    async def handle_message(self, response: Dict[str, Any]):
+        if "setupComplete" in response:
+            print("🎤 Gemini setup complete")
+            return
+
+        server_content = response.get("serverContent")
+        if server_content:
+            # Any transcript, agent speech or end of turn means the conversation is alive
+            self.last_turn_at = asyncio.get_running_loop().time()
+            if server_content.get("interrupted"):
+                # The user talked over the agent; audio still buffered is stale
+                self.speaker.clear()
+
+            transcription = server_content.get("inputTranscription")
+            if transcription and transcription.get("text"):
+                print(f"👤 USER: {transcription['text']}")
+                await self.websocket.send_json({"type": "transcript", "role": "user", "text": transcription["text"]})
+
+            for part in (server_content.get("modelTurn") or {}).get("parts", []):
+                inline_data = part.get("inlineData")
+                if inline_data and inline_data.get("mimeType", "").startswith("audio/pcm"):
+                    self.agent_chunks += 1
+                    await self.speaker.add(inline_data["data"])
+
+            transcription = server_content.get("outputTranscription")
+            if transcription and transcription.get("text"):
+                print(f"🤖 AGENT: {transcription['text']}")
+                await self.websocket.send_json({"type": "transcript", "role": "agent", "text": transcription["text"]})
+
+            if server_content.get("turnComplete"):
+                # Nothing more is coming this turn, so the tail should not wait out the buffer
+                await self.speaker.drain()
+
+        tool_call = response.get("toolCall")
+        if tool_call:
+            self.last_turn_at = asyncio.get_running_loop().time()
+            for fc in tool_call.get("functionCalls", []):
+                if fc["name"] == "verify_fact":
+                    self.dispatch_tool_call(fc)
+
+        cancellation = response.get("toolCallCancellation")
+        if cancellation:
+            # The user moved on; Gemini no longer wants these results
+            for call_id in cancellation.get("ids", []):
+                task = self.tool_calls.pop(call_id, None)
+                if task is not None:
+                    task.cancel()
+
+    # ==================== TOOL CALLS ====================
+
+    def dispatch_tool_call(self, fc: Dict[str, Any]):
+        """Run a function call in the background; calls from one toolCall proceed concurrently"""
+        task = asyncio.create_task(self.handle_tool_call(fc))
+        self.tool_calls[fc["id"]] = task
+        task.add_done_callback(lambda _: self.tool_calls.pop(fc["id"], None))
+
+    async def handle_tool_call(self, fc: Dict[str, Any]):
+        query = fc["args"].get("query", "")
+        print(f"🔍 Voice → Check: '{query}'")
+        await self.websocket.send_json({
+            "type": "agent_communication",
+            "text": f"Voice Agent → Check Agent: \"{query}\""
+        })
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        check = asyncio.create_task(self.check(query))
+        try:
+            done, _ = await asyncio.wait({check}, timeout=LIVE_TOOL_CHECKING_SECONDS)
+            if not done:
+                self.slow_tool_calls += 1
+                await self.websocket.send_json({
+                    "type": "agent_communication",
+                    "text": f"⏳ Check Agent is still checking \"{query}\"…"
+                })
+                done, _ = await asyncio.wait({check}, timeout=max(0.0, LIVE_TOOL_DEADLINE_SECONDS - LIVE_TOOL_CHECKING_SECONDS))
+        finally:
+            # run_check_agent shields the shared search, so it still finishes and lands in the cache
+            check.cancel()
+        self.tool_latency.observe((loop.time() - started) * 1000)
+
+        if done and check.exception() is None:
+            result = check.result()
+        else:
+            if done:
+                print(f"Check error: {check.exception()}")
+            else:
+                self.tool_timeouts += 1
+                print(f"⌛ Check deadline passed for '{query}'")
+            result = {"verdict": "UNCERTAIN", "explanation": "The fact check did not finish in time.", "sources": []}
+        print(f"✅ Check → Voice: {result['verdict']}")
+        await self.websocket.send_json({"type": "agent_result", "verdict": result["verdict"], "query": query})
+
+        tool_response = {
+            "toolResponse": {
+                "functionResponses": [{
+                    "name": fc["name"],
+                    "id": fc["id"],
+                    "response": {
+                        "verdict": result["verdict"],
+                        "explanation": result["explanation"][:200],
+                        "sources": result["sources"][:2]
+                    },
+                    # Announce the verdict once the model finishes its current sentence
+                    "scheduling": "WHEN_IDLE"
+                }]
+            }
+        }
+        await self.upstream.send(json.dumps(tool_response))
+
+    # ==================== LIFECYCLE ====================
+
+    async def run(self):
+        """Relay until either side goes away or the session is closed, then stop the other direction"""
+        self.started_at = self.last_client_frame_at = self.last_turn_at = asyncio.get_running_loop().time()
+        tasks = [asyncio.create_task(self.pump_client()), asyncio.create_task(self.pump_upstream()),
+                 asyncio.create_task(self.microphone.run()), asyncio.create_task(self.speaker.run()),
+                 asyncio.create_task(self._closed.wait())]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            tasks += list(self.tool_calls.values())
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def close(self, reason: str):
+        """Stop relaying from outside the session, e.g. when it is shed for being idle"""
+        self.closed_reason = reason
+        self._closed.set()
+
+    def stats(self) -> Dict[str, Any]:
+        elapsed = asyncio.get_running_loop().time() - self.started_at if self.started_at else 0.0
+
+        def rate(count: int) -> float:
+            return round(count / elapsed, 1) if elapsed else 0.0
+
+        return {
+            "binary": self.binary,
+            "duration_seconds": round(elapsed, 1),
+            "upstream": {
+                "window_ms": self.microphone.window_ms,
+                "client_frames": self.client_frames,
+                "messages": self.microphone.flushes,
+                "client_frames_per_second": rate(self.client_frames),
+                "messages_per_second": rate(self.microphone.flushes),
+                "latency": self.microphone.latency.snapshot()
+            },
+            "downstream": {
+                "buffer_ms": self.speaker.window_ms,
+                "agent_chunks": self.agent_chunks,
+                "messages": self.speaker.flushes,
+                "agent_chunks_per_second": rate(self.agent_chunks),
+                "messages_per_second": rate(self.speaker.flushes),
+                "latency": self.speaker.latency.snapshot(),
+                "fast_path": self.fast_path,
+                "parsed": self.parsed
+            },
+            "tools": {
+                "in_flight": len(self.tool_calls),
+                "calls": self.tool_latency.count,
+                "slow": self.slow_tool_calls,
+                "timeouts": self.tool_timeouts,
+                "latency": self.tool_latency.snapshot()
+            }
+        }
@@ -3,13 +3,25 @@ import json
 import random
 import asyncio
 from typing import Dict, List, Any, Optional
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 from google import genai
 from google.genai import types
 from dotenv import load_dotenv
-import websockets
+from gemini_client import GeminiClient
+from verdict_cache import create_verdict_cache, normalize_claim
+from claim_index import ClaimIndex
+from batch_verify import verify_claims, chunked, VERIFY_BATCH_SIZE
+from schemas import StructuredParser, VERIFICATION_SCHEMA
+from parsing import grounding_web_chunks
+from singleflight import SingleFlight
+from crisis_monitor import CrisisMonitor, CRISIS_MONITOR_INTERVAL_SECONDS
+from live_session import LiveSession
+from live_pool import LivePool
+from session_manager import SessionManager, SessionCapacityError, ClientDisconnected, TRY_AGAIN_LATER
+from sse import sse_event
 
 # Load environment variables from .env file
 load_dotenv()
@@ -21,6 +33,13 @@ if not API_KEY:
 print(f"✅ API Key loaded: {API_KEY[:10]}...")
 
 ai = genai.Client(api_key=API_KEY)
+gemini = GeminiClient(ai)
+structured = StructuredParser(gemini)
+verdict_cache = create_verdict_cache()
+claim_index = ClaimIndex()
+check_flights = SingleFlight()
+# Checks left running after their caller's deadline; they finish to fill the verdict caches
+detached_checks = set()
 
 app = FastAPI()
 
@@ -39,6 +58,8 @@ LIVE_AGENT_TOOLS = [
             {
                 "name": "verify_fact",
                 "description": "Verify a claim, news, or fact using the Check Agent. Use this for ANY objective question regarding reality, news, weather, or data.",
+                # The model keeps talking while the grounded search runs; the verdict arrives when it is idle
+                "behavior": "NON_BLOCKING",
                 "parameters": {
                     "type": "object",
                     "properties": {
@@ -54,10 +75,47 @@ LIVE_AGENT_TOOLS = [
     }
 ]
 
+# Setup message sent on every Gemini Live connection (native audio model)
+LIVE_SETUP_MESSAGE = {
+    "setup": {
+        "model": "models/gemini-2.5-flash-native-audio-preview-09-2025",
+        # Transcripts go to the client and keep the session's idle clock running
+        "inputAudioTranscription": {},
+        "outputAudioTranscription": {},
+        "generationConfig": {
+            "responseModalities": ["AUDIO"],
+            "speechConfig": {
+                "voiceConfig": {
+                    "prebuiltVoiceConfig": {
+                        "voiceName": "Puck"
+                    }
+                }
+            }
+        },
+        "systemInstruction": {
+            "parts": [{
+                "text": "You are the Voice Main Agent. You listen to the user. You have access to a tool called 'verify_fact'. If the user asks ANY question about facts, news, weather, or reality, you MUST use 'verify_fact' to check it. Do not answer from your own knowledge. Always cite the source provided by the tool. Be concise and conversational."
+            }]
+        },
+        "tools": LIVE_AGENT_TOOLS
+    }
+}
+
+# Use the correct Gemini Live WebSocket URL 
+GEMINI_LIVE_URL = f"wss://generativelanguage.googleapis.com/ws/google.ai.generativelanguage.v1beta.GenerativeService.BidiGenerateContent?key={API_KEY}"
+live_pool = LivePool(GEMINI_LIVE_URL, LIVE_SETUP_MESSAGE)
+live_sessions = SessionManager()
+
 CHECKER_TOOLS = [
     {"google_search": {}}
 ]
 
+# Crisis scan: claims checked per scan (default and cap) and overall deadline for a scan
+CRISIS_SCAN_MAX_CLAIMS = int(os.getenv("CRISIS_SCAN_MAX_CLAIMS", "3"))
+CRISIS_SCAN_MAX_CLAIMS_LIMIT = int(os.getenv("CRISIS_SCAN_MAX_CLAIMS_LIMIT", "10"))
+CRISIS_SCAN_DEADLINE_SECONDS = float(os.getenv("CRISIS_SCAN_DEADLINE_SECONDS", "60"))
+CRISIS_SCAN_DEADLINE_LIMIT = float(os.getenv("CRISIS_SCAN_DEADLINE_LIMIT", "300"))
+
 # --- AGENT 0: TRANSCRIBER ---
 async def transcribe_audio(base64_audio: str, mime_type: str = "audio/webm") -> str:
     try:
@@ -65,7 +123,7 @@ async def transcribe_audio(base64_audio: str, mime_type: str = "audio/webm") ->
         if not clean_mime:
             clean_mime = 'audio/webm'
         
-        response = ai.models.generate_content(
+        response = await gemini.generate_content(
             model="gemini-2.5-flash",
             contents={
                 "parts": [
@@ -100,7 +158,7 @@ orchestrator_schema = {
 
 async def run_main_agent(user_text: str) -> Dict[str, Any]:
     try:
-        response = ai.models.generate_content(
+        response = await gemini.generate_content(
             model="gemini-2.5-flash",
             contents=user_text,
             config={
@@ -121,67 +179,140 @@ async def run_main_agent(user_text: str) -> Dict[str, Any]:
         return {"action": "DIRECT_REPLY", "reasoning": "Error", "reply_text": "System error."}
 
 # --- AGENT 2: CHECK AGENT ---
+def cached_check(query: str) -> Optional[Dict[str, Any]]:
+    """Known verdict for this claim or a previously checked paraphrase of it"""
+    cached = verdict_cache.get(query)
+    if cached is not None:
+        return cached
+
+    # Reuse the verdict of a previously checked paraphrase of this claim
+    similar = claim_index.lookup(query)
+    if similar is not None:
+        similar_claim, result = similar
+        print(f"♻️ Reusing verdict of similar claim: '{similar_claim}'")
+        verdict_cache.set(query, result)
+        return result
+    return None
+
 async def run_check_agent(query: str) -> Dict[str, Any]:
+    cached = cached_check(query)
+    if cached is not None:
+        return cached
+
+    # Concurrent checks of the same claim share a single grounded search
+    return await check_flights.do(normalize_claim(query), lambda: run_uncached_check(query))
+
+async def run_uncached_check(query: str) -> Dict[str, Any]:
     try:
-        response = ai.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=f'Fact check: "{query}". Format: VERDICT: [REAL/FAKE/UNCERTAIN], CONFIDENCE: [0.0-1.0], EXPLANATION: [...]',
-            config={
-                "tools": CHECKER_TOOLS,
-                "temperature": 0.1
-            }
-        )
-        
-        grounding_chunks = []
-        if response.candidates and len(response.candidates) > 0:
-            if response.candidates[0].grounding_metadata:
-                grounding_chunks = response.candidates[0].grounding_metadata.grounding_chunks or []
-        
-        sources = []
-        for chunk in grounding_chunks:
-            if chunk.web:
-                sources.append({"title": chunk.web.title, "uri": chunk.web.uri})
-        
-        text = response.text or ""
-        
-        verdict = 'UNCERTAIN'
-        confidence = 0.5
-        
-        # Parse verdict
-        import re
-        verdict_match = re.search(r'VERDICT:\s*(REAL|FAKE|UNCERTAIN)', text, re.IGNORECASE)
-        if verdict_match:
-            verdict = verdict_match.group(1).upper()
-        
-        # Parse confidence
-        confidence_match = re.search(r'CONFIDENCE:\s*([0-9]*\.?[0-9]+)', text, re.IGNORECASE)
-        if confidence_match:
-            confidence = float(confidence_match.group(1))
-        
-        # Extract explanation
-        explanation = re.sub(r'VERDICT:.*(\n|$)', '', text, flags=re.IGNORECASE)
-        explanation = re.sub(r'CONFIDENCE:.*(\n|$)', '', explanation, flags=re.IGNORECASE)
-        explanation = explanation.strip()
-        
-        return {
-            "verdict": verdict,
-            "confidence": confidence,
-            "explanation": explanation,
-            "sources": sources[:5]
-        }
+        result = await run_grounded_check(query)
     except Exception as error:
         print(f"Check Agent Error: {error}")
         return {
             "verdict": "UNCERTAIN",
             "confidence": 0,
             "explanation": "Tool access failed.",
-            "sources": []
+            "sources": [],
+            "failed": True
+        }
+
+    verdict_cache.set(query, result)
+    claim_index.add(query, result)
+    return result
+
+async def run_grounded_check(query: str) -> Dict[str, Any]:
+    response = await gemini.generate_content(
+        model="gemini-2.5-flash",
+        contents=f'Fact check: "{query}". Respond with ONLY a JSON object (no markdown) matching this JSON schema: {json.dumps(VERIFICATION_SCHEMA)}',
+        config={
+            "tools": CHECKER_TOOLS,
+            "temperature": 0.1
         }
+    )
+
+    sources = [{"title": web.title, "uri": web.uri} for web in grounding_web_chunks(response)]
+
+    result = await structured.verification(response.text or "")
+    if result is None:
+        raise ValueError("Check response could not be parsed")
+
+    return {
+        "verdict": result.verdict,
+        "confidence": result.confidence,
+        "explanation": result.explanation,
+        "sources": sources[:5]
+    }
+
+async def iter_claim_checks(claims: List[str], ends_at: Optional[float] = None):
+    """Yield (index, check result) for each claim as it resolves.
+
+    Known verdicts come first; the rest are checked VERIFY_BATCH_SIZE at a time in one
+    grounded call each, and only claims a batch leaves unresolved get their own check.
+    Once the loop time `ends_at` passes, iteration stops and checks still in flight are
+    left to finish in the background so their verdicts are cached, not thrown away.
+    """
+    remaining = []
+    for index, claim in enumerate(claims):
+        cached = cached_check(claim)
+        if cached is not None:
+            yield index, cached
+        else:
+            remaining.append(index)
+
+    async def check_one(index: int):
+        return [(index, await run_check_agent(claims[index]))]
+
+    async def check_batch(indices: List[int]):
+        try:
+            verdicts = await verify_claims(structured, [claims[i] for i in indices])
+        except Exception as error:
+            print(f"Batch Check Error: {error}")
+            verdicts = [None] * len(indices)
+
+        results = []
+        for index, verdict in zip(indices, verdicts):
+            result = None
+            if verdict is not None:
+                result = {
+                    "verdict": verdict["verdict"],
+                    "confidence": verdict["confidence"],
+                    "explanation": verdict["explanation"],
+                    "sources": verdict["sources"]
+                }
+                verdict_cache.set(claims[index], result)
+                claim_index.add(claims[index], result)
+            results.append((index, result))
+        return results
+
+    if VERIFY_BATCH_SIZE > 1 and len(remaining) > 1:
+        tasks = {asyncio.create_task(check_batch(chunk)) for chunk in chunked(remaining, VERIFY_BATCH_SIZE)}
+    else:
+        tasks = {asyncio.create_task(check_one(index)) for index in remaining}
+
+    loop = asyncio.get_running_loop()
+    try:
+        while tasks:
+            timeout = None if ends_at is None else max(0.0, ends_at - loop.time())
+            done, tasks = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                for task in tasks:
+                    detached_checks.add(task)
+                    task.add_done_callback(detached_checks.discard)
+                tasks = set()
+                break
+            for task in done:
+                for index, result in task.result():
+                    if result is None:
+                        tasks.add(asyncio.create_task(check_one(index)))
+                    else:
+                        yield index, result
+    finally:
+        for task in tasks:
+            task.cancel()
 
 # --- AGENT 4: IMAGE AGENT ---
 async def process_image_content(base64_image: str, user_message: str = "") -> Dict[str, Any]:
     try:
-        response = ai.models.generate_content(
+        response = await gemini.generate_content(
             model="gemini-2.5-flash",
             contents={
                 "parts": [
@@ -222,49 +353,95 @@ orchestrator_schema = {
     },
     "required": ['action', 'reasoning']
 }
-async def scan_crisis_trends(topic: str) -> List[Dict[str, Any]]:
+async def discover_crisis_claims(topic: str, max_claims: int = CRISIS_SCAN_MAX_CLAIMS) -> List[str]:
+    """Trending rumors and viral claims about a topic, at most `max_claims` of them"""
+    scan_response = await gemini.generate_content(
+        model="gemini-2.5-flash",
+        contents=f'Find the top {max_claims} trending rumors, news headlines, or viral claims currently circulating about: "{topic}". Return ONLY a JSON array of strings, no markdown.',
+        config={
+            "tools": CHECKER_TOOLS
+        }
+    )
+
+    claims = []
     try:
-        scan_response = ai.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=f'Find the top 3 trending rumors, news headlines, or viral claims currently circulating about: "{topic}". Return ONLY a JSON array of strings, no markdown.',
-            config={
-                "tools": CHECKER_TOOLS
-            }
-        )
-        
+        clean_text = scan_response.text or "[]"
+        clean_text = clean_text.replace('```json', '').replace('```', '').strip()
+        claims = json.loads(clean_text)
+    except Exception as e:
+        print(f"Parse error: {e}")
+
+    return [str(claim) for claim in claims if claim][:max_claims]
+
+def crisis_alert(topic: str, claim: str, check: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": ''.join(random.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=9)),
+        "topic": topic,
+        "claim": claim,
+        "severity": 'HIGH' if check["verdict"] == 'FAKE' else 'MEDIUM',
+        "verdict": check["verdict"],
+        "confidence": check["confidence"],
+        "explanation": check["explanation"],
+        "sources": check["sources"],  # Include sources from fact check
+        "volume": random.randint(500, 1500),
+        "timestamp": None
+    }
+
+async def iter_crisis_scan(topic: str, max_claims: int = CRISIS_SCAN_MAX_CLAIMS,
+                           deadline: float = CRISIS_SCAN_DEADLINE_SECONDS):
+    """Discover claims, then check them concurrently, yielding events as each verdict lands.
+
+    Yields {"event": "claims"}, one {"event": "alert", "index"} per checked claim and a closing
+    {"event": "done"}. Checks still running when the overall deadline passes are not waited
+    for; they finish in the background and only fill the verdict caches.
+    """
+    max_claims = max(1, min(max_claims, CRISIS_SCAN_MAX_CLAIMS_LIMIT))
+    deadline = min(deadline, CRISIS_SCAN_DEADLINE_LIMIT)
+    loop = asyncio.get_running_loop()
+    ends_at = loop.time() + deadline
+
+    try:
+        claims = await asyncio.wait_for(discover_crisis_claims(topic, max_claims), deadline)
+    except Exception as error:
+        print(f"Scanner Error: {error or type(error).__name__}")
         claims = []
-        try:
-            clean_text = scan_response.text or "[]"
-            clean_text = clean_text.replace('```json', '').replace('```', '').strip()
-            claims = json.loads(clean_text)
-        except Exception as e:
-            print(f"Parse error: {e}")
-        
-        if len(claims) == 0:
-            return []
-        
-        async def check_claim(claim):
-            check = await run_check_agent(claim)
-            return {
-                "id": ''.join(random.choices('abcdefghijklmnopqrstuvwxyz0123456789', k=9)),
-                "topic": topic,
-                "claim": claim,
-                "severity": 'HIGH' if check["verdict"] == 'FAKE' else 'MEDIUM',
-                "verdict": check["verdict"],
-                "confidence": check["confidence"],
-                "explanation": check["explanation"],
-                "sources": check["sources"],  # Include sources from fact check
-                "volume": random.randint(500, 1500),
-                "timestamp": None
-            }
-        
-        check_promises = [check_claim(claim) for claim in claims]
-        return await asyncio.gather(*check_promises)
-        
+    yield {"event": "claims", "topic": topic, "claims": claims}
+
+    checks = iter_claim_checks(claims, ends_at)
+    completed = 0
+    try:
+        async for index, check in checks:
+            completed += 1
+            yield {"event": "alert", "index": index, "alert": crisis_alert(topic, claims[index], check)}
+    finally:
+        await checks.aclose()
+    if completed < len(claims):
+        print(f"⏱️ Crisis scan deadline reached with {completed}/{len(claims)} claims checked")
+
+    yield {"event": "done", "checked": completed, "total": len(claims), "timed_out": completed < len(claims)}
+
+async def scan_crisis_trends(topic: str, max_claims: int = CRISIS_SCAN_MAX_CLAIMS,
+                             deadline: float = CRISIS_SCAN_DEADLINE_SECONDS) -> List[Dict[str, Any]]:
+    """Alerts for every claim checked before the deadline, in discovery order"""
+    try:
+        alerts = {}
+        async for event in iter_crisis_scan(topic, max_claims, deadline):
+            if event["event"] == "alert":
+                alerts[event["index"]] = event["alert"]
+        return [alerts[index] for index in sorted(alerts)]
+
     except Exception as error:
         print(f"Scanner Error: {error}")
         return []
 
+async def check_crisis_claims(topic: str, claims: List[str]):
+    """Alerts for the monitor; failed checks are left out so the claim is retried on the next scan"""
+    async for index, check in iter_claim_checks(claims):
+        if not check.get("failed"):
+            yield index, crisis_alert(topic, claims[index], check)
+
+crisis_monitor = CrisisMonitor(discover_crisis_claims, check_crisis_claims)
+
 # --- SYNTHESIS ---
 async def run_main_agent_synthesis(user_query: str, check_result: Dict[str, Any]) -> str:
     try:
@@ -318,7 +495,7 @@ Example format:
 *This assessment is based on verification from multiple reliable sources.*
 """
 
-        response = ai.models.generate_content(
+        response = await gemini.generate_content(
             model="gemini-2.5-flash",
             contents=synthesis_prompt,
             config={
@@ -360,6 +537,13 @@ class ImageRequest(BaseModel):
 
 class ScanCrisisRequest(BaseModel):
     topic: str
+    maxClaims: int = CRISIS_SCAN_MAX_CLAIMS
+    deadlineSeconds: float = Field(CRISIS_SCAN_DEADLINE_SECONDS, gt=0, le=CRISIS_SCAN_DEADLINE_LIMIT)
+
+class WatchTopicRequest(BaseModel):
+    topic: str
+    intervalSeconds: float = CRISIS_MONITOR_INTERVAL_SECONDS
+    maxClaims: int = CRISIS_SCAN_MAX_CLAIMS
 
 class SynthesisRequest(BaseModel):
     userQuery: str
@@ -381,6 +565,16 @@ async def api_check_agent(request: CheckAgentRequest):
     result = await run_check_agent(request.query)
     return result
 
+@app.get("/api/check-agent/stats")
+async def api_check_agent_stats():
+    return {
+        "verdict_cache": verdict_cache.stats(),
+        "claim_index": claim_index.stats(),
+        "coalescing": check_flights.stats(),
+        "structured_output": structured.stats(),
+        "gemini": gemini.stats()
+    }
+
 @app.post("/api/process-image")
 async def api_process_image(request: ImageRequest):
     result = await process_image_content(request.base64Image, request.userMessage)
@@ -388,9 +582,72 @@ async def api_process_image(request: ImageRequest):
 
 @app.post("/api/scan-crisis")
 async def api_scan_crisis(request: ScanCrisisRequest):
-    result = await scan_crisis_trends(request.topic)
+    result = await scan_crisis_trends(request.topic, request.maxClaims, request.deadlineSeconds)
     return result
 
+@app.post("/api/scan-crisis/stream")
+async def api_scan_crisis_stream(request: ScanCrisisRequest):
+    """Streaming scan: discovered claims, then one alert per claim as soon as its verdict is ready"""
+    async def stream():
+        async for event in iter_crisis_scan(request.topic, request.maxClaims, request.deadlineSeconds):
+            yield sse_event(event)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.on_event("startup")
+async def start_crisis_monitor():
+    crisis_monitor.start()
+
+@app.on_event("shutdown")
+async def stop_crisis_monitor():
+    await crisis_monitor.stop()
+
+@app.get("/api/crisis-monitor")
+async def api_crisis_monitor():
+    return crisis_monitor.stats()
+
+@app.post("/api/crisis-monitor/watch")
+async def api_crisis_monitor_watch(request: WatchTopicRequest):
+    """Add a topic to the watchlist (or update its interval); new claims are pushed on /ws/crisis-alerts"""
+    max_claims = max(1, min(request.maxClaims, CRISIS_SCAN_MAX_CLAIMS_LIMIT))
+    try:
+        return crisis_monitor.watch(request.topic, request.intervalSeconds, max_claims)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/api/crisis-monitor/unwatch")
+async def api_crisis_monitor_unwatch(request: WatchTopicRequest):
+    if not crisis_monitor.unwatch(request.topic):
+        raise HTTPException(status_code=404, detail="Topic is not being watched")
+    return {"success": True}
+
+@app.websocket("/ws/crisis-alerts")
+async def websocket_crisis_alerts(websocket: WebSocket, topics: str = ""):
+    """Pushes alerts for newly emerging claims; `topics` (comma-separated) narrows the feed"""
+    await websocket.accept()
+    queue = crisis_monitor.subscribe([t for t in topics.split(",") if t.strip()])
+
+    async def push_alerts():
+        while True:
+            await websocket.send_json(await queue.get())
+
+    async def wait_for_disconnect():
+        while True:
+            await websocket.receive_text()
+
+    sender = asyncio.create_task(push_alerts())
+    receiver = asyncio.create_task(wait_for_disconnect())
+    try:
+        await asyncio.wait([sender, receiver], return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        sender.cancel()
+        receiver.cancel()
+        crisis_monitor.unsubscribe(queue)
+
 @app.post("/api/synthesis")
 async def api_synthesis(request: SynthesisRequest):
     print(f"📩 Synthesis API called")
@@ -404,180 +661,57 @@ async def api_synthesis(request: SynthesisRequest):
     return {"text": text}
 
 # WebSocket for Live Voice - CLEAN VERSION
+@app.on_event("startup")
+async def start_live_pool():
+    live_pool.start()
+    live_sessions.start()
+
+@app.on_event("shutdown")
+async def stop_live_pool():
+    await live_sessions.stop()
+    await live_pool.stop()
+
+@app.get("/api/live-session/stats")
+async def api_live_session_stats():
+    return {"sessions": live_sessions.stats(), "pool": live_pool.stats()}
+
 @app.websocket("/ws/live-session")
-async def websocket_live_session(websocket: WebSocket):
+async def websocket_live_session(websocket: WebSocket, binary: bool = False):
+    """Voice session bridge; `?binary=1` clients get agent audio as raw PCM binary frames"""
     await websocket.accept()
     print("🎤 VOICE: Connected")
     
     try:
-        # Use the correct Gemini Live WebSocket URL 
-        gemini_ws_url = f"wss://generativelanguage.googleapis.com/ws/google.ai.generativelanguage.v1beta.GenerativeService.BidiGenerateContent?key={API_KEY}"
-        
-        # Connect directly to Gemini Live WebSocket
-        async with websockets.connect(gemini_ws_url) as gemini_ws:
-            print("🎤 Connected to Gemini Live API")
-            
-            # Send setup message with native audio model
-            setup_message = {
-                "setup": {
-                    "model": "models/gemini-2.5-flash-native-audio-preview-09-2025",
-                    "generationConfig": {
-                        "responseModalities": ["AUDIO"],
-                        "speechConfig": {
-                            "voiceConfig": {
-                                "prebuiltVoiceConfig": {
-                                    "voiceName": "Puck"
-                                }
-                            }
-                        }
-                    },
-                    "systemInstruction": {
-                        "parts": [{
-                            "text": "You are the Voice Main Agent. You listen to the user. You have access to a tool called 'verify_fact'. If the user asks ANY question about facts, news, weather, or reality, you MUST use 'verify_fact' to check it. Do not answer from your own knowledge. Always cite the source provided by the tool. Be concise and conversational."
-                        }]
-                    },
-                    "tools": LIVE_AGENT_TOOLS
-                }
-            }
-            
-            await gemini_ws.send(json.dumps(setup_message))
-            await websocket.send_json({"type": "connected"})
-            
-            # Handle client audio streaming to Gemini
-            async def forward_audio_to_gemini():
-                try:
-                    while True:
-                        data = await websocket.receive_json()
-                        if data.get("type") == "audio":
-                            # Convert base64 to proper PCM format and send to Gemini
-                            realtime_input = {
-                                "realtimeInput": {
-                                    "mediaChunks": [{
-                                        "data": data["audio"],
-                                        "mimeType": "audio/pcm;rate=16000"
-                                    }]
-                                }
-                            }
-                            await gemini_ws.send(json.dumps(realtime_input))
-                            
-                except WebSocketDisconnect:
-                    print("Client WebSocket disconnected")
-                    return
-                except Exception as e:
-                    print(f"Audio forwarding error: {e}")
-                    return
-            
-            # Handle Gemini responses and forward to client
-            async def process_gemini_responses():
-                try:
-                    async for message in gemini_ws:
-                        try:
-                            response = json.loads(message)
-                            
-                            # Handle setup complete
-                            if "setupComplete" in response:
-                                print("🎤 Gemini setup complete")
-                                continue
-                            
-                            # Handle server content
-                            if "serverContent" in response:
-                                server_content = response["serverContent"]
-                                
-                                # User transcript from input transcription
-                                if "inputTranscription" in server_content and server_content["inputTranscription"]:
-                                    transcript = server_content["inputTranscription"].get("text", "")
-                                    if transcript:
-                                        print(f"👤 USER: {transcript}")
-                                        await websocket.send_json({
-                                            "type": "transcript", 
-                                            "role": "user", 
-                                            "text": transcript
-                                        })
-                                
-                                # Agent audio response
-                                if "modelTurn" in server_content:
-                                    model_turn = server_content["modelTurn"]
-                                    if "parts" in model_turn:
-                                        for part in model_turn["parts"]:
-                                            if "inlineData" in part:
-                                                inline_data = part["inlineData"]
-                                                if inline_data.get("mimeType", "").startswith("audio/pcm"):
-                                                    # Send 24kHz PCM audio back to client
-                                                    await websocket.send_json({
-                                                        "type": "audio",
-                                                        "audio": inline_data["data"]
-                                                    })
-                                
-                                # Agent transcript from output transcription
-                                if "outputTranscription" in server_content and server_content["outputTranscription"]:
-                                    agent_text = server_content["outputTranscription"].get("text", "")
-                                    if agent_text:
-                                        print(f"🤖 AGENT: {agent_text}")
-                                        await websocket.send_json({
-                                            "type": "transcript", 
-                                            "role": "agent", 
-                                            "text": agent_text
-                                        })
-                            
-                            # Handle tool calls
-                            if "toolCall" in response:
-                                tool_call = response["toolCall"]
-                                if "functionCalls" in tool_call:
-                                    for fc in tool_call["functionCalls"]:
-                                        if fc["name"] == "verify_fact":
-                                            query = fc["args"].get("query", "")
-                                            print(f"🔍 Voice → Check: '{query}'")
-                                            
-                                            await websocket.send_json({
-                                                "type": "agent_communication",
-                                                "text": f"Voice Agent → Check Agent: \"{query}\""
-                                            })
-                                            
-                                            # Call our check agent
-                                            result = await run_check_agent(query)
-                                            print(f"✅ Check → Voice: {result['verdict']}")
-                                            
-                                            await websocket.send_json({
-                                                "type": "agent_result",
-                                                "verdict": result["verdict"],
-                                                "query": query
-                                            })
-                                            
-                                            # Send tool response back to Gemini
-                                            tool_response = {
-                                                "toolResponse": {
-                                                    "functionResponses": [{
-                                                        "name": fc["name"],
-                                                        "id": fc["id"],
-                                                        "response": {
-                                                            "verdict": result["verdict"],
-                                                            "explanation": result["explanation"][:200],
-                                                            "sources": result["sources"][:2]
-                                                        }
-                                                    }]
-                                                }
-                                            }
-                                            await gemini_ws.send(json.dumps(tool_response))
-                                            
-                        except json.JSONDecodeError as e:
-                            print(f"JSON decode error: {e}")
-                        except Exception as e:
-                            print(f"Response processing error: {e}")
-                            
-                except websockets.exceptions.ConnectionClosed:
-                    print("Gemini WebSocket closed")
-                    return
-                except Exception as e:
-                    print(f"❌ Gemini response error: {e}")
-                    return
-            
-            # Run both tasks concurrently
-            await asyncio.gather(
-                forward_audio_to_gemini(), 
-                process_gemini_responses(),
-                return_exceptions=True
-            )
+        # Waits in the queue (or is rejected) when this worker is at its session cap
+        async with live_sessions.slot(websocket, websocket.client.host if websocket.client else "") as managed:
+            started = asyncio.get_running_loop().time()
+            # A pre-connected Gemini Live session that has already completed setup, when one is warm
+            async with live_pool.connection() as gemini_ws:
+                print(f"🎤 Attached to Gemini Live API in {(asyncio.get_running_loop().time() - started) * 1000:.0f} ms")
+                await websocket.send_json({"type": "connected", "binary": binary})
+                
+                # Client audio may arrive as JSON or binary frames either way
+                session = LiveSession(websocket, gemini_ws, run_check_agent, binary=binary)
+                managed.attach(session)
+                await session.run()
+                stats = session.stats()
+                print(f"📊 VOICE: {stats['upstream']['messages_per_second']} msg/s up "
+                      f"(p95 {stats['upstream']['latency']['p95_ms']} ms), "
+                      f"{stats['downstream']['messages_per_second']} msg/s down "
+                      f"(p95 {stats['downstream']['latency']['p95_ms']} ms)")
+                if session.closed_reason:
+                    await websocket.send_json({"type": "error", "message": session.closed_reason})
+                    await websocket.close()
     
+    except ClientDisconnected:
+        print("🚦 VOICE: client left the queue")
+    except SessionCapacityError as e:
+        print(f"🚦 VOICE rejected: {e}")
+        try:
+            await websocket.send_json({"type": "error", "message": str(e)})
+            await websocket.close(code=TRY_AGAIN_LATER)
+        except:
+            pass
     except Exception as e:
         print(f"❌ VOICE Error: {e}")
         try:
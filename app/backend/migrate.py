@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+One-time data migrations for the company news tracking collections.
+
+Usage:
+    python migrate.py company-ids      # store every news_tracking.company_id as the canonical string
+    python migrate.py split-news       # move embedded verified_news arrays into news_items
+    python migrate.py rebuild-stats    # rebuild all company_stats rollups from news_tracking
+
+Each migration is idempotent and safe to re-run. Run them in the order listed.
+"""
+import os
+import sys
+import argparse
+from dotenv import load_dotenv
+from repository import get_database, ensure_indexes, canonical_company_id, insert_run_news, load_run_news, stats_history
+from stats_store import rebuild_company_stats
+
+
+def migrate_company_ids(db) -> int:
+    """Rewrite ObjectId-typed news_tracking.company_id values to canonical strings"""
+    # Pipeline update (MongoDB 4.2+): the conversion runs server-side in a single command
+    result = db['news_tracking'].update_many(
+        {"company_id": {"$type": "objectId"}},
+        [{"$set": {"company_id": {"$toString": "$company_id"}}}]
+    )
+
+    ensure_indexes(db)
+    print(f"✅ Migrated {result.modified_count} tracking records to string company ids")
+    return result.modified_count
+
+
+def split_news(db) -> int:
+    """Move each run's embedded verified_news into news_items, leaving a summary document"""
+    ensure_indexes(db)
+    tracking = db['news_tracking']
+    split = 0
+
+    for run in tracking.find({"verified_news": {"$exists": True}}, {"company_id": 1, "timestamp": 1, "verified_news": 1}):
+        # Clear any items left by an interrupted earlier attempt before re-inserting
+        db['news_items'].delete_many({"run_id": run['_id']})
+        insert_run_news(db, run['_id'], run, run['verified_news'] or [])
+        tracking.update_one({"_id": run['_id']}, {"$unset": {"verified_news": ""}})
+        split += 1
+        if split % 100 == 0:
+            print(f"🔄 Split {split} runs...")
+
+    print(f"✅ Split verified news out of {split} tracking records")
+    return split
+
+
+def rebuild_stats(db) -> int:
+    """Recompute every company's statistics rollup from its tracking history"""
+    rebuilt = 0
+    for company_id in db['news_tracking'].distinct("company_id"):
+        if rebuild_company_stats(db['company_stats'], canonical_company_id(company_id), stats_history(db, company_id),
+                                 load_news=lambda run: load_run_news(db, run)):
+            rebuilt += 1
+
+    print(f"✅ Rebuilt statistics for {rebuilt} companies")
+    return rebuilt
+
+
+MIGRATIONS = {
+    "company-ids": migrate_company_ids,
+    "split-news": split_news,
+    "rebuild-stats": rebuild_stats,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("migration", choices=list(MIGRATIONS))
+    args = parser.parse_args()
+
+    load_dotenv()
+    mongo_uri = os.getenv("MONGODB_URI")
+    if not mongo_uri:
+        sys.exit("MONGODB_URI must be set")
+
+    MIGRATIONS[args.migration](get_database(mongo_uri))
@@ -0,0 +1,75 @@
+import re
+from typing import Dict, Any, List, Optional, Tuple
+
+# Line formats the discovery prompts ask the model for
+WEBSITE_PATTERN = re.compile(r'WEBSITE:\s*([^\s\n|]+)')
+SOCIAL_PATTERN = re.compile(r'SOCIAL:\s*([^|]+)')
+INVESTOR_PATTERN = re.compile(r'INVESTOR:\s*([^\s\n|]+)')
+URL_PATTERN = re.compile(r'https?://[^\s,\]]+')
+NEWS_LINE_PATTERN = re.compile(
+    r'NEWS:\s*([^|]+)\s*\|\s*SOURCE:\s*([^|]+)\s*\|\s*DATE:\s*([^|]+)\s*\|\s*SENTIMENT:\s*([^\n]+)',
+    re.IGNORECASE
+)
+_WORD_PATTERN = re.compile(r'[a-z0-9]+')
+
+# Headline words looked up in the source index, and the shortest word worth matching on
+HEADLINE_MATCH_WORDS = 4
+MIN_MATCH_WORD_LENGTH = 3
+
+
+def parse_web_presence(text: str) -> Dict[str, Any]:
+    """Official website, social profile URLs and investor relations page from a WEBSITE/SOCIAL/INVESTOR reply"""
+    website_match = WEBSITE_PATTERN.search(text)
+    social_match = SOCIAL_PATTERN.search(text)
+    investor_match = INVESTOR_PATTERN.search(text)
+    return {
+        "official_website": website_match.group(1).strip() if website_match else "",
+        "social_media": URL_PATTERN.findall(social_match.group(1))[:5] if social_match else [],
+        "investor_relations": investor_match.group(1).strip() if investor_match else ""
+    }
+
+
+def parse_news_lines(text: str) -> List[Tuple[str, str, str, str]]:
+    """(headline, source, date, sentiment) for every NEWS line in a reply"""
+    return [tuple(field.strip() for field in match) for match in NEWS_LINE_PATTERN.findall(text)]
+
+
+def grounding_web_chunks(response) -> List[Any]:
+    """Web chunks of the first candidate's grounding metadata"""
+    if not response.candidates:
+        return []
+    metadata = response.candidates[0].grounding_metadata
+    if not metadata:
+        return []
+    return [chunk.web for chunk in metadata.grounding_chunks or [] if chunk.web]
+
+
+def match_words(text: str) -> List[str]:
+    return [w for w in _WORD_PATTERN.findall(text.lower()) if len(w) >= MIN_MATCH_WORD_LENGTH]
+
+
+class SourceIndex:
+    """Inverted word index over grounding source titles.
+
+    Matching a headline looks up its first few words instead of scanning every
+    source title, so attaching sources stays linear as item counts grow.
+    """
+
+    def __init__(self):
+        self.sources: List[Dict[str, Any]] = []
+        self._postings: Dict[str, int] = {}
+
+    def add(self, source: Dict[str, Any]):
+        source_id = len(self.sources)
+        self.sources.append(source)
+        for word in match_words(source.get('title') or ''):
+            # Earliest source wins, as it did with the linear scan
+            self._postings.setdefault(word, source_id)
+
+    def match(self, headline: str) -> Optional[Dict[str, Any]]:
+        """Earliest source whose title shares one of the headline's leading words"""
+        ids = [self._postings[w] for w in match_words(headline)[:HEADLINE_MATCH_WORDS] if w in self._postings]
+        return self.sources[min(ids)] if ids else None
+
+    def __len__(self) -> int:
+        return len(self.sources)
@@ -0,0 +1,102 @@
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from pymongo import MongoClient, ASCENDING, DESCENDING
+
+DATABASE_NAME = 'test'
+
+
+def get_database(mongo_uri: str):
+    return MongoClient(mongo_uri)[DATABASE_NAME]
+
+
+# ==================== COMPANY IDS ====================
+# Companies are keyed by ObjectId in `companies`; every other collection stores the
+# company id in its canonical form, the 24-character lowercase hex string.
+
+def canonical_company_id(company_id: Any) -> str:
+    """Canonical company id; raises ValueError for anything that is not an ObjectId"""
+    if isinstance(company_id, ObjectId):
+        return str(company_id)
+    company_id = str(company_id or '').strip().lower()
+    if not ObjectId.is_valid(company_id):
+        raise ValueError(f"Invalid company ID: {company_id!r}")
+    return company_id
+
+
+def company_object_id(company_id: Any) -> ObjectId:
+    """`_id` of the company document in `companies`"""
+    return ObjectId(canonical_company_id(company_id))
+
+
+def tracking_filter(company_id: Any) -> Dict[str, Any]:
+    """news_tracking filter for one company; served by the (company_id, timestamp) index"""
+    return {"company_id": canonical_company_id(company_id)}
+
+
+# ==================== ANALYSIS RUNS ====================
+# An analysis run is a lightweight summary document in `news_tracking` (statistics,
+# timeline, graph data, websites) plus one document per verified item in `news_items`,
+# keyed by `run_id` and ordered by `position`. Runs written before the split still
+# embed their items in `verified_news` until `python migrate.py split-news` is run.
+
+def save_analysis_run(db, run_summary: Dict[str, Any], verified_news: List[Dict[str, Any]]):
+    """Insert a run summary and its verified items; returns the run id"""
+    run_id = db['news_tracking'].insert_one(run_summary).inserted_id
+    insert_run_news(db, run_id, run_summary, verified_news)
+    return run_id
+
+
+def insert_run_news(db, run_id, run_summary: Dict[str, Any], verified_news: List[Dict[str, Any]]):
+    if not verified_news:
+        return
+    db['news_items'].insert_many([
+        {
+            **{k: v for k, v in news.items() if k != '_id'},
+            "run_id": run_id,
+            "company_id": run_summary['company_id'],
+            "run_timestamp": run_summary['timestamp'],
+            "position": position
+        }
+        for position, news in enumerate(verified_news)
+    ])
+
+
+NEWS_ITEM_INTERNAL_FIELDS = {"_id": 0, "run_id": 0, "company_id": 0, "run_timestamp": 0, "position": 0}
+
+
+def stats_history(db, company_id: Any):
+    """A company's runs, newest first, with only the fields the statistics rollup needs"""
+    return db['news_tracking'].find(
+        tracking_filter(company_id),
+        {"timestamp": 1, "statistics": 1, "verified_news.source": 1, "verified_news.verification.verdict": 1}
+    ).sort("timestamp", DESCENDING)
+
+
+def load_run_news(db, run: Dict[str, Any], verdict: Optional[str] = None, limit: int = 0) -> List[Dict[str, Any]]:
+    """Verified items of one run in discovery order, optionally only those with `verdict`"""
+    if run.get('verified_news') is not None:
+        news = [n for n in run['verified_news'] if not verdict or n.get('verification', {}).get('verdict') == verdict]
+        return news[:limit] if limit else news
+
+    query = {"run_id": run['_id'] if isinstance(run['_id'], ObjectId) else ObjectId(run['_id'])}
+    if verdict:
+        query["verification.verdict"] = verdict
+    cursor = db['news_items'].find(query, NEWS_ITEM_INTERNAL_FIELDS).sort("position", ASCENDING)
+    return list(cursor.limit(limit) if limit else cursor)
+
+
+def ensure_indexes(db):
+    """Create the indexes the services' queries rely on (no-op when they already exist)"""
+    db['news_tracking'].create_index(
+        [("company_id", ASCENDING), ("timestamp", DESCENDING)],
+        name="company_id_timestamp"
+    )
+    db['news_items'].create_index(
+        [("run_id", ASCENDING), ("position", ASCENDING)],
+        name="run_id_position"
+    )
+    db['news_items'].create_index(
+        [("company_id", ASCENDING), ("run_timestamp", DESCENDING)],
+        name="company_id_run_timestamp"
+    )
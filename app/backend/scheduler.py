@@ -0,0 +1,277 @@
+import os
+import random
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+from pymongo import ASCENDING, DESCENDING
+from stats_store import tracking_timeline, trend_data
+from repository import tracking_filter
+
+MONITOR_ENABLED = os.getenv("MONITOR_ENABLED", "false").lower() == "true"
+# Refresh cadence: every company starts at the base interval and adapts within [min, max]
+MONITOR_BASE_INTERVAL_HOURS = float(os.getenv("MONITOR_BASE_INTERVAL_HOURS", "6"))
+MONITOR_MIN_INTERVAL_HOURS = float(os.getenv("MONITOR_MIN_INTERVAL_HOURS", "1"))
+MONITOR_MAX_INTERVAL_HOURS = float(os.getenv("MONITOR_MAX_INTERVAL_HOURS", "24"))
+# Each next run is moved by up to +/- this fraction of the interval so runs do not line up
+MONITOR_JITTER = float(os.getenv("MONITOR_JITTER", "0.1"))
+# Reliability score changes within this many points count as stable
+MONITOR_RELIABILITY_TOLERANCE = float(os.getenv("MONITOR_RELIABILITY_TOLERANCE", "2"))
+# Gemini calls scheduled analyses may spend per hour, across all companies and all processes
+MONITOR_CALLS_PER_HOUR = int(os.getenv("MONITOR_CALLS_PER_HOUR", "600"))
+MONITOR_TICK_SECONDS = float(os.getenv("MONITOR_TICK_SECONDS", "30"))
+MONITOR_SYNC_SECONDS = float(os.getenv("MONITOR_SYNC_SECONDS", "300"))
+
+# Reserved per run until runs report their real cost: discovery plus a full set of 30 verifications
+FULL_ANALYSIS_CALLS = 36
+
+# Schedule documents in the `monitor_schedule` collection, one per company:
+# {
+#     "_id": <company_id>, "interval_seconds": <float>, "next_run_at": <datetime>,
+#     "last_run_at": <datetime>, "last_job_id": <str>, "last_status": <str>, "trend": <str>
+# }
+#
+# The call budget is one document in `monitor_budget`, shared by every scheduler process:
+# {"_id": "gemini_calls", "tokens": <float>, "updated_at": <datetime>, "version": <int>}
+
+
+def next_interval(current: float, timeline: List[Dict[str, Any]]) -> Tuple[float, str]:
+    """Adapt a company's refresh interval to the trend of its two most recent runs"""
+    trend = "unknown"
+    if len(timeline) > 1:
+        latest, previous = timeline[0], timeline[1]
+        reliability_change = latest['reliability_score'] - previous['reliability_score']
+        if latest['fake'] > previous['fake'] or reliability_change < -MONITOR_RELIABILITY_TOLERANCE:
+            trend, current = "worsening", current / 2
+        elif latest['fake'] == previous['fake'] and abs(reliability_change) <= MONITOR_RELIABILITY_TOLERANCE:
+            trend, current = "stable", current * 1.5
+        else:
+            trend = trend_data(timeline)["reliability_trend"]
+
+    low, high = MONITOR_MIN_INTERVAL_HOURS * 3600, MONITOR_MAX_INTERVAL_HOURS * 3600
+    return min(high, max(low, current)), trend
+
+
+def jittered(seconds: float) -> float:
+    return seconds * random.uniform(1 - MONITOR_JITTER, 1 + MONITOR_JITTER)
+
+
+def stagger_offset(company_id: str, interval: float) -> float:
+    """Deterministic first-run offset that spreads companies evenly across one interval"""
+    return (int(company_id, 16) % 10007) / 10007 * interval
+
+
+class SharedBudget:
+    """Token bucket stored in MongoDB, so N scheduler processes spend one budget rather than N.
+
+    Same interface as gemini_client.TokenBucket. Every refill-and-take is a single update
+    conditional on the document's version, retried when another process got there first.
+    """
+
+    def __init__(self, collection, per_minute: float, capacity: float, key: str = "gemini_calls"):
+        self.collection = collection
+        self.key = key
+        self.capacity = float(capacity)
+        self.rate = per_minute / 60.0
+        # Keeps this process's waiters FIFO; other processes race on the version check
+        self._lock = asyncio.Lock()
+
+    def ensure_document(self):
+        self.collection.update_one(
+            {"_id": self.key},
+            {"$setOnInsert": {"tokens": self.capacity, "updated_at": datetime.utcnow(), "version": 0}},
+            upsert=True
+        )
+
+    def _refilled(self, bucket: Dict[str, Any], now: datetime) -> float:
+        elapsed = max(0.0, (now - bucket["updated_at"]).total_seconds())
+        return min(self.capacity, bucket["tokens"] + elapsed * self.rate)
+
+    def _take(self, amount: float, force: bool = False) -> float:
+        """Take `amount` tokens (going negative when `force`); returns the shortfall, 0 once taken"""
+        while True:
+            bucket = self.collection.find_one({"_id": self.key})
+            if bucket is None:
+                self.ensure_document()
+                continue
+            now = datetime.utcnow()
+            tokens = self._refilled(bucket, now)
+            if tokens < amount and not force:
+                return amount - tokens
+            taken = self.collection.update_one(
+                {"_id": self.key, "version": bucket["version"]},
+                {"$set": {"tokens": min(self.capacity, tokens - amount), "updated_at": now}, "$inc": {"version": 1}}
+            )
+            if taken.modified_count:
+                return 0.0
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """Wait until `amount` tokens are available and take them. Returns seconds waited."""
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        async with self._lock:
+            while True:
+                shortfall = self._take(amount)
+                if not shortfall:
+                    return waited
+                delay = shortfall / self.rate
+                await asyncio.sleep(delay)
+                waited += delay
+
+    def adjust(self, amount: float):
+        """Debit (or refund, if negative) tokens once the real cost is known"""
+        self._take(amount, force=True)
+
+    @property
+    def tokens(self) -> float:
+        bucket = self.collection.find_one({"_id": self.key})
+        return self._refilled(bucket, datetime.utcnow()) if bucket else self.capacity
+
+
+class MonitorScheduler:
+    """Periodically re-analyzes every company through the job queue within a global call budget"""
+
+    def __init__(self, db, job_queue, calls_per_hour: int = MONITOR_CALLS_PER_HOUR):
+        self.schedule = db['monitor_schedule']
+        self.companies = db['companies']
+        self.tracking = db['news_tracking']
+        self.job_queue = job_queue
+        # Refills at the hourly rate and holds at most one hour of budget, so spend is spread evenly
+        self.budget = SharedBudget(db['monitor_budget'], calls_per_hour / 60.0, capacity=calls_per_hour)
+        self.calls_per_hour = calls_per_hour
+        self.estimated_cost = float(FULL_ANALYSIS_CALLS)
+        self.dispatched = 0
+        self.completed = 0
+        self.budget_wait_seconds = 0.0
+        self._pending = set()
+        self._task = None
+        self._synced_at = None
+
+    def ensure_indexes(self):
+        self.schedule.create_index([("next_run_at", ASCENDING)], name="next_run_at")
+        self.budget.ensure_document()
+
+    # ==================== SCHEDULE ====================
+
+    def sync_companies(self) -> int:
+        """Give new companies a staggered first run and drop schedules of deleted companies"""
+        base = MONITOR_BASE_INTERVAL_HOURS * 3600
+        now = datetime.utcnow()
+        company_ids = {str(c['_id']) for c in self.companies.find({}, {"_id": 1})}
+        scheduled = set(self.schedule.distinct("_id"))
+
+        missing = company_ids - scheduled
+        if missing:
+            self.schedule.insert_many([
+                {
+                    "_id": company_id,
+                    "interval_seconds": base,
+                    "next_run_at": now + timedelta(seconds=stagger_offset(company_id, base))
+                }
+                for company_id in missing
+            ])
+        if scheduled - company_ids:
+            self.schedule.delete_many({"_id": {"$in": list(scheduled - company_ids)}})
+
+        self._synced_at = now
+        return len(missing)
+
+    def claim_due(self) -> Optional[Dict[str, Any]]:
+        """Atomically take the most overdue company, pushing its next run out by one interval"""
+        now = datetime.utcnow()
+        due = self.schedule.find_one({"next_run_at": {"$lte": now}}, sort=[("next_run_at", ASCENDING)])
+        if due is None:
+            return None
+        # Conditional on next_run_at so two scheduler processes never dispatch the same run
+        claimed = self.schedule.update_one(
+            {"_id": due["_id"], "next_run_at": due["next_run_at"]},
+            {"$set": {"next_run_at": now + timedelta(seconds=due["interval_seconds"])}}
+        )
+        return due if claimed.modified_count else None
+
+    def recent_timeline(self, company_id: str) -> List[Dict[str, Any]]:
+        history = self.tracking.find(
+            tracking_filter(company_id), {"timestamp": 1, "statistics": 1}
+        ).sort("timestamp", DESCENDING).limit(2)
+        return tracking_timeline(list(history))
+
+    # ==================== LOOP ====================
+
+    def start(self):
+        self.ensure_indexes()
+        self._task = asyncio.create_task(self.run())
+        print(f"⏰ Monitoring scheduler started ({self.calls_per_hour} Gemini calls/hour across all processes)")
+
+    async def stop(self):
+        for task in [self._task, *self._pending]:
+            if task is not None:
+                task.cancel()
+        await asyncio.gather(*[t for t in [self._task, *self._pending] if t is not None], return_exceptions=True)
+        self._task = None
+
+    async def run(self):
+        while True:
+            try:
+                if self._synced_at is None or (datetime.utcnow() - self._synced_at).total_seconds() >= MONITOR_SYNC_SECONDS:
+                    self.sync_companies()
+
+                # Reserve budget before claiming so a claimed company is never left waiting on it
+                reserved = self.estimated_cost
+                self.budget_wait_seconds += await self.budget.acquire(reserved)
+                due = self.claim_due()
+                if due is None:
+                    self.budget.adjust(-reserved)
+                    await asyncio.sleep(MONITOR_TICK_SECONDS)
+                    continue
+
+                job = self.job_queue.submit(due["_id"], {"incremental": True, "scheduled": True})
+                self.dispatched += 1
+                task = asyncio.create_task(self.complete(due, job["_id"], reserved))
+                self._pending.add(task)
+                task.add_done_callback(self._pending.discard)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Scheduler error: {e}")
+                await asyncio.sleep(MONITOR_TICK_SECONDS)
+
+    async def complete(self, due: Dict[str, Any], job_id, reserved: float):
+        """Settle the run's real cost against the budget and schedule the company's next run"""
+        job = await self.job_queue.wait(job_id)
+        status = job["status"] if job else "missing"
+
+        # The Gemini calls the run actually made, as counted by GeminiClient.track() in the job
+        usage = ((job.get("result") or job.get("progress")) if job else None) or {}
+        cost = usage.get("gemini_calls", reserved)
+        self.budget.adjust(cost - reserved)
+        # Moving average of real run cost drives the next reservation
+        self.estimated_cost = 0.8 * self.estimated_cost + 0.2 * cost
+
+        interval, trend = next_interval(due["interval_seconds"], self.recent_timeline(due["_id"]))
+        now = datetime.utcnow()
+        self.schedule.update_one(
+            {"_id": due["_id"]},
+            {"$set": {
+                "interval_seconds": interval,
+                "next_run_at": now + timedelta(seconds=jittered(interval)),
+                "last_run_at": now,
+                "last_job_id": str(job_id),
+                "last_status": status,
+                "trend": trend
+            }}
+        )
+        self.completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        now = datetime.utcnow()
+        return {
+            "enabled": self._task is not None,
+            "scheduled_companies": self.schedule.estimated_document_count(),
+            "due_now": self.schedule.count_documents({"next_run_at": {"$lte": now}}),
+            "in_flight": len(self._pending),
+            "dispatched": self.dispatched,
+            "completed": self.completed,
+            "calls_per_hour": self.calls_per_hour,
+            "budget_available": round(self.budget.tokens, 1),
+            "estimated_cost_per_run": round(self.estimated_cost, 1),
+            "budget_wait_seconds": round(self.budget_wait_seconds, 1)
+        }
@@ -0,0 +1,161 @@
+import os
+import json
+import asyncio
+from typing import Dict, Any, List, Optional, Literal
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+# Cheap model that re-shapes grounded free text into the verification schema
+FORMATTER_MODEL = os.getenv("FORMATTER_MODEL", "gemini-2.5-flash-lite")
+# Budget for that extra call; past it the reply counts as a parse failure
+FORMATTER_TIMEOUT_SECONDS = float(os.getenv("FORMATTER_TIMEOUT_SECONDS", "10"))
+
+
+class VerificationResult(BaseModel):
+    """Verdict returned by every fact-checking path (check agent, news verifier, batches)"""
+    verdict: Literal["REAL", "FAKE", "UNCERTAIN"]
+    confidence: float = Field(ge=0.0, le=1.0)
+    bias: Literal["low", "medium", "high"] = "medium"
+    impact: Literal["low", "medium", "high"] = "medium"
+    explanation: str = ""
+
+    @field_validator("verdict", mode="before")
+    @classmethod
+    def upper_verdict(cls, value):
+        return value.strip().upper() if isinstance(value, str) else value
+
+    @field_validator("bias", "impact", mode="before")
+    @classmethod
+    def lower_level(cls, value):
+        return value.strip().lower() if isinstance(value, str) else value
+
+
+class BatchVerificationResult(VerificationResult):
+    index: int = Field(description="Number of the claim being answered")
+
+
+# response_schema dicts in the same form as the agents' other schemas
+VERIFICATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "verdict": {"type": "string", "enum": ["REAL", "FAKE", "UNCERTAIN"]},
+        "confidence": {"type": "number", "description": "0.0-1.0"},
+        "bias": {"type": "string", "enum": ["low", "medium", "high"]},
+        "impact": {"type": "string", "enum": ["low", "medium", "high"]},
+        "explanation": {"type": "string", "description": "Two or three sentences of evidence."}
+    },
+    "required": ["verdict", "confidence", "explanation"]
+}
+
+BATCH_VERIFICATION_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {"index": {"type": "integer", "description": "Number of the claim being answered"},
+                       **VERIFICATION_SCHEMA["properties"]},
+        "required": ["index", *VERIFICATION_SCHEMA["required"]]
+    }
+}
+
+
+def json_payload(text: str) -> str:
+    """The JSON object or array inside a reply, without markdown fences or surrounding prose"""
+    text = (text or "").strip()
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if not starts:
+        return ""
+    start = min(starts)
+    end = text.rfind("}" if text[start] == "{" else "]")
+    return text[start:end + 1] if end > start else ""
+
+
+class StructuredParser:
+    """Turns grounded replies into validated results, falling back to a schema-constrained formatter.
+
+    Search grounding cannot be combined with response_schema on Gemini 2.5, so grounded calls
+    ask for JSON in the prompt. Replies that fail validation get one cheap formatter call
+    with response_schema and no tools; only if that also fails is the result counted as a
+    parse failure.
+    """
+
+    def __init__(self, gemini, formatter_model: str = FORMATTER_MODEL,
+                 timeout: float = FORMATTER_TIMEOUT_SECONDS):
+        self.gemini = gemini
+        self.formatter_model = formatter_model
+        self.timeout = timeout
+        self.direct = 0
+        self.formatted = 0
+        self.failures = 0
+
+    async def format(self, text: str, schema: Dict[str, Any]) -> str:
+        response = await asyncio.wait_for(self.gemini.generate_content(
+            model=self.formatter_model,
+            contents=f"Convert this fact-check into JSON matching the schema. Do not change the findings.\n\n{text}",
+            config={
+                "response_mime_type": "application/json",
+                "response_schema": schema,
+                "temperature": 0.0
+            }
+        ), self.timeout)
+        return response.text or ""
+
+    async def verification(self, text: str) -> Optional[VerificationResult]:
+        """Validated result for a single-claim reply, or None when even the formatter failed"""
+        try:
+            result = VerificationResult.model_validate_json(json_payload(text))
+            self.direct += 1
+            return result
+        except ValidationError:
+            pass
+
+        if text and text.strip():
+            try:
+                result = VerificationResult.model_validate_json(await self.format(text, VERIFICATION_SCHEMA))
+                self.formatted += 1
+                return result
+            except Exception as e:
+                print(f"Formatter error: {str(e) or type(e).__name__}")
+        self.failures += 1
+        return None
+
+    async def batch(self, text: str, count: int) -> List[Optional[VerificationResult]]:
+        """Per-claim results for a batch reply; entries that are missing or invalid come back as None"""
+        entries = batch_entries(json_payload(text))
+        if entries is None and text and text.strip():
+            try:
+                entries = batch_entries(await self.format(text, BATCH_VERIFICATION_SCHEMA))
+                if entries is not None:
+                    self.formatted += 1
+            except Exception as e:
+                print(f"Formatter error: {str(e) or type(e).__name__}")
+        elif entries is not None:
+            self.direct += 1
+        if entries is None:
+            self.failures += 1
+            return [None] * count
+
+        results: List[Optional[VerificationResult]] = [None] * count
+        for entry in entries:
+            try:
+                result = BatchVerificationResult.model_validate(entry)
+            except ValidationError:
+                continue
+            if 1 <= result.index <= count:
+                results[result.index - 1] = result
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        parsed = self.direct + self.formatted + self.failures
+        return {
+            "direct": self.direct,
+            "formatted": self.formatted,
+            "failures": self.failures,
+            "failure_rate": round(self.failures / parsed, 3) if parsed else 0.0
+        }
+
+
+def batch_entries(payload: str) -> Optional[List[Any]]:
+    try:
+        entries = json.loads(payload)
+    except ValueError:
+        return None
+    return entries if isinstance(entries, list) else None
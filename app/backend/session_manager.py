@@ -0,0 +1,208 @@
+import os
+import asyncio
+import itertools
+import contextlib
+from collections import deque
+from typing import Dict, Any, Optional
+from live_session import LiveSession, LatencyHistogram
+
+# Concurrent voice sessions one worker relays; stays below LIVE_MAX_UPSTREAM_CONNECTIONS to leave room for warm connections
+LIVE_MAX_SESSIONS = int(os.getenv("LIVE_MAX_SESSIONS", "16"))
+# Sessions waiting for a free slot beyond the cap, and how long each may wait (0 rejects at the cap)
+LIVE_SESSION_QUEUE_SIZE = int(os.getenv("LIVE_SESSION_QUEUE_SIZE", "8"))
+LIVE_SESSION_QUEUE_SECONDS = float(os.getenv("LIVE_SESSION_QUEUE_SECONDS", "15"))
+# A session is shed after this long without transcripts, agent audio or tool calls...
+LIVE_SESSION_IDLE_SECONDS = float(os.getenv("LIVE_SESSION_IDLE_SECONDS", "300"))
+# ...or this long without any microphone audio from the client
+LIVE_CLIENT_TIMEOUT_SECONDS = float(os.getenv("LIVE_CLIENT_TIMEOUT_SECONDS", "30"))
+LIVE_SESSION_SWEEP_SECONDS = float(os.getenv("LIVE_SESSION_SWEEP_SECONDS", "5"))
+
+# WebSocket close code for "Try Again Later"
+TRY_AGAIN_LATER = 1013
+
+
+class SessionCapacityError(Exception):
+    """The worker is at its session cap and the wait queue is full or timed out"""
+
+
+class ClientDisconnected(Exception):
+    """The client went away while waiting in the queue"""
+
+
+async def wait_for_disconnect(websocket):
+    """Discard what a queued client sends until it disconnects"""
+    try:
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    except Exception:
+        pass
+
+
+class ManagedSession:
+    def __init__(self, session_id: int, client: str, queued_ms: float, admitted_at: float):
+        self.id = session_id
+        self.client = client
+        self.queued_ms = queued_ms
+        self.admitted_at = admitted_at
+        self.session: Optional[LiveSession] = None
+
+    def attach(self, session: LiveSession):
+        self.session = session
+
+    def info(self, now: float) -> Dict[str, Any]:
+        info = {"id": self.id, "client": self.client, "queued_ms": round(self.queued_ms, 1),
+                "age_seconds": round(now - self.admitted_at, 1)}
+        if self.session is not None and self.session.started_at is not None:
+            stats = self.session.stats()
+            info.update({
+                "binary": stats["binary"],
+                "client_frames_per_second": stats["upstream"]["client_frames_per_second"],
+                "upstream_messages_per_second": stats["upstream"]["messages_per_second"],
+                "downstream_messages_per_second": stats["downstream"]["messages_per_second"],
+                "tool_calls_in_flight": stats["tools"]["in_flight"],
+                "idle_seconds": round(now - self.session.last_turn_at, 1)
+            })
+        return info
+
+
+class SessionManager:
+    """Admission control and housekeeping for the voice sessions of one worker.
+
+    Sessions beyond `max_sessions` wait in a bounded FIFO queue and are told their
+    position; once the queue is full or the wait times out they are rejected, and
+    a client that disconnects while queued gives up its place at once. A periodic sweep closes sessions that stopped sending audio or have had no
+    conversational activity for too long.
+    """
+
+    def __init__(self, max_sessions: int = LIVE_MAX_SESSIONS, queue_size: int = LIVE_SESSION_QUEUE_SIZE,
+                 queue_timeout: float = LIVE_SESSION_QUEUE_SECONDS, idle_seconds: float = LIVE_SESSION_IDLE_SECONDS,
+                 client_timeout: float = LIVE_CLIENT_TIMEOUT_SECONDS):
+        self.max_sessions = max_sessions
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.idle_seconds = idle_seconds
+        self.client_timeout = client_timeout
+        self.sessions: Dict[int, ManagedSession] = {}
+        self._slots = 0
+        self._waiters: deque = deque()
+        self._ids = itertools.count(1)
+        self._task = None
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+        self.abandoned = 0
+        self.shed = 0
+        self.queue_wait = LatencyHistogram()
+
+    # ==================== ADMISSION ====================
+
+    async def admit(self, websocket) -> float:
+        """Take a session slot, queueing if the worker is full; returns the seconds spent queued"""
+        if self._slots < self.max_sessions and not self._waiters:
+            self._slots += 1
+            return 0.0
+        if len(self._waiters) >= self.queue_size:
+            self.rejected += 1
+            raise SessionCapacityError(f"Voice capacity reached ({self.max_sessions} sessions)")
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        gone = asyncio.create_task(wait_for_disconnect(websocket))
+        try:
+            await websocket.send_json({"type": "queued", "position": len(self._waiters)})
+            await asyncio.wait({waiter, gone}, timeout=self.queue_timeout, return_when=asyncio.FIRST_COMPLETED)
+            if gone.done():
+                self.abandoned += 1
+                raise ClientDisconnected("Client disconnected while queued")
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # A slot was handed over just as this client went away
+                self.release()
+            raise
+        finally:
+            gone.cancel()
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if not waiter.done():
+                waiter.cancel()
+        if waiter.cancelled():
+            self.rejected += 1
+            raise SessionCapacityError(f"Voice capacity reached; no slot freed up within {self.queue_timeout:g}s")
+        return loop.time() - started
+
+    def release(self):
+        """Hand the slot to the longest-waiting session, or free it"""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._slots -= 1
+
+    @contextlib.asynccontextmanager
+    async def slot(self, websocket, client: str = ""):
+        queued = await self.admit(websocket)
+        self.admitted += 1
+        if queued:
+            self.queue_wait.observe(queued * 1000)
+        managed = ManagedSession(next(self._ids), client, queued * 1000, asyncio.get_running_loop().time())
+        self.sessions[managed.id] = managed
+        try:
+            yield managed
+        finally:
+            del self.sessions[managed.id]
+            self.release()
+
+    # ==================== IDLE SHEDDING ====================
+
+    def sweep(self) -> int:
+        """Close sessions whose client went silent or whose conversation went idle"""
+        now = asyncio.get_running_loop().time()
+        shed = 0
+        for managed in list(self.sessions.values()):
+            session = managed.session
+            if session is None or session.started_at is None or session.closed_reason:
+                continue
+            if now - session.last_client_frame_at > self.client_timeout:
+                session.close(f"No audio from the client for {self.client_timeout:g}s")
+            elif now - session.last_turn_at > self.idle_seconds:
+                session.close(f"Voice session idle for {self.idle_seconds:g}s")
+            else:
+                continue
+            print(f"💤 Shedding voice session {managed.id}: {session.closed_reason}")
+            shed += 1
+        self.shed += shed
+        return shed
+
+    def start(self):
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(LIVE_SESSION_SWEEP_SECONDS)
+            self.sweep()
+
+    def stats(self) -> Dict[str, Any]:
+        now = asyncio.get_running_loop().time()
+        return {
+            "max_sessions": self.max_sessions,
+            "active": len(self.sessions),
+            "queued_now": len(self._waiters),
+            "queue_size": self.queue_size,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "abandoned": self.abandoned,
+            "shed": self.shed,
+            "queue_wait": self.queue_wait.snapshot(),
+            "sessions": [managed.info(now) for managed in self.sessions.values()]
+        }
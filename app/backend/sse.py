@@ -0,0 +1,8 @@
+import json
+from typing import Dict, Any
+
+
+def sse_event(event: Dict[str, Any]) -> str:
+    """Server-Sent Events frame; the event name comes from the payload's `event` key"""
+    data = json.dumps({k: v for k, v in event.items() if k != "event"}, default=str)
+    return f"event: {event['event']}\ndata: {data}\n\n"
@@ -0,0 +1,175 @@
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Callable, Iterable
+from pymongo.errors import DuplicateKeyError
+
+# Per-company rollup documents in the `company_stats` collection:
+# {
+#     "_id": <company_id>,
+#     "total_analyses": <int>,                      # maintained with $inc
+#     "lifetime": {"total_news", "real_count", "fake_count", "uncertain_count"},  # $inc
+#     "latest": {<counts and source breakdown of the most recent analysis>},      # $set
+#     "updated_at": <datetime>
+# }
+# A rollup is created only by backfilling the company's full history; later runs are
+# $inc-ed in only while they are newer than `latest.timestamp`, so no run counts twice.
+
+VERDICT_FIELDS = {"REAL": "real_count", "FAKE": "fake_count", "UNCERTAIN": "uncertain_count"}
+
+
+def summarize_verified_news(verified_news: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Verdict counts and per-source verdict breakdown for one analysis run"""
+    counts = {"total_news": len(verified_news), "real_count": 0, "fake_count": 0, "uncertain_count": 0}
+    sources = {}
+
+    for news in verified_news:
+        verdict = news.get('verification', {}).get('verdict', 'UNCERTAIN')
+        if verdict in VERDICT_FIELDS:
+            counts[VERDICT_FIELDS[verdict]] += 1
+
+        source = news.get('source') or news.get('news_source', 'Unknown')
+        if source not in sources:
+            sources[source] = {'real': 0, 'fake': 0, 'uncertain': 0, 'total': 0}
+        sources[source][verdict.lower()] = sources[source].get(verdict.lower(), 0) + 1
+        sources[source]['total'] += 1
+
+    # Source names may contain '.' or '$', so they are stored as values rather than field names
+    counts["sources_breakdown"] = [{"source": name, **tally} for name, tally in sources.items()]
+    return counts
+
+
+def record_analysis(stats_collection, company_id: str, tracking_id, timestamp: datetime,
+                    verified_news: List[Dict[str, Any]], statistics: Dict[str, Any],
+                    history: Callable[[], Iterable[Dict[str, Any]]], load_news: Optional[Callable] = None):
+    """Fold a finished analysis, already saved to the history, into the company's rollup.
+
+    Without a rollup the company's `history()` (which includes this run) is backfilled
+    instead of creating a rollup that counts this run alone.
+    """
+    summary = summarize_verified_news(verified_news)
+    update = {
+        "$inc": {
+            "total_analyses": 1,
+            "lifetime.total_news": summary["total_news"],
+            "lifetime.real_count": summary["real_count"],
+            "lifetime.fake_count": summary["fake_count"],
+            "lifetime.uncertain_count": summary["uncertain_count"]
+        },
+        "$set": {
+            "latest": {
+                **summary,
+                "tracking_id": tracking_id,
+                "timestamp": timestamp,
+                "avg_confidence": statistics.get("avg_confidence", 0),
+                "reliability_score": statistics.get("reliability_score", 0)
+            },
+            "updated_at": datetime.utcnow()
+        }
+    }
+    for attempt in range(2):
+        if stats_collection.update_one({"_id": company_id, "latest.timestamp": {"$lt": timestamp}}, update).matched_count:
+            return
+        if stats_collection.count_documents({"_id": company_id}, limit=1):
+            # The rollup was built from history after this run was saved, so it already counts it
+            return
+        if attempt == 0:
+            print(f"📊 No rollup for company {company_id}, backfilling from history")
+            rebuild_company_stats(stats_collection, company_id, history(), load_news, replace=False)
+
+
+def summarize_run(record: Dict[str, Any], load_news: Optional[Callable] = None) -> Dict[str, Any]:
+    """Summary of a tracking record, from embedded items, loaded items or its stored statistics"""
+    if record.get('verified_news') is not None:
+        return summarize_verified_news(record['verified_news'])
+    if load_news is not None:
+        return summarize_verified_news(load_news(record))
+    statistics = record.get('statistics', {})
+    return {
+        **{field: statistics.get(field, 0) for field in ("total_news", "real_count", "fake_count", "uncertain_count")},
+        "sources_breakdown": []
+    }
+
+
+def rebuild_company_stats(stats_collection, company_id: str, tracking_records,
+                          load_news: Optional[Callable] = None, replace: bool = True) -> Optional[Dict[str, Any]]:
+    """Backfill the rollup for a company by streaming its history (newest record first).
+
+    `load_news(record)` fetches the items of a split-layout run; it is only called for
+    the latest run, whose per-source breakdown is kept in the rollup. With `replace=False`
+    an existing rollup wins over the rebuilt one, so concurrent backfills of a company
+    that has none settle on a single rollup.
+    """
+    lifetime = {"total_news": 0, "real_count": 0, "fake_count": 0, "uncertain_count": 0}
+    total_analyses = 0
+    latest = None
+
+    for record in tracking_records:
+        summary = summarize_run(record, load_news if latest is None else None)
+        for field in lifetime:
+            lifetime[field] += summary[field]
+        if latest is None:
+            statistics = record.get('statistics', {})
+            latest = {
+                **summary,
+                "tracking_id": record.get('_id'),
+                "timestamp": record.get('timestamp'),
+                "avg_confidence": statistics.get("avg_confidence", 0),
+                "reliability_score": statistics.get("reliability_score", 0)
+            }
+        total_analyses += 1
+
+    if latest is None:
+        return None
+
+    rollup = {
+        "total_analyses": total_analyses,
+        "lifetime": lifetime,
+        "latest": latest,
+        "updated_at": datetime.utcnow()
+    }
+    if replace:
+        stats_collection.replace_one({"_id": company_id}, rollup, upsert=True)
+    else:
+        try:
+            stats_collection.insert_one({"_id": company_id, **rollup})
+        except DuplicateKeyError:
+            return stats_collection.find_one({"_id": company_id})
+    return {"_id": company_id, **rollup}
+
+
+def get_company_stats(stats_collection, company_id: str) -> Optional[Dict[str, Any]]:
+    return stats_collection.find_one({"_id": company_id})
+
+
+def sources_breakdown_dict(latest: Dict[str, Any]) -> Dict[str, Dict[str, int]]:
+    """Stored source breakdown list back in the {source: {real, fake, uncertain, total}} shape"""
+    return {
+        entry["source"]: {k: v for k, v in entry.items() if k != "source"}
+        for entry in latest.get("sources_breakdown", [])
+    }
+
+
+# ==================== TRENDS ====================
+
+def tracking_timeline(tracking_history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Per-run statistics of a company's tracking history (newest first) for charts and trends"""
+    timeline = []
+    for entry in tracking_history:
+        timeline.append({
+            "timestamp": entry['timestamp'].isoformat(),
+            "date": entry['timestamp'].strftime("%Y-%m-%d"),
+            "total_news": entry['statistics']['total_news'],
+            "real": entry['statistics']['real_count'],
+            "fake": entry['statistics']['fake_count'],
+            "uncertain": entry['statistics']['uncertain_count'],
+            "reliability_score": entry['statistics'].get('reliability_score', 0)
+        })
+    return timeline
+
+
+def trend_data(timeline: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Direction of the latest run against the one before it"""
+    return {
+        "reliability_trend": "improving" if len(timeline) > 1 and timeline[0]['reliability_score'] > timeline[1]['reliability_score'] else "stable",
+        "news_volume_trend": "increasing" if len(timeline) > 1 and timeline[0]['total_news'] > timeline[1]['total_news'] else "stable",
+        "fake_news_trend": "decreasing" if len(timeline) > 1 and timeline[0]['fake'] < timeline[1]['fake'] else "stable"
+    }
@@ -0,0 +1,105 @@
+import os
+
+import pytest
+
+from claim_index import ClaimIndex, calibrate_threshold, claim_polarity, claim_tokens
+from claim_pairs import LABELLED_CLAIM_PAIRS
+
+VERDICT = {"verdict": "FAKE"}
+
+
+@pytest.fixture
+def index():
+    return ClaimIndex()
+
+
+def test_reworded_claim_reuses_verdict(index):
+    index.add("Sachin Tendulkar died yesterday", VERDICT)
+
+    assert index.lookup("Sachin Tendulkar dies yesterday") == ("Sachin Tendulkar died yesterday", VERDICT)
+    assert index.lookup("Sachin Tendulkar dead yesterday") is not None
+
+
+@pytest.mark.parametrize("stored, query", [
+    ("Did Sachin Tendulkar die yesterday?", "Sachin Tendulkar dead"),
+    ("Sachin Tendulkar died yesterday", "Sachin Tendulkar dead"),
+    ("Is it true that 5G spreads coronavirus?", "5G spreads coronavirus"),
+])
+def test_questions_and_short_forms_reuse_the_verdict(index, stored, query):
+    index.add(stored, VERDICT)
+
+    assert index.lookup(query) == (stored, VERDICT)
+
+
+@pytest.mark.parametrize("stored, query", [
+    ("Sachin Tendulkar died yesterday", "Sachin Tendulkar did not die yesterday"),
+    ("Sachin Tendulkar died yesterday", "Sachin Tendulkar didn't die yesterday"),
+    ("Sachin Tendulkar is dead", "Sachin Tendulkar is alive"),
+    ("NASA confirms water on Mars", "NASA denies water on Mars"),
+])
+def test_negated_claim_never_matches(index, stored, query):
+    index.add(stored, VERDICT)
+
+    assert index.lookup(query) is None
+    assert index.search(query) == []
+
+
+@pytest.mark.parametrize("stored, query", [
+    ("Apple stock falls 5%", "Apple stock rises 5%"),
+    ("RBI raises repo rate by 25 basis points", "RBI lowers repo rate by 25 basis points"),
+])
+def test_reversed_direction_never_matches(index, stored, query):
+    index.add(stored, VERDICT)
+
+    assert index.lookup(query) is None
+
+
+def test_double_negation_keeps_polarity():
+    assert claim_polarity("It is not true that vaccines do not work") == claim_polarity("vaccines work")
+    assert claim_polarity("Apple stock falls")[1] == ("down",)
+
+
+def test_negation_words_are_tokens():
+    assert "not" in claim_tokens("Sachin Tendulkar did not die")
+    assert claim_tokens("Apple stock jumps") == claim_tokens("Apple stock rises")
+
+
+def test_scope_keeps_companies_apart(index):
+    index.add("Quarterly revenue beats estimates", VERDICT, scope="apple")
+
+    assert index.lookup("Quarterly revenue beats estimates", scope="google") is None
+    assert index.lookup("Quarterly revenue beats estimates", scope="apple") is not None
+
+
+def test_expired_claims_are_skipped():
+    index = ClaimIndex(max_age_seconds=60)
+    index.add("The Eiffel Tower will be demolished", VERDICT, added_at=1.0)
+
+    assert index.lookup("The Eiffel Tower will be demolished") is None
+
+
+def test_compaction_keeps_newest_half_and_scopes():
+    index = ClaimIndex(max_entries=4)
+    for n in range(4):
+        index.add(f"claim number {n} about launch", {"n": n}, scope="acme")
+    index.add("claim number 4 about launch", {"n": 4}, scope="acme")
+
+    assert len(index) == 3
+    assert index.lookup("claim number 0 about launch", scope="acme") is None
+    assert index.lookup("claim number 3 about launch", scope="acme") == ("claim number 3 about launch", {"n": 3})
+
+
+def test_readding_a_claim_replaces_its_payload(index):
+    index.add("India bans TikTok", {"verdict": "REAL"})
+    index.add("india bans tiktok!", {"verdict": "FAKE"})
+
+    assert len(index) == 1
+    assert index.lookup("India bans TikTok")[1] == {"verdict": "FAKE"}
+
+
+@pytest.mark.skipif("CLAIM_INDEX_THRESHOLD" in os.environ, reason="threshold overridden by the environment")
+def test_default_threshold_is_calibrated_on_labelled_pairs(index):
+    best = calibrate_threshold(LABELLED_CLAIM_PAIRS, index)
+
+    assert best["threshold"] == index.threshold
+    assert best["false_matches"] == 0
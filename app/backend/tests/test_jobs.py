@@ -0,0 +1,141 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import mongomock
+import pytest
+
+import jobs
+from jobs import JobQueue
+
+COMPANY = "6ad53091075bc3a4bfcd4d01"
+
+
+@pytest.fixture
+def collection():
+    return mongomock.MongoClient().db.analysis_jobs
+
+
+def make_queue(collection, handler=None):
+    async def succeed(job, report):
+        report({"stage": "done"})
+        return {"success": True}
+
+    queue = JobQueue(collection, handler or succeed, workers=1)
+    queue.ensure_indexes()
+    return queue
+
+
+def test_submit_deduplicates_active_jobs_per_company(collection):
+    queue = make_queue(collection)
+    first = queue.submit(COMPANY)
+    second = queue.submit(COMPANY)
+    other = queue.submit("6ad53091075bc3a4bfcd4d02")
+
+    assert not first["deduplicated"] and second["deduplicated"]
+    assert second["_id"] == first["_id"]
+    assert other["_id"] != first["_id"]
+
+
+def test_claim_takes_the_oldest_queued_job(collection):
+    queue = make_queue(collection)
+    older = queue.submit(COMPANY)
+    queue.submit("6ad53091075bc3a4bfcd4d02")
+
+    claimed = queue.claim()
+    assert claimed["_id"] == older["_id"]
+    assert claimed["status"] == "running" and claimed["worker"] == queue.worker_id
+    assert queue.claim()["_id"] != older["_id"]
+    assert queue.claim() is None
+
+
+def test_run_records_result_and_frees_the_company(collection):
+    queue = make_queue(collection)
+    job = queue.submit(COMPANY)
+    asyncio.run(queue.run(queue.claim()))
+
+    stored = queue.get(str(job["_id"]))
+    assert stored["status"] == "succeeded"
+    assert stored["result"] == {"success": True}
+    assert stored["progress"] == {"stage": "done"}
+    assert "active" not in stored
+    assert not queue.submit(COMPANY)["deduplicated"]
+
+
+def test_failed_handler_marks_the_job_failed(collection):
+    async def fail(job, report):
+        raise RuntimeError("discovery timed out")
+
+    queue = make_queue(collection, fail)
+    job = queue.submit(COMPANY)
+    asyncio.run(queue.run(queue.claim()))
+
+    stored = queue.get(str(job["_id"]))
+    assert stored["status"] == "failed"
+    assert stored["error"] == "discovery timed out"
+
+
+def test_requeue_stale_returns_abandoned_running_jobs(collection):
+    queue = make_queue(collection)
+    stale = queue.submit(COMPANY)
+    fresh = queue.submit("6ad53091075bc3a4bfcd4d02")
+    queue.claim()
+    queue.claim()
+    collection.update_one({"_id": stale["_id"]}, {"$set": {"heartbeat_at": datetime.utcnow() - timedelta(hours=1)}})
+
+    assert queue.requeue_stale() == 1
+    assert queue.get(str(stale["_id"]))["status"] == "queued"
+    assert queue.get(str(fresh["_id"]))["status"] == "running"
+
+
+def test_claim_takes_over_stale_jobs_once_per_stale_interval(collection, monkeypatch):
+    crashed, survivor = make_queue(collection), make_queue(collection)
+    crashed.worker_id = "crashed:1"
+    clock = [1000.0]
+    monkeypatch.setattr(jobs.time, "monotonic", lambda: clock[0])
+    assert survivor.claim() is None
+
+    job = crashed.submit(COMPANY)
+    crashed.claim()
+    collection.update_one({"_id": job["_id"]}, {"$set": {"heartbeat_at": datetime.utcnow() - timedelta(hours=1)}})
+    assert survivor.claim() is None
+
+    clock[0] += jobs.JOB_STALE_SECONDS
+    claimed = survivor.claim()
+    assert claimed["_id"] == job["_id"] and claimed["worker"] == survivor.worker_id
+
+
+def test_every_concurrent_waiter_wakes_when_the_job_finishes(collection, monkeypatch):
+    # Polling is slowed down so only the completion event can wake the waiters in time
+    monkeypatch.setattr(jobs, "JOB_POLL_SECONDS", 30)
+
+    async def slow(job, report):
+        await asyncio.sleep(0.05)
+        return {"success": True}
+
+    queue = make_queue(collection, slow)
+
+    async def run():
+        job = queue.submit(COMPANY)
+        waiters = [asyncio.create_task(queue.wait(job["_id"])) for _ in range(3)]
+        await asyncio.sleep(0)
+        await queue.run(queue.claim())
+        return await asyncio.wait_for(asyncio.gather(*waiters), 1)
+
+    assert [job["status"] for job in asyncio.run(run())] == ["succeeded"] * 3
+    assert queue._finished == {} and queue._waiters == {}
+
+
+def test_wait_returns_the_unfinished_job_on_timeout(collection):
+    queue = make_queue(collection)
+
+    async def run():
+        job = queue.submit(COMPANY)
+        return await queue.wait(job["_id"], timeout=0.01)
+
+    assert asyncio.run(run())["status"] == "queued"
+    assert queue._finished == {}
+
+
+def test_wait_for_a_missing_job_returns_none(collection):
+    queue = make_queue(collection)
+    assert asyncio.run(queue.wait("6ad53091075bc3a4bfcd4dff")) is None
@@ -0,0 +1,140 @@
+import asyncio
+import json
+
+import pytest
+
+from live_pool import LivePool, LivePoolFull
+
+SETUP = {"setup": {"model": "models/test"}}
+
+
+class FakeLiveSocket:
+    """Gemini Live stand-in that completes the setup handshake"""
+
+    def __init__(self):
+        self.sent = []
+        self.close_code = None
+        self.pings = 0
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+    async def recv(self):
+        return json.dumps({"setupComplete": {}})
+
+    async def ping(self):
+        self.pings += 1
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(None)
+        return future
+
+    async def close(self):
+        self.close_code = 1000
+
+
+class FakeConnector:
+    def __init__(self):
+        self.opened = []
+
+    async def __call__(self, url):
+        ws = FakeLiveSocket()
+        self.opened.append(ws)
+        return ws
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_connections_are_set_up_before_use():
+    connect = FakeConnector()
+
+    async def run():
+        pool = LivePool("wss://live", SETUP, size=0, connect=connect)
+        return pool, await pool.acquire()
+
+    pool, ws = asyncio.run(run())
+    assert ws.sent == [SETUP]
+    assert (pool.misses, pool.hits, pool.opened) == (1, 0, 1)
+
+
+def test_acquire_takes_a_warm_connection_and_refills():
+    connect = FakeConnector()
+
+    async def run():
+        pool = LivePool("wss://live", SETUP, size=2, connect=connect)
+        pool.start()
+        await settle()
+        assert pool.stats()["warm"] == 2
+        ws = await pool.acquire()
+        await settle()
+        stats = pool.stats()
+        await pool.release(ws)
+        await settle()
+        await pool.stop()
+        return ws, stats, pool
+
+    ws, stats, pool = asyncio.run(run())
+    assert ws is connect.opened[0]
+    assert (stats["hits"], stats["in_use"], stats["warm"]) == (1, 1, 2)
+    assert ws.close_code == 1000  # single use: closed on release
+    assert pool.stats()["in_use"] == 0
+    assert all(ws.close_code is not None for ws in connect.opened)
+
+
+def test_expired_and_closed_warm_connections_are_recycled():
+    connect = FakeConnector()
+
+    async def run():
+        pool = LivePool("wss://live", SETUP, size=2, max_age=0.05, connect=connect)
+        pool.start()
+        await settle()
+        # Stop the background loop so neither a health check nor a refill interferes
+        pool._task.cancel()
+        pool._task = None
+        pool._idle[0].ws.close_code = 1006
+        await asyncio.sleep(0.06)
+        ws = await pool.acquire()
+        await pool.stop()
+        return pool, ws
+
+    pool, ws = asyncio.run(run())
+    assert pool.recycled == 2
+    assert pool.misses == 1 and pool.hits == 0
+    assert ws is connect.opened[-1]
+
+
+def test_health_check_drops_expired_connections():
+    connect = FakeConnector()
+
+    async def run():
+        pool = LivePool("wss://live", SETUP, size=1, max_age=60, connect=connect)
+        pool.start()
+        await settle()
+        await pool.check()
+        healthy = pool.stats()["warm"]
+        pool._idle[0].opened_at -= 120
+        await pool.check()
+        await settle()
+        stats = pool.stats()
+        await pool.stop()
+        return healthy, stats
+
+    healthy, stats = asyncio.run(run())
+    assert connect.opened[0].pings == 1
+    assert healthy == 1
+    assert stats["recycled"] == 1
+
+
+def test_worker_connection_cap():
+    connect = FakeConnector()
+
+    async def run():
+        pool = LivePool("wss://live", SETUP, size=0, max_connections=1, connect=connect)
+        async with pool.connection():
+            with pytest.raises(LivePoolFull):
+                await pool.acquire()
+        return await pool.acquire()
+
+    assert asyncio.run(run()) is connect.opened[-1]
@@ -0,0 +1,53 @@
+import asyncio
+
+import mongomock
+import pytest
+
+from scheduler import SharedBudget
+
+
+@pytest.fixture
+def collection():
+    return mongomock.MongoClient().db.monitor_budget
+
+
+def test_processes_draw_on_one_shared_budget(collection):
+    first = SharedBudget(collection, per_minute=0.001, capacity=60)
+    second = SharedBudget(collection, per_minute=0.001, capacity=60)
+
+    assert asyncio.run(first.acquire(40)) == 0.0
+    # The second process sees what the first one spent
+    assert second.tokens == pytest.approx(20, abs=0.1)
+    assert second._take(40) == pytest.approx(20, abs=0.1)
+
+
+def test_adjust_settles_the_real_cost(collection):
+    budget = SharedBudget(collection, per_minute=0.001, capacity=60)
+    asyncio.run(budget.acquire(36))
+
+    budget.adjust(-30)
+    assert budget.tokens == pytest.approx(54, abs=0.1)
+    # Overspending can take the budget below zero; it never refills past capacity
+    budget.adjust(100)
+    assert budget.tokens == pytest.approx(-46, abs=0.1)
+    budget.adjust(-500)
+    assert budget.tokens == pytest.approx(60, abs=0.1)
+
+
+def test_a_lost_race_retries_against_the_new_version(collection):
+    budget = SharedBudget(collection, per_minute=0.001, capacity=60)
+    budget.ensure_document()
+    find_one = collection.find_one
+
+    def racing_find_one(*args, **kwargs):
+        bucket = find_one(*args, **kwargs)
+        if racing_find_one.first:
+            # Another process takes 10 tokens between this read and the update
+            racing_find_one.first = False
+            collection.update_one({"_id": "gemini_calls"}, {"$inc": {"tokens": -10, "version": 1}})
+        return bucket
+
+    racing_find_one.first = True
+    collection.find_one = racing_find_one
+    assert budget._take(5) == 0.0
+    assert find_one({"_id": "gemini_calls"})["tokens"] == pytest.approx(45, abs=0.1)
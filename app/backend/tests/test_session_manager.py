@@ -0,0 +1,148 @@
+import asyncio
+
+import pytest
+
+from session_manager import SessionManager, SessionCapacityError, ClientDisconnected, ManagedSession
+
+
+class QueuedClient:
+    """Websocket stand-in that records what it is sent and receives what the test feeds it"""
+
+    def __init__(self):
+        self.sent = []
+        self.inbox = asyncio.Queue()
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+    async def receive(self):
+        return await self.inbox.get()
+
+
+def test_sessions_are_admitted_up_to_the_cap():
+    async def run():
+        manager = SessionManager(max_sessions=2, queue_size=0)
+        assert await manager.admit(QueuedClient()) == 0.0
+        assert await manager.admit(QueuedClient()) == 0.0
+        with pytest.raises(SessionCapacityError):
+            await manager.admit(QueuedClient())
+        return manager
+
+    manager = asyncio.run(run())
+    assert (manager.rejected, manager._slots) == (1, 2)
+
+
+def test_queued_sessions_are_told_their_position_and_admitted_in_order():
+    async def run():
+        manager = SessionManager(max_sessions=1, queue_size=2, queue_timeout=5)
+        await manager.admit(QueuedClient())
+        first, second = QueuedClient(), QueuedClient()
+        first_admit = asyncio.create_task(manager.admit(first))
+        await asyncio.sleep(0)
+        second_admit = asyncio.create_task(manager.admit(second))
+        await asyncio.sleep(0.01)
+
+        manager.release()
+        await asyncio.wait_for(first_admit, 1)
+        assert not second_admit.done()
+        manager.release()
+        await asyncio.wait_for(second_admit, 1)
+        return manager, first, second
+
+    manager, first, second = asyncio.run(run())
+    assert first.sent == [{"type": "queued", "position": 1}]
+    assert second.sent == [{"type": "queued", "position": 2}]
+    assert (manager.queued, manager._slots, len(manager._waiters)) == (2, 1, 0)
+
+
+def test_full_queue_rejects_at_once():
+    async def run():
+        manager = SessionManager(max_sessions=1, queue_size=1, queue_timeout=5)
+        await manager.admit(QueuedClient())
+        waiting = asyncio.create_task(manager.admit(QueuedClient()))
+        await asyncio.sleep(0.01)
+        with pytest.raises(SessionCapacityError):
+            await manager.admit(QueuedClient())
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        return manager
+
+    assert asyncio.run(run()).rejected == 1
+
+
+def test_queue_timeout_rejects_and_frees_the_place():
+    async def run():
+        manager = SessionManager(max_sessions=1, queue_size=1, queue_timeout=0.02)
+        await manager.admit(QueuedClient())
+        with pytest.raises(SessionCapacityError):
+            await manager.admit(QueuedClient())
+        return manager
+
+    manager = asyncio.run(run())
+    assert (manager.rejected, len(manager._waiters), manager._slots) == (1, 0, 1)
+
+
+def test_client_leaving_the_queue_is_noticed_before_the_timeout():
+    async def run():
+        manager = SessionManager(max_sessions=1, queue_size=2, queue_timeout=30)
+        await manager.admit(QueuedClient())
+        leaving, staying = QueuedClient(), QueuedClient()
+        leaving_admit = asyncio.create_task(manager.admit(leaving))
+        await asyncio.sleep(0)
+        staying_admit = asyncio.create_task(manager.admit(staying))
+        await asyncio.sleep(0.01)
+
+        await leaving.inbox.put({"type": "websocket.receive", "bytes": b"\x00\x00"})
+        await leaving.inbox.put({"type": "websocket.disconnect"})
+        with pytest.raises(ClientDisconnected):
+            await asyncio.wait_for(leaving_admit, 1)
+
+        # The freed slot goes to the next client still waiting
+        manager.release()
+        await asyncio.wait_for(staying_admit, 1)
+        return manager
+
+    manager = asyncio.run(run())
+    assert (manager.abandoned, manager._slots, len(manager._waiters)) == (1, 1, 0)
+
+
+def test_slot_releases_on_exit():
+    async def run():
+        manager = SessionManager(max_sessions=1, queue_size=0)
+        async with manager.slot(QueuedClient()) as managed:
+            assert manager.sessions == {managed.id: managed}
+        async with manager.slot(QueuedClient()):
+            pass
+        return manager
+
+    manager = asyncio.run(run())
+    assert (manager.admitted, manager._slots, manager.sessions) == (2, 0, {})
+
+
+class FakeSession:
+    def __init__(self, now, client_silent_for=0.0, idle_for=0.0):
+        self.started_at = now
+        self.last_client_frame_at = now - client_silent_for
+        self.last_turn_at = now - idle_for
+        self.closed_reason = None
+
+    def close(self, reason):
+        self.closed_reason = reason
+
+
+def test_sweep_sheds_silent_and_idle_sessions_only():
+    async def run():
+        manager = SessionManager(max_sessions=3, queue_size=0, idle_seconds=300, client_timeout=30)
+        now = asyncio.get_running_loop().time()
+        sessions = [FakeSession(now), FakeSession(now, client_silent_for=60), FakeSession(now, idle_for=600)]
+        for number, session in enumerate(sessions):
+            managed = ManagedSession(number, "", 0.0, now)
+            managed.attach(session)
+            manager.sessions[number] = managed
+        return manager, manager.sweep(), sessions
+
+    manager, shed, sessions = asyncio.run(run())
+    assert shed == 2 and manager.shed == 2
+    assert sessions[0].closed_reason is None
+    assert "No audio" in sessions[1].closed_reason
+    assert "idle" in sessions[2].closed_reason
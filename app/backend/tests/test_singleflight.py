@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    flights = SingleFlight()
+    started = []
+
+    async def work():
+        started.append(1)
+        await asyncio.sleep(0.01)
+        return "verdict"
+
+    async def run():
+        return await asyncio.gather(*(flights.do("claim", work) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["verdict"] * 5
+    assert len(started) == 1
+    assert flights.stats() == {"in_flight": 0, "calls": 5, "executions": 1, "coalesced": 4}
+
+
+def test_different_keys_run_separately():
+    flights = SingleFlight()
+
+    async def run():
+        return await asyncio.gather(flights.do("a", lambda: asyncio.sleep(0, "a")),
+                                    flights.do("b", lambda: asyncio.sleep(0, "b")))
+
+    assert asyncio.run(run()) == ["a", "b"]
+    assert flights.executions == 2
+
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    flights = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def run():
+        first = asyncio.create_task(flights.do("claim", work))
+        second = asyncio.create_task(flights.do("claim", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == "done"
+
+
+def test_errors_reach_every_waiter_and_the_key_is_released():
+    flights = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream")
+
+    async def run():
+        results = await asyncio.gather(flights.do("claim", fail), flights.do("claim", fail), return_exceptions=True)
+        again = await flights.do("claim", lambda: asyncio.sleep(0, "retried"))
+        return results, again
+
+    results, again = asyncio.run(run())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert again == "retried"
+    assert flights.executions == 2
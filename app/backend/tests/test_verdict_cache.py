@@ -0,0 +1,71 @@
+import time
+
+import mongomock
+import pytest
+
+from verdict_cache import VerdictCache, MemoryBackend, SqliteBackend, MongoBackend, normalize_claim
+
+
+@pytest.fixture(params=["memory", "sqlite", "mongo"])
+def make_backend(request, tmp_path):
+    def make(max_entries=100):
+        if request.param == "sqlite":
+            return SqliteBackend(str(tmp_path / "verdicts.db"), max_entries=max_entries)
+        if request.param == "mongo":
+            return MongoBackend(mongomock.MongoClient().db.verdict_cache, max_entries=max_entries)
+        return MemoryBackend(max_entries=max_entries)
+    return make
+
+
+VERDICT = {"verdict": "FAKE", "confidence": 0.9, "explanation": "Debunked.", "sources": []}
+
+
+def test_normalize_claim_ignores_case_punctuation_and_spacing():
+    assert normalize_claim("  Is the Earth FLAT?!  ") == normalize_claim("is the earth flat")
+
+
+def test_hit_after_set_for_reworded_punctuation(make_backend):
+    cache = VerdictCache(make_backend())
+    cache.set("Is the Earth flat?", VERDICT)
+
+    assert cache.get("is the earth   FLAT") == VERDICT
+    assert cache.get("Is the Moon flat?") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_expired_entries_are_misses(make_backend):
+    cache = VerdictCache(make_backend(), ttl_seconds=-1)
+    cache.set("claim", VERDICT)
+
+    assert cache.get("claim") is None
+    assert cache.misses == 1
+
+
+def test_least_recently_used_entry_is_evicted(make_backend):
+    cache = VerdictCache(make_backend(max_entries=2))
+    cache.set("first", VERDICT)
+    time.sleep(0.01)
+    cache.set("second", VERDICT)
+    time.sleep(0.01)
+    cache.get("first")  # now more recent than "second"
+    time.sleep(0.01)
+    cache.set("third", VERDICT)
+
+    assert cache.get("first") == VERDICT
+    assert cache.get("second") is None
+    assert cache.get("third") == VERDICT
+    assert cache.stats()["entries"] == 2
+
+
+def test_backend_errors_degrade_to_misses():
+    class BrokenBackend(MemoryBackend):
+        def get(self, key):
+            raise RuntimeError("down")
+
+        def set(self, key, value, expires_at):
+            raise RuntimeError("down")
+
+    cache = VerdictCache(BrokenBackend())
+    cache.set("claim", VERDICT)
+    assert cache.get("claim") is None
+    assert cache.misses == 1
@@ -0,0 +1,191 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+VERDICT_CACHE_BACKEND = os.getenv("VERDICT_CACHE_BACKEND", "memory")  # memory | sqlite | mongo
+VERDICT_CACHE_TTL_SECONDS = int(os.getenv("VERDICT_CACHE_TTL_SECONDS", "3600"))
+VERDICT_CACHE_MAX_ENTRIES = int(os.getenv("VERDICT_CACHE_MAX_ENTRIES", "10000"))
+VERDICT_CACHE_PATH = os.getenv("VERDICT_CACHE_PATH", "verdict_cache.db")
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_claim(text: str) -> str:
+    """Cache key for a claim: case, punctuation and spacing differences are ignored"""
+    text = _PUNCTUATION.sub(" ", (text or "").lower())
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+# ==================== BACKENDS ====================
+# Each backend stores JSON strings with an absolute expiry time and evicts
+# the least recently used entries once it holds more than `max_entries`.
+
+class MemoryBackend:
+    """Per-process LRU dict"""
+
+    def __init__(self, max_entries: int = VERDICT_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, expires_at: float):
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class SqliteBackend:
+    """Local SQLite file, shared by every worker on the host"""
+
+    def __init__(self, path: str = VERDICT_CACHE_PATH, max_entries: int = VERDICT_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS verdicts ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS verdicts_last_used ON verdicts (last_used)")
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM verdicts WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM verdicts WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE verdicts SET last_used = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def set(self, key: str, value: str, expires_at: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO verdicts (key, value, expires_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, value, expires_at, time.time())
+            )
+            self._conn.execute(
+                "DELETE FROM verdicts WHERE key IN ("
+                "SELECT key FROM verdicts ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def size(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0]
+
+
+class MongoBackend:
+    """MongoDB collection, shared by every worker using the same database"""
+
+    def __init__(self, collection, max_entries: int = VERDICT_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.collection = collection
+        # Mongo's TTL monitor removes expired entries in the background
+        self.collection.create_index("expires_at", expireAfterSeconds=0)
+        self.collection.create_index("last_used")
+
+    def get(self, key: str) -> Optional[str]:
+        now = datetime.utcnow()
+        doc = self.collection.find_one_and_update(
+            {"_id": key, "expires_at": {"$gt": now}},
+            {"$set": {"last_used": now}},
+            projection={"value": 1}
+        )
+        return doc["value"] if doc else None
+
+    def set(self, key: str, value: str, expires_at: float):
+        now = datetime.utcnow()
+        self.collection.replace_one(
+            {"_id": key},
+            {"value": value, "expires_at": datetime.utcfromtimestamp(expires_at), "last_used": now},
+            upsert=True
+        )
+        overflow = self.collection.estimated_document_count() - self.max_entries
+        if overflow > 0:
+            stale = [doc["_id"] for doc in self.collection.find({}, {"_id": 1}).sort("last_used", 1).limit(overflow)]
+            self.collection.delete_many({"_id": {"$in": stale}})
+
+    def size(self) -> int:
+        return self.collection.estimated_document_count()
+
+
+# ==================== CACHE ====================
+
+class VerdictCache:
+    """TTL cache of check-agent verdicts keyed on normalized claim text"""
+
+    def __init__(self, backend, ttl_seconds: int = VERDICT_CACHE_TTL_SECONDS):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, claim: str) -> Optional[Dict[str, Any]]:
+        try:
+            value = self.backend.get(normalize_claim(claim))
+        except Exception as e:
+            print(f"Verdict cache read error: {e}")
+            value = None
+
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(value)
+
+    def set(self, claim: str, verdict: Dict[str, Any]):
+        try:
+            self.backend.set(normalize_claim(claim), json.dumps(verdict), time.time() + self.ttl_seconds)
+        except Exception as e:
+            print(f"Verdict cache write error: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": self.backend.size(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+
+def create_verdict_cache(backend: str = VERDICT_CACHE_BACKEND) -> VerdictCache:
+    """Build the cache configured by VERDICT_CACHE_BACKEND"""
+    if backend == "sqlite":
+        return VerdictCache(SqliteBackend())
+    if backend == "mongo":
+        from repository import get_database
+
+        mongo_uri = os.getenv("MONGODB_URI")
+        if not mongo_uri:
+            raise ValueError("MONGODB_URI must be set for the mongo verdict cache")
+        return VerdictCache(MongoBackend(get_database(mongo_uri)['verdict_cache']))
+    return VerdictCache(MemoryBackend())
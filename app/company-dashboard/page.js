@@ -358,7 +358,9 @@ export default function EnhancedCompanyDashboardPage() {
 
       clearTimeout(timeoutId);
 
-      if (response.ok) {
+      if (response.status === 202) {
+        alert(`⏳ Analysis Still Running\n\nThe enhanced analysis is taking longer than expected and continues in the background.\n\nTry refreshing in a few minutes.`);
+      } else if (response.ok) {
         const result = await response.json();
         await loadDashboardData(company.id);
 
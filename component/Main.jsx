@@ -897,6 +897,11 @@ export default function Main() {
 
             case 'connected':
               console.log('Backend connected to Gemini Live API');
+              setAgentStatus('🎤 Voice mode active - speak naturally!');
+              break;
+
+            case 'queued':
+              setAgentStatus(`⏳ Voice mode is busy - you are #${data.position} in line`);
               break;
 
             case 'error':